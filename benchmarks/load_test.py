@@ -0,0 +1,393 @@
+"""
+Teste de carga headless do app Streamlit com sessões concorrentes
+
+Executa o `app.py` real pela API de testes do Streamlit (AppTest), com
+várias sessões simultâneas em threads do mesmo processo, como no servidor.
+Cada sessão navega entre as quatro páginas, troca os filtros da sidebar e
+ordena/pagina a tabela de vídeos, com um tempo de espera aleatório entre
+as ações.
+
+Relata, por nível de concorrência e por página, a latência de cada
+execução do script (p50/p95/p99) e a memória: pico alocado por execução
+da página (medido antes, sem concorrência, com tracemalloc) e RSS do
+processo por sessão ativa.
+
+Uso:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --sessions 20 50 200 --actions 20 --think-time 0.5
+    python benchmarks/load_test.py --dataset .datasets/seed42
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, asdict, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import numpy as np  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from dashboard import state  # noqa: E402
+from dashboard.data.dataset import DATASET_ENV  # noqa: E402
+from run_benchmarks import RESULTS_DIR, git_commit  # noqa: E402
+
+APP_PATH = os.path.join(ROOT_DIR, 'app.py')
+
+PAGES = {
+    'home': 'dashboard/pages/home.py',
+    'video_analysis': 'dashboard/pages/video_analysis.py',
+    'reports': 'dashboard/pages/reports.py',
+    'settings': 'dashboard/pages/settings.py',
+}
+
+RECENT_VIDEOS_KEY = 'recent_videos'
+
+
+@dataclass
+class PageStats:
+    """Latência e memória de uma página em um nível de concorrência"""
+    page: str
+    reruns: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    peak_alloc_mb: Optional[float]
+
+
+@dataclass
+class LevelResult:
+    """Resultado de um nível de concorrência"""
+    sessions: int
+    reruns: int
+    wall_seconds: float
+    reruns_per_second: float
+    rss_start_mb: Optional[float]
+    rss_peak_mb: Optional[float]
+    rss_per_session_mb: Optional[float]
+    pages: List[PageStats] = field(default_factory=list)
+
+
+def rss_mb() -> Optional[float]:
+    """RSS atual do processo em MB (Linux), ou None"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+
+class RssSampler(threading.Thread):
+    """Amostra o RSS em segundo plano e guarda o pico"""
+
+    def __init__(self, interval: float = 0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            current = rss_mb()
+            if current is not None:
+                self.peak = max(self.peak or 0.0, current)
+
+    def stop(self) -> Optional[float]:
+        self._stop_event.set()
+        self.join()
+        return self.peak
+
+
+class Session:
+    """
+    Uma sessão simulada do dashboard
+
+    Args:
+        rng: Gerador aleatório da sessão
+        timeout: Tempo máximo de uma execução do script
+    """
+
+    def __init__(self, rng: random.Random, timeout: float = 120.0):
+        self.rng = rng
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.page = 'home'
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def rerun(self):
+        """Executa o script e registra a latência na página atual"""
+        start = time.perf_counter()
+        try:
+            self.app.run()
+            failed = len(self.app.exception) > 0
+        except Exception:
+            failed = True
+        self.samples[self.page].append(time.perf_counter() - start)
+        if failed:
+            self.errors[self.page] += 1
+
+    def switch_page(self):
+        self.page = self.rng.choice([p for p in PAGES if p != self.page])
+        self.app.switch_page(PAGES[self.page])
+
+    def change_campaign_types(self):
+        choice = self.rng.sample(state.CAMPAIGN_TYPES, k=self.rng.randint(1, len(state.CAMPAIGN_TYPES)))
+        self.app.sidebar.multiselect(key=state.CAMPAIGN_TYPES_KEY).set_value(choice)
+
+    def change_period(self):
+        end = date.today()
+        days = self.rng.choice([7, 30, 90])
+        self.app.sidebar.date_input(key=state.DATE_RANGE_KEY).set_value((end - timedelta(days=days), end))
+
+    def sort_table(self):
+        column = self.app.selectbox(key=f"sort_col_{RECENT_VIDEOS_KEY}")
+        column.set_value(self.rng.choice(column.options))
+        order = self.app.selectbox(key=f"sort_order_{RECENT_VIDEOS_KEY}")
+        order.set_value(self.rng.choice(order.options))
+
+    def change_table_page(self):
+        page = self.app.number_input(key=f"page_{RECENT_VIDEOS_KEY}")
+        page.set_value(self.rng.randint(int(page.min), int(page.max)))
+
+    def _actions(self) -> List[Callable[[], None]]:
+        actions = [self.switch_page, self.switch_page, self.change_campaign_types, self.change_period]
+        if self.page == 'home':
+            actions += [self.sort_table, self.sort_table, self.change_table_page]
+        return actions
+
+    def act(self):
+        """Executa uma ação aleatória seguida da execução do script"""
+        try:
+            self.rng.choice(self._actions())()
+        except (KeyError, IndexError, ValueError):
+            # Widget ausente nesta execução (ex.: página com erro): só recarrega
+            pass
+        self.rerun()
+
+
+def share_test_runtime():
+    """
+    Permite sessões AppTest concorrentes no mesmo processo
+
+    Cada execução do AppTest instala um Runtime simulado global e o remove
+    ao terminar, o que quebra as outras sessões ainda em execução. Com isto,
+    `Runtime.instance()` devolve o último Runtime simulado enquanto não
+    houver um instalado. O bytecode das páginas passa a vir de um único
+    ScriptCache, como no servidor, em vez de ser compilado a cada execução
+    (compilações simultâneas falham no CPython 3.11). A opção
+    `global.appTest`, que o AppTest liga só durante cada execução, fica
+    ligada no processo.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    config.set_option('global.appTest', True)
+
+    shared_cache = ScriptCache()
+    get_bytecode = ScriptCache.get_bytecode
+    ScriptCache.get_bytecode = lambda self, script_path: get_bytecode(shared_cache, script_path)
+
+    original = Runtime.instance.__func__
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last['runtime'] = cls._instance
+            return cls._instance
+        if 'runtime' in last:
+            return last['runtime']
+        return original(cls)
+
+    Runtime.instance = classmethod(instance)
+
+
+def measure_page_memory(repeat: int = 3) -> Dict[str, float]:
+    """
+    Pico de memória alocada (tracemalloc) por execução de cada página,
+    sem concorrência e após um aquecimento
+
+    Returns:
+        Mapa página -> MB
+    """
+    session = Session(random.Random(0))
+    session.rerun()
+    peaks = {}
+    for page, path in PAGES.items():
+        session.page = page
+        session.app.switch_page(path)
+        session.rerun()
+        page_peaks = []
+        for _ in range(repeat):
+            tracemalloc.start()
+            session.rerun()
+            page_peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        peaks[page] = round(max(page_peaks) / 1024 ** 2, 2)
+    return peaks
+
+
+def run_level(
+    sessions: int,
+    actions: int,
+    think_time: float,
+    ramp_up: float,
+    seed: int,
+    page_memory: Dict[str, float]
+) -> LevelResult:
+    """
+    Executa um nível de concorrência
+
+    Args:
+        sessions: Sessões simultâneas
+        actions: Ações por sessão (além da carga inicial)
+        think_time: Espera máxima entre ações (segundos, uniforme)
+        ramp_up: Janela em que as sessões começam
+        seed: Semente das sessões
+        page_memory: Pico alocado por página (measure_page_memory)
+
+    Returns:
+        LevelResult
+    """
+    rss_start = rss_mb()
+    sampler = RssSampler()
+    sampler.start()
+    done: List[Session] = []
+    lock = threading.Lock()
+
+    def worker(index: int):
+        rng = random.Random(seed * 100_003 + index)
+        time.sleep(rng.uniform(0, ramp_up))
+        session = Session(rng)
+        session.rerun()
+        for _ in range(actions):
+            time.sleep(rng.uniform(0, think_time))
+            session.act()
+        with lock:
+            done.append(session)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    rss_peak = sampler.stop()
+
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for session in done:
+        for page, values in session.samples.items():
+            samples[page].extend(values)
+        for page, count in session.errors.items():
+            errors[page] += count
+
+    pages = []
+    for page in PAGES:
+        values = np.array(samples.get(page, [])) * 1000
+        if not len(values):
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        pages.append(PageStats(
+            page=page,
+            reruns=len(values),
+            errors=errors.get(page, 0),
+            p50_ms=round(float(p50), 1),
+            p95_ms=round(float(p95), 1),
+            p99_ms=round(float(p99), 1),
+            max_ms=round(float(values.max()), 1),
+            peak_alloc_mb=page_memory.get(page)
+        ))
+
+    reruns = sum(p.reruns for p in pages)
+    per_session = None
+    if rss_start is not None and rss_peak is not None:
+        per_session = round((rss_peak - rss_start) / sessions, 2)
+    return LevelResult(
+        sessions=sessions,
+        reruns=reruns,
+        wall_seconds=round(wall, 2),
+        reruns_per_second=round(reruns / wall, 2) if wall else 0.0,
+        rss_start_mb=round(rss_start, 1) if rss_start is not None else None,
+        rss_peak_mb=round(rss_peak, 1) if rss_peak is not None else None,
+        rss_per_session_mb=per_session,
+        pages=pages
+    )
+
+
+def print_level(result: LevelResult):
+    print(f"\n{result.sessions} sessões · {result.reruns} execuções em {result.wall_seconds:.1f}s "
+          f"({result.reruns_per_second:.1f}/s) · RSS pico {result.rss_peak_mb} MB "
+          f"({result.rss_per_session_mb} MB/sessão)")
+    print(f"  {'Página':<16}{'Exec.':>7}{'Erros':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Alloc MB':>10}")
+    for p in result.pages:
+        print(f"  {p.page:<16}{p.reruns:>7}{p.errors:>7}{p.p50_ms:>10.1f}{p.p95_ms:>10.1f}"
+              f"{p.p99_ms:>10.1f}{p.peak_alloc_mb if p.peak_alloc_mb is not None else '-':>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[20, 50, 200],
+                        help='Níveis de concorrência')
+    parser.add_argument('--actions', type=int, default=10, help='Ações por sessão')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Espera máxima entre ações (s)')
+    parser.add_argument('--ramp-up', type=float, default=5.0, help='Janela de início das sessões (s)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente das sessões')
+    parser.add_argument('--dataset', help='Fotografia de dados (dashboard.data.dataset)')
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    args = parser.parse_args(argv)
+
+    if args.dataset:
+        os.environ[DATASET_ENV] = args.dataset
+    # Caminhos das páginas em app.py são relativos à raiz do projeto
+    os.chdir(ROOT_DIR)
+    share_test_runtime()
+
+    print("Medindo memória por página...")
+    page_memory = measure_page_memory()
+
+    results = []
+    for sessions in args.sessions:
+        result = run_level(sessions, args.actions, args.think_time, args.ramp_up, args.seed, page_memory)
+        print_level(result)
+        results.append(result)
+
+    commit = git_commit()
+    payload = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'dataset': args.dataset,
+        'actions': args.actions,
+        'think_time': args.think_time,
+        'seed': args.seed,
+        'results': [asdict(r) for r in results]
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"load_{stamp}_{commit or 'nogit'}.json")
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados salvos em {output}")
+
+
+if __name__ == '__main__':
+    main()
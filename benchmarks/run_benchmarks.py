@@ -0,0 +1,275 @@
+"""
+Benchmarks headless do dashboard Maiketeiro
+
+Mede tempo e pico de memória da geração de dados mockados, das conversões
+para DataFrame, do caminho filtro/ordenação/paginação de
+`interactive_table` e da montagem das figuras de `charts`, sem navegador.
+
+Uso:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --repeat 3
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/anterior.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from dashboard.components import charts, tables  # noqa: E402
+from dashboard.data.mock_data import MockDataGenerator, get_faker  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+
+@dataclass
+class BenchmarkResult:
+    """Resultado de um caso de benchmark em uma escala"""
+    name: str
+    rows: int
+    seconds: float
+    peak_mb: Optional[float]
+
+
+def measure(
+    fn: Callable[[], object],
+    repeat: int = 1,
+    trace_memory: bool = True
+) -> Tuple[float, Optional[float], object]:
+    """
+    Executa uma função medindo tempo e pico de memória
+
+    O tempo é medido sem tracemalloc (que distorce o relógio); o pico de
+    memória vem de uma execução adicional com tracemalloc ativo.
+
+    Args:
+        fn: Função sem argumentos a medir
+        repeat: Número de execuções cronometradas (usa a menor)
+        trace_memory: Se True, mede o pico de memória
+
+    Returns:
+        Tupla (segundos, pico em MB ou None, último resultado de fn)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    peak_mb = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / (1024 * 1024)
+
+    return best, peak_mb, result
+
+
+def _cycle(items: list, count: int) -> list:
+    """Repete uma lista até atingir `count` elementos"""
+    if not items:
+        return []
+    repeats = count // len(items) + 1
+    return (items * repeats)[:count]
+
+
+def run_size(rows: int, repeat: int, trace_memory: bool) -> List[BenchmarkResult]:
+    """
+    Executa todos os casos para uma escala
+
+    Args:
+        rows: Número de linhas (vídeos) da escala
+        repeat: Execuções cronometradas por caso
+        trace_memory: Se True, mede o pico de memória
+
+    Returns:
+        Lista de resultados
+    """
+    results = []
+
+    def bench(name: str, fn: Callable[[], object], size: int = rows):
+        seconds, peak_mb, value = measure(fn, repeat, trace_memory)
+        results.append(BenchmarkResult(
+            name=name,
+            rows=size,
+            seconds=round(seconds, 6),
+            peak_mb=round(peak_mb, 3) if peak_mb is not None else None
+        ))
+        print(f"  {name:<32} {size:>10,} linhas  {seconds * 1000:>12.2f} ms"
+              + (f"  {peak_mb:>10.2f} MB" if peak_mb is not None else ''))
+        return value
+
+    # Geração de dados
+    videos = bench('generate_videos', lambda: MockDataGenerator.generate_videos(rows))
+    tasks = MockDataGenerator.generate_tasks(videos)
+    bench('generate_tasks', lambda: MockDataGenerator.generate_tasks(videos), len(tasks))
+    metrics = _cycle(MockDataGenerator.generate_metrics(365), rows)
+
+    # Conversões para DataFrame
+    videos_df = bench('videos_to_dataframe', lambda: MockDataGenerator.videos_to_dataframe(videos))
+    bench('tasks_to_dataframe', lambda: MockDataGenerator.tasks_to_dataframe(tasks), len(tasks))
+    bench('metrics_to_dataframe', lambda: MockDataGenerator.metrics_to_dataframe(metrics))
+    del tasks, metrics
+
+    # Caminho de interactive_table
+    filtered = bench(
+        'interactive_table.filter',
+        lambda: tables.filter_dataframe(videos_df, 'python', ['Título', 'Tags'])
+    )
+    sorted_df = bench(
+        'interactive_table.sort',
+        lambda: tables.sort_dataframe(filtered, 'Tamanho (MB)', ascending=False),
+        len(filtered)
+    )
+    bench(
+        'interactive_table.paginate',
+        lambda: tables.paginate_dataframe(sorted_df, page=3, page_size=10),
+        len(sorted_df)
+    )
+
+    # Montagem de figuras
+    series_df = videos_df.sort_values('Criado em')
+    bench('charts.line_chart', lambda: charts.build_line_chart(
+        series_df, 'Criado em', 'Tamanho (MB)', 'Tamanho'
+    ))
+    bench('charts.multi_line_chart', lambda: charts.build_multi_line_chart(
+        series_df, 'Criado em', ['Tamanho (MB)', 'Duração (min)'], 'Tamanho e duração'
+    ))
+    bench('charts.bar_chart', lambda: charts.build_bar_chart(
+        videos_df, 'ID', 'Duração (min)', 'Duração'
+    ))
+    bench('charts.pie_chart', lambda: charts.build_pie_chart(
+        videos_df['ID'].tolist(), videos_df['Tamanho (MB)'].tolist(), 'Tamanho'
+    ))
+    bench('charts.area_chart', lambda: charts.build_area_chart(
+        series_df, 'Criado em', ['Tamanho (MB)', 'Duração (min)'], 'Acumulado'
+    ))
+    side = max(1, int(rows ** 0.5))
+    matrix = pd.DataFrame(np.random.rand(side, side))
+    bench('charts.heatmap', lambda: charts.build_heatmap(matrix, 'Matriz'), side * side)
+    bench('charts.gauge_chart', lambda: charts.build_gauge_chart(72.5, 'Uso'), 1)
+
+    return results
+
+
+def warmup():
+    """Carrega os validadores do Plotly para não contaminar o primeiro caso"""
+    df = pd.DataFrame({'x': [1, 2], 'y': [1.0, 2.0]})
+    charts.build_line_chart(df, 'x', 'y', 'warmup')
+    charts.build_bar_chart(df, 'x', 'y', 'warmup')
+    charts.build_pie_chart(['a', 'b'], [1, 2], 'warmup')
+    charts.build_heatmap(df, 'warmup')
+    charts.build_gauge_chart(1, 'warmup')
+
+
+def git_commit() -> Optional[str]:
+    """Retorna o hash do commit atual, se disponível"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: List[dict], baseline_path: str):
+    """
+    Mostra a variação de tempo e memória em relação a um resultado anterior
+
+    Args:
+        current: Resultados atuais (dicts)
+        baseline_path: Caminho do JSON de referência
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    previous: Dict[Tuple[str, int], dict] = {
+        (r['name'], r['rows']): r for r in baseline['results']
+    }
+
+    print(f"\nComparação com {baseline_path} (commit {baseline.get('commit')})")
+    for r in current:
+        old = previous.get((r['name'], r['rows']))
+        if not old:
+            continue
+        time_ratio = r['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+        line = f"  {r['name']:<32} {r['rows']:>10,}  tempo x{time_ratio:.2f}"
+        if r['peak_mb'] is not None and old.get('peak_mb'):
+            line += f"  memória x{r['peak_mb'] / old['peak_mb']:.2f}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Escalas (número de vídeos)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Execuções cronometradas por caso (usa a menor)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Não mede o pico de memória')
+    parser.add_argument('--seed', type=int, default=42, help='Semente dos geradores')
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    get_faker().seed_instance(args.seed)
+
+    warmup()
+
+    results = []
+    for rows in args.sizes:
+        print(f"Escala: {rows:,} linhas")
+        results.extend(run_size(rows, args.repeat, not args.no_memory))
+
+    commit = git_commit()
+    payload = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': [asdict(r) for r in results]
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}_{commit or 'nogit'}.json")
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados salvos em {output}")
+
+    if args.compare:
+        compare(payload['results'], args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark da transcodificação em segmentos paralelos
+
+Compara o tempo de parede de `processing.transcode` por número de
+segmentos com a codificação em passada única (1 segmento) e confere se
+a saída mantém a duração da origem. Sem arquivo de entrada, gera um vídeo
+sintético (testsrc2 + tom) com o ffmpeg.
+
+Uso:
+    python benchmarks/transcode_benchmark.py
+    python benchmarks/transcode_benchmark.py --input episodio.mp4 --segments 1 4 8 16
+    python benchmarks/transcode_benchmark.py --duration 600 --resolution 3840x2160
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from processing import ffmpeg  # noqa: E402
+from processing.transcode import PRESETS, transcode  # noqa: E402
+from run_benchmarks import RESULTS_DIR, git_commit  # noqa: E402
+from dashboard.data.schemas import TaskType  # noqa: E402
+
+
+@dataclass
+class TranscodeResult:
+    """Resultado de uma execução por número de segmentos"""
+    segments: int
+    seconds: float
+    speedup: float
+    output_duration: float
+    duration_delta: float
+    output_mb: float
+
+
+def generate_input(path: str, duration: float, resolution: str, fps: int):
+    """Gera um vídeo sintético H.264 + AAC"""
+    ffmpeg.run([
+        '-y', '-v', 'error',
+        '-f', 'lavfi', '-i', f'testsrc2=size={resolution}:rate={fps}:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:duration={duration}',
+        '-c:v', 'libx264', '-preset', 'veryfast', '-g', str(fps * 2),
+        '-c:a', 'aac', '-shortest', path
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', help='Vídeo de entrada (padrão: sintético)')
+    parser.add_argument('--duration', type=float, default=120.0, help='Duração do vídeo sintético')
+    parser.add_argument('--resolution', default='1920x1080', help='Resolução do vídeo sintético')
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--segments', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--task-type', choices=[t.name for t in PRESETS], default='TRANSCODE')
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    args = parser.parse_args(argv)
+
+    ffmpeg.ensure_available()
+    ffmpeg.ensure_available(ffmpeg.FFPROBE_BIN)
+    options = PRESETS[TaskType[args.task_type]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = args.input
+        if not source:
+            source = os.path.join(tmp, 'input.mp4')
+            print(f"Gerando vídeo sintético {args.resolution} de {args.duration:.0f}s...")
+            generate_input(source, args.duration, args.resolution, args.fps)
+        source_duration = ffmpeg.probe_duration(source)
+
+        results: List[TranscodeResult] = []
+        baseline = None
+        for count in sorted(set(args.segments)):
+            output = os.path.join(tmp, f'output_{count}.mp4')
+            start = time.perf_counter()
+            transcode(source, output, options, segments=count)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+
+            output_duration = ffmpeg.probe_duration(output)
+            result = TranscodeResult(
+                segments=count,
+                seconds=round(seconds, 3),
+                speedup=round(baseline / seconds, 2),
+                output_duration=round(output_duration, 3),
+                duration_delta=round(output_duration - source_duration, 3),
+                output_mb=round(os.path.getsize(output) / 1024 ** 2, 2)
+            )
+            results.append(result)
+            print(f"  {count:>3} segmentos  {seconds:8.2f}s  x{result.speedup:<5}  "
+                  f"duração {result.duration_delta:+.3f}s  {result.output_mb:.1f} MB")
+
+    commit = git_commit()
+    payload = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'input': args.input or f'testsrc2 {args.resolution} {args.duration:.0f}s',
+        'source_duration': source_duration,
+        'task_type': args.task_type,
+        'results': [asdict(r) for r in results]
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"transcode_{stamp}_{commit or 'nogit'}.json")
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados salvos em {output}")
+
+
+if __name__ == '__main__':
+    main()
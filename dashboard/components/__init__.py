@@ -1,62 +1,59 @@
 """
 Componentes reutilizáveis do dashboard Maiketeiro
+
+Os submódulos são importados sob demanda (PEP 562): plotly e
+streamlit_player só são carregados quando um componente que depende
+deles é usado pela primeira vez.
 """
-from .metrics_cards import (
-    metric_card,
-    metrics_row,
-    status_badge,
-    progress_bar,
-    info_box
-)
-from .charts import (
-    line_chart,
-    multi_line_chart,
-    bar_chart,
-    pie_chart,
-    area_chart,
-    heatmap,
-    gauge_chart
-)
-from .tables import (
-    interactive_table,
-    styled_dataframe,
-    simple_table,
-    data_editor,
-    expandable_row_table
-)
-from .video_player import (
-    video_player,
-    video_with_transcription,
-    video_gallery,
-    video_thumbnail_card,
-    placeholder_video
-)
-
-__all__ = [
+import importlib
+
+_COMPONENT_MODULES = {
     # Metrics
-    'metric_card',
-    'metrics_row',
-    'status_badge',
-    'progress_bar',
-    'info_box',
+    'metric_card': 'metrics_cards',
+    'metrics_row': 'metrics_cards',
+    'status_badge': 'metrics_cards',
+    'progress_bar': 'metrics_cards',
+    'info_box': 'metrics_cards',
     # Charts
-    'line_chart',
-    'multi_line_chart',
-    'bar_chart',
-    'pie_chart',
-    'area_chart',
-    'heatmap',
-    'gauge_chart',
+    'line_chart': 'charts',
+    'multi_line_chart': 'charts',
+    'bar_chart': 'charts',
+    'pie_chart': 'charts',
+    'area_chart': 'charts',
+    'heatmap': 'charts',
+    'gauge_chart': 'charts',
     # Tables
-    'interactive_table',
-    'styled_dataframe',
-    'simple_table',
-    'data_editor',
-    'expandable_row_table',
+    'interactive_table': 'tables',
+    'styled_dataframe': 'tables',
+    'simple_table': 'tables',
+    'data_editor': 'tables',
+    'expandable_row_table': 'tables',
     # Video
-    'video_player',
-    'video_with_transcription',
-    'video_gallery',
-    'video_thumbnail_card',
-    'placeholder_video'
-]
+    'video_player': 'video_player',
+    'video_with_transcription': 'video_player',
+    'video_gallery': 'video_player',
+    'video_thumbnail_card': 'video_player',
+    'placeholder_video': 'video_player'
+}
+
+_SUBMODULES = {'charts', 'metrics_cards', 'tables', 'video_player'}
+
+__all__ = list(_COMPONENT_MODULES)
+
+
+def __getattr__(name: str):
+    """Carrega o submódulo do componente no primeiro acesso"""
+    if name in _COMPONENT_MODULES:
+        module = importlib.import_module(f".{_COMPONENT_MODULES[name]}", __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
@@ -7,8 +7,26 @@ import plotly.express as px
 import pandas as pd
 from typing import Optional
 
-
-def line_chart(
+from ..profiling import profiled
+from .compact import compact_series, compact_matrix
+
+# Apenas as chaves de layout do 'plotly_white' que afetam estes gráficos.
+# O template completo (~6,5 KB) seria serializado em toda figura enviada.
+COMPACT_TEMPLATE = go.layout.Template(layout=dict(
+    paper_bgcolor='white',
+    plot_bgcolor='white',
+    font=dict(color='#2a3f5f'),
+    colorway=px.colors.qualitative.Plotly,
+    title=dict(x=0.05),
+    xaxis=dict(gridcolor='#EBF0F8', linecolor='#EBF0F8', zerolinecolor='#EBF0F8',
+               automargin=True, ticks=''),
+    yaxis=dict(gridcolor='#EBF0F8', linecolor='#EBF0F8', zerolinecolor='#EBF0F8',
+               automargin=True, ticks='')
+))
+
+
+@profiled
+def build_line_chart(
     df: pd.DataFrame,
     x_col: str,
     y_col: str,
@@ -16,9 +34,9 @@ def line_chart(
     x_label: Optional[str] = None,
     y_label: Optional[str] = None,
     color: str = "#1f77b4"
-):
+) -> go.Figure:
     """
-    Cria um gráfico de linha usando Plotly
+    Monta um gráfico de linha usando Plotly sem renderizá-lo
 
     Args:
         df: DataFrame com os dados
@@ -28,12 +46,15 @@ def line_chart(
         x_label: Label do eixo X
         y_label: Label do eixo Y
         color: Cor da linha
+
+    Returns:
+        Figura Plotly
     """
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=df[y_col],
+        x=compact_series(df[x_col]),
+        y=compact_series(df[y_col]),
         mode='lines+markers',
         line=dict(color=color, width=3),
         marker=dict(size=8),
@@ -45,23 +66,58 @@ def line_chart(
         xaxis_title=x_label or x_col,
         yaxis_title=y_label or y_col,
         hovermode='x unified',
-        template='plotly_white',
+        template=COMPACT_TEMPLATE,
         height=400
     )
 
+    return fig
+
+
+@profiled
+def line_chart(
+    df: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    title: str,
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    color: str = "#1f77b4"
+):
+    """
+    Cria um gráfico de linha usando Plotly
+
+    Args:
+        df: DataFrame com os dados
+        x_col: Nome da coluna do eixo X
+        y_col: Nome da coluna do eixo Y
+        title: Título do gráfico
+        x_label: Label do eixo X
+        y_label: Label do eixo Y
+        color: Cor da linha
+    """
+    fig = build_line_chart(
+        df=df,
+        x_col=x_col,
+        y_col=y_col,
+        title=title,
+        x_label=x_label,
+        y_label=y_label,
+        color=color
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 
-def multi_line_chart(
+@profiled
+def build_multi_line_chart(
     df: pd.DataFrame,
     x_col: str,
     y_cols: list,
     title: str,
     x_label: Optional[str] = None,
     y_label: Optional[str] = None
-):
+) -> go.Figure:
     """
-    Cria um gráfico com múltiplas linhas
+    Monta um gráfico com múltiplas linhas sem renderizá-lo
 
     Args:
         df: DataFrame com os dados
@@ -70,6 +126,9 @@ def multi_line_chart(
         title: Título do gráfico
         x_label: Label do eixo X
         y_label: Label do eixo Y
+
+    Returns:
+        Figura Plotly
     """
     fig = go.Figure()
 
@@ -77,8 +136,8 @@ def multi_line_chart(
 
     for i, y_col in enumerate(y_cols):
         fig.add_trace(go.Scatter(
-            x=df[x_col],
-            y=df[y_col],
+            x=compact_series(df[x_col]),
+            y=compact_series(df[y_col]),
             mode='lines+markers',
             name=y_col,
             line=dict(color=colors[i % len(colors)], width=2),
@@ -90,7 +149,7 @@ def multi_line_chart(
         xaxis_title=x_label or x_col,
         yaxis_title=y_label or 'Valor',
         hovermode='x unified',
-        template='plotly_white',
+        template=COMPACT_TEMPLATE,
         height=400,
         legend=dict(
             orientation="h",
@@ -101,10 +160,42 @@ def multi_line_chart(
         )
     )
 
+    return fig
+
+
+@profiled
+def multi_line_chart(
+    df: pd.DataFrame,
+    x_col: str,
+    y_cols: list,
+    title: str,
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None
+):
+    """
+    Cria um gráfico com múltiplas linhas
+
+    Args:
+        df: DataFrame com os dados
+        x_col: Nome da coluna do eixo X
+        y_cols: Lista de nomes das colunas para o eixo Y
+        title: Título do gráfico
+        x_label: Label do eixo X
+        y_label: Label do eixo Y
+    """
+    fig = build_multi_line_chart(
+        df=df,
+        x_col=x_col,
+        y_cols=y_cols,
+        title=title,
+        x_label=x_label,
+        y_label=y_label
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 
-def bar_chart(
+@profiled
+def build_bar_chart(
     df: pd.DataFrame,
     x_col: str,
     y_col: str,
@@ -113,9 +204,9 @@ def bar_chart(
     y_label: Optional[str] = None,
     color: str = "#1f77b4",
     horizontal: bool = False
-):
+) -> go.Figure:
     """
-    Cria um gráfico de barras
+    Monta um gráfico de barras sem renderizá-lo
 
     Args:
         df: DataFrame com os dados
@@ -126,18 +217,21 @@ def bar_chart(
         y_label: Label do eixo Y
         color: Cor das barras
         horizontal: Se True, cria gráfico horizontal
+
+    Returns:
+        Figura Plotly
     """
     if horizontal:
         fig = go.Figure(go.Bar(
-            x=df[y_col],
-            y=df[x_col],
+            x=compact_series(df[y_col]),
+            y=compact_series(df[x_col]),
             orientation='h',
             marker=dict(color=color)
         ))
     else:
         fig = go.Figure(go.Bar(
-            x=df[x_col],
-            y=df[y_col],
+            x=compact_series(df[x_col]),
+            y=compact_series(df[y_col]),
             marker=dict(color=color)
         ))
 
@@ -145,54 +239,121 @@ def bar_chart(
         title=title,
         xaxis_title=x_label or x_col,
         yaxis_title=y_label or y_col,
-        template='plotly_white',
+        template=COMPACT_TEMPLATE,
         height=400
     )
 
+    return fig
+
+
+@profiled
+def bar_chart(
+    df: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    title: str,
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    color: str = "#1f77b4",
+    horizontal: bool = False
+):
+    """
+    Cria um gráfico de barras
+
+    Args:
+        df: DataFrame com os dados
+        x_col: Nome da coluna do eixo X
+        y_col: Nome da coluna do eixo Y
+        title: Título do gráfico
+        x_label: Label do eixo X
+        y_label: Label do eixo Y
+        color: Cor das barras
+        horizontal: Se True, cria gráfico horizontal
+    """
+    fig = build_bar_chart(
+        df=df,
+        x_col=x_col,
+        y_col=y_col,
+        title=title,
+        x_label=x_label,
+        y_label=y_label,
+        color=color,
+        horizontal=horizontal
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 
-def pie_chart(
+@profiled
+def build_pie_chart(
     labels: list,
     values: list,
     title: str,
     colors: Optional[list] = None
-):
+) -> go.Figure:
     """
-    Cria um gráfico de pizza
+    Monta um gráfico de pizza sem renderizá-lo
 
     Args:
         labels: Lista de labels
         values: Lista de valores
         title: Título do gráfico
         colors: Lista de cores (opcional)
+
+    Returns:
+        Figura Plotly
     """
     fig = go.Figure(data=[go.Pie(
         labels=labels,
-        values=values,
+        values=compact_series(values),
         marker=dict(colors=colors) if colors else None,
         hole=0.3
     )])
 
     fig.update_layout(
         title=title,
-        template='plotly_white',
+        template=COMPACT_TEMPLATE,
         height=400
     )
 
+    return fig
+
+
+@profiled
+def pie_chart(
+    labels: list,
+    values: list,
+    title: str,
+    colors: Optional[list] = None
+):
+    """
+    Cria um gráfico de pizza
+
+    Args:
+        labels: Lista de labels
+        values: Lista de valores
+        title: Título do gráfico
+        colors: Lista de cores (opcional)
+    """
+    fig = build_pie_chart(
+        labels=labels,
+        values=compact_series(values),
+        title=title,
+        colors=colors
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 
-def area_chart(
+@profiled
+def build_area_chart(
     df: pd.DataFrame,
     x_col: str,
     y_cols: list,
     title: str,
     x_label: Optional[str] = None,
     y_label: Optional[str] = None
-):
+) -> go.Figure:
     """
-    Cria um gráfico de área empilhada
+    Monta um gráfico de área empilhada sem renderizá-lo
 
     Args:
         df: DataFrame com os dados
@@ -201,6 +362,9 @@ def area_chart(
         title: Título do gráfico
         x_label: Label do eixo X
         y_label: Label do eixo Y
+
+    Returns:
+        Figura Plotly
     """
     fig = go.Figure()
 
@@ -208,8 +372,8 @@ def area_chart(
 
     for i, y_col in enumerate(y_cols):
         fig.add_trace(go.Scatter(
-            x=df[x_col],
-            y=df[y_col],
+            x=compact_series(df[x_col]),
+            y=compact_series(df[y_col]),
             mode='lines',
             name=y_col,
             fill='tonexty' if i > 0 else 'tozeroy',
@@ -222,7 +386,7 @@ def area_chart(
         xaxis_title=x_label or x_col,
         yaxis_title=y_label or 'Valor',
         hovermode='x unified',
-        template='plotly_white',
+        template=COMPACT_TEMPLATE,
         height=400,
         legend=dict(
             orientation="h",
@@ -233,18 +397,50 @@ def area_chart(
         )
     )
 
+    return fig
+
+
+@profiled
+def area_chart(
+    df: pd.DataFrame,
+    x_col: str,
+    y_cols: list,
+    title: str,
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None
+):
+    """
+    Cria um gráfico de área empilhada
+
+    Args:
+        df: DataFrame com os dados
+        x_col: Nome da coluna do eixo X
+        y_cols: Lista de nomes das colunas para o eixo Y
+        title: Título do gráfico
+        x_label: Label do eixo X
+        y_label: Label do eixo Y
+    """
+    fig = build_area_chart(
+        df=df,
+        x_col=x_col,
+        y_cols=y_cols,
+        title=title,
+        x_label=x_label,
+        y_label=y_label
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 
-def heatmap(
+@profiled
+def build_heatmap(
     df: pd.DataFrame,
     title: str,
     x_label: Optional[str] = None,
     y_label: Optional[str] = None,
     colorscale: str = 'Blues'
-):
+) -> go.Figure:
     """
-    Cria um heatmap
+    Monta um heatmap sem renderizá-lo
 
     Args:
         df: DataFrame com os dados (formato matriz)
@@ -252,9 +448,12 @@ def heatmap(
         x_label: Label do eixo X
         y_label: Label do eixo Y
         colorscale: Escala de cores
+
+    Returns:
+        Figura Plotly
     """
     fig = go.Figure(data=go.Heatmap(
-        z=df.values,
+        z=compact_matrix(df.values),
         x=df.columns,
         y=df.index,
         colorscale=colorscale,
@@ -265,27 +464,59 @@ def heatmap(
         title=title,
         xaxis_title=x_label or '',
         yaxis_title=y_label or '',
-        template='plotly_white',
+        template=COMPACT_TEMPLATE,
         height=400
     )
 
+    return fig
+
+
+@profiled
+def heatmap(
+    df: pd.DataFrame,
+    title: str,
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    colorscale: str = 'Blues'
+):
+    """
+    Cria um heatmap
+
+    Args:
+        df: DataFrame com os dados (formato matriz)
+        title: Título do gráfico
+        x_label: Label do eixo X
+        y_label: Label do eixo Y
+        colorscale: Escala de cores
+    """
+    fig = build_heatmap(
+        df=df,
+        title=title,
+        x_label=x_label,
+        y_label=y_label,
+        colorscale=colorscale
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 
-def gauge_chart(
+@profiled
+def build_gauge_chart(
     value: float,
     title: str,
     max_value: float = 100,
     color: str = "#1f77b4"
-):
+) -> go.Figure:
     """
-    Cria um gráfico tipo gauge (velocímetro)
+    Monta um gráfico tipo gauge (velocímetro) sem renderizá-lo
 
     Args:
         value: Valor atual
         title: Título do gráfico
         max_value: Valor máximo
         color: Cor do gauge
+
+    Returns:
+        Figura Plotly
     """
     fig = go.Figure(go.Indicator(
         mode="gauge+number+delta",
@@ -309,4 +540,30 @@ def gauge_chart(
     ))
 
     fig.update_layout(height=300)
-    st.plotly_chart(fig, use_container_width=True)
+
+    return fig
+
+
+@profiled
+def gauge_chart(
+    value: float,
+    title: str,
+    max_value: float = 100,
+    color: str = "#1f77b4"
+):
+    """
+    Cria um gráfico tipo gauge (velocímetro)
+
+    Args:
+        value: Valor atual
+        title: Título do gráfico
+        max_value: Valor máximo
+        color: Cor do gauge
+    """
+    fig = build_gauge_chart(
+        value=value,
+        title=title,
+        max_value=max_value,
+        color=color
+    )
+    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Redução do payload enviado ao navegador por tabelas e gráficos
+
+O Streamlit serializa DataFrames em Arrow e figuras Plotly em JSON (com
+arrays numpy em base64). Antes do envio, os dados são compactados:
+inteiros reduzidos ao menor tipo que preserva os valores, floats
+arredondados às casas exibidas (mantidos em float64: em float32, 15.3
+chegaria ao navegador como 15.300000190734863), strings repetidas
+codificadas como dicionário (category), timestamps truncados em segundos
+e colunas não exibidas descartadas. Tabelas são enviadas como
+`pyarrow.Table` sem os metadados pandas do schema (~40% de uma página
+de 5 linhas).
+"""
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Abaixo disso o dicionário custa mais do que economiza
+_MIN_CATEGORY_ROWS = 64
+
+
+def _compact_float(series: pd.Series, decimals: int) -> pd.Series:
+    return series.round(decimals)
+
+
+def _compact_datetime(series: pd.Series) -> pd.Series:
+    return series.dt.floor('s').astype(
+        'datetime64[s]' if series.dt.tz is None else f'datetime64[s, {series.dt.tz}]'
+    )
+
+
+def _compact_object(series: pd.Series, category_ratio: float) -> pd.Series:
+    non_null = series.dropna()
+    if len(series) < _MIN_CATEGORY_ROWS or non_null.empty:
+        return series
+    if not non_null.map(lambda v: isinstance(v, str)).all():
+        return series
+    if series.nunique(dropna=True) <= len(series) * category_ratio:
+        return series.astype('category')
+    return series
+
+
+def compact_dataframe(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    float_decimals: int = 2,
+    category_ratio: float = 0.5
+) -> pd.DataFrame:
+    """
+    Compacta um DataFrame para exibição
+
+    Args:
+        df: DataFrame de origem (não é modificado)
+        columns: Colunas exibidas; as demais são descartadas
+        float_decimals: Casas decimais mantidas em colunas float
+        category_ratio: Proporção máxima de valores distintos para
+                        codificar uma coluna de texto como dicionário
+
+    Returns:
+        Novo DataFrame com tipos reduzidos
+    """
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+
+    compacted = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            compacted[col] = series
+        elif pd.api.types.is_integer_dtype(series):
+            downcast = 'unsigned' if len(series) and series.min() >= 0 else 'integer'
+            compacted[col] = pd.to_numeric(series, downcast=downcast)
+        elif pd.api.types.is_float_dtype(series):
+            compacted[col] = _compact_float(series, float_decimals)
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            compacted[col] = _compact_datetime(series)
+        elif series.dtype == object or pd.api.types.is_string_dtype(series):
+            compacted[col] = _compact_object(series, category_ratio)
+        else:
+            compacted[col] = series
+
+    return pd.DataFrame(compacted, index=df.index)
+
+
+def to_wire_table(df: pd.DataFrame, columns: Optional[List[str]] = None):
+    """
+    Compacta um DataFrame e converte para o `pyarrow.Table` enviado ao
+    st.dataframe
+
+    Remove o índice e os metadados pandas do schema e usa offsets de 32
+    bits para strings.
+
+    Args:
+        df: DataFrame de origem
+        columns: Colunas exibidas; as demais são descartadas
+
+    Returns:
+        pyarrow.Table pronto para exibição
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(compact_dataframe(df, columns=columns), preserve_index=False)
+
+    fields = []
+    for field in table.schema:
+        field_type = field.type
+        if pa.types.is_large_string(field_type):
+            field_type = pa.string()
+        elif pa.types.is_dictionary(field_type) and pa.types.is_large_string(field_type.value_type):
+            field_type = pa.dictionary(field_type.index_type, pa.string())
+        fields.append(pa.field(field.name, field_type, nullable=field.nullable))
+
+    return table.cast(pa.schema(fields)).replace_schema_metadata(None)
+
+
+def compact_series(values, float_decimals: int = 2):
+    """
+    Compacta uma sequência usada como eixo/valores de um gráfico Plotly
+
+    Números viram arrays numpy de tipo reduzido (enviados em base64),
+    datas sem horário viram 'AAAA-MM-DD' e as demais são truncadas em
+    segundos. Outros tipos são devolvidos sem alteração.
+
+    Args:
+        values: Series, Index, array ou lista
+        float_decimals: Casas decimais mantidas em valores float
+
+    Returns:
+        Sequência compactada
+    """
+    if isinstance(values, (list, tuple)):
+        values = pd.Series(values)
+    if not isinstance(values, (pd.Series, pd.Index, np.ndarray)):
+        return values
+
+    series = pd.Series(values)
+
+    if pd.api.types.is_bool_dtype(series):
+        return values
+    if pd.api.types.is_integer_dtype(series):
+        downcast = 'unsigned' if len(series) and series.min() >= 0 else 'integer'
+        return pd.to_numeric(series, downcast=downcast).to_numpy()
+    if pd.api.types.is_float_dtype(series):
+        return _compact_float(series, float_decimals).to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(series):
+        floored = _compact_datetime(series)
+        if (floored.dropna() == floored.dropna().dt.normalize()).all():
+            return floored.dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+        return floored
+    return values
+
+
+def compact_matrix(values: np.ndarray, float_decimals: int = 2) -> np.ndarray:
+    """
+    Compacta uma matriz numérica (ex.: z de um heatmap)
+
+    Args:
+        values: Matriz numpy
+        float_decimals: Casas decimais mantidas
+
+    Returns:
+        Matriz com floats arredondados
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        return np.round(values, float_decimals)
+    return values
@@ -4,7 +4,10 @@ Componentes de cards de métricas para o dashboard
 import streamlit as st
 from typing import Optional
 
+from ..profiling import profiled
 
+
+@profiled
 def metric_card(
     label: str,
     value: str,
@@ -36,6 +39,7 @@ def metric_card(
     )
 
 
+@profiled
 def metrics_row(metrics_data: list):
     """
     Renderiza uma linha de múltiplas métricas
@@ -65,6 +69,7 @@ def metrics_row(metrics_data: list):
             )
 
 
+@profiled
 def status_badge(status: str, status_color: dict = None) -> str:
     """
     Cria um badge HTML para status
@@ -102,6 +107,7 @@ def status_badge(status: str, status_color: dict = None) -> str:
     """
 
 
+@profiled
 def progress_bar(progress: int, label: str = None, color: str = "#1f77b4"):
     """
     Renderiza uma barra de progresso customizada
@@ -118,6 +124,7 @@ def progress_bar(progress: int, label: str = None, color: str = "#1f77b4"):
     st.caption(f"{progress}%")
 
 
+@profiled
 def info_box(title: str, content: str, box_type: str = "info"):
     """
     Renderiza uma caixa de informação estilizada
@@ -3,15 +3,115 @@ Componentes de tabelas interativas para o dashboard
 """
 import streamlit as st
 import pandas as pd
-from typing import Optional, List
+from typing import Any, Callable, Optional, List
 
+from ..data.edits import EditSet, from_editor_state
+from ..profiling import profiled
+from .compact import to_wire_table
 
+PROGRESS_COLUMN = 'Progresso'
+
+
+def _column_config(columns: List[str], column_config: Optional[dict] = None, editable: bool = False) -> dict:
+    """
+    Configuração das colunas com os formatos padrão do dashboard
+
+    'Progresso' é guardado como inteiro de 0 a 100 e exibido como
+    porcentagem (barra nas tabelas, número no editor). A configuração
+    passada pelo chamador tem precedência.
+    """
+    config = {}
+    if PROGRESS_COLUMN in columns:
+        if editable:
+            config[PROGRESS_COLUMN] = st.column_config.NumberColumn(
+                min_value=0, max_value=100, step=1, format="%d%%"
+            )
+        else:
+            config[PROGRESS_COLUMN] = st.column_config.ProgressColumn(
+                min_value=0, max_value=100, format="%d%%"
+            )
+    config.update(column_config or {})
+    return config
+
+
+@profiled
+def filter_dataframe(
+    df: pd.DataFrame,
+    search_term: str,
+    columns: List[str]
+) -> pd.DataFrame:
+    """
+    Filtra as linhas que contêm o termo em alguma das colunas
+
+    Args:
+        df: DataFrame de origem
+        search_term: Texto a buscar (sem diferenciar maiúsculas)
+        columns: Colunas pesquisadas
+
+    Returns:
+        DataFrame filtrado
+    """
+    if not search_term or not columns:
+        return df
+
+    mask = df[columns].apply(
+        lambda x: x.astype(str).str.contains(search_term, case=False, na=False)
+    ).any(axis=1)
+    return df[mask]
+
+
+@profiled
+def sort_dataframe(
+    df: pd.DataFrame,
+    column: str,
+    ascending: bool = True
+) -> pd.DataFrame:
+    """
+    Ordena o DataFrame por uma coluna
+
+    Args:
+        df: DataFrame de origem
+        column: Coluna de ordenação
+        ascending: Se True, ordem crescente
+
+    Returns:
+        DataFrame ordenado
+    """
+    return df.sort_values(by=column, ascending=ascending)
+
+
+@profiled
+def paginate_dataframe(
+    df: pd.DataFrame,
+    page: int,
+    page_size: int
+) -> pd.DataFrame:
+    """
+    Retorna as linhas de uma página
+
+    Args:
+        df: DataFrame de origem
+        page: Número da página (começando em 1)
+        page_size: Número de linhas por página
+
+    Returns:
+        Fatia do DataFrame correspondente à página
+    """
+    start_idx = (page - 1) * page_size
+    end_idx = min(start_idx + page_size, len(df))
+    return df.iloc[start_idx:end_idx]
+
+
+@profiled
 def interactive_table(
     df: pd.DataFrame,
     title: Optional[str] = None,
     page_size: int = 10,
     searchable_columns: Optional[List[str]] = None,
-    sortable: bool = True
+    sortable: bool = True,
+    columns: Optional[List[str]] = None,
+    column_config: Optional[dict] = None,
+    key: Optional[str] = None
 ):
     """
     Renderiza uma tabela interativa com busca e paginação
@@ -22,7 +122,13 @@ def interactive_table(
         page_size: Número de linhas por página
         searchable_columns: Colunas que podem ser pesquisadas
         sortable: Se True, permite ordenação
+        columns: Colunas exibidas (padrão: todas); as demais não são enviadas
+        column_config: Configuração de colunas repassada ao st.dataframe
+        key: Prefixo das chaves dos widgets; sem ele, busca/ordenação/página
+             se perdem quando o DataFrame é recriado a cada execução
     """
+    key = key or str(id(df))
+
     if title:
         st.subheader(title)
 
@@ -31,14 +137,10 @@ def interactive_table(
         search_term = st.text_input(
             "Buscar",
             placeholder=f"Buscar em: {', '.join(searchable_columns)}",
-            key=f"search_{id(df)}"
+            key=f"search_{key}"
         )
 
-        if search_term:
-            mask = df[searchable_columns].apply(
-                lambda x: x.astype(str).str.contains(search_term, case=False, na=False)
-            ).any(axis=1)
-            df = df[mask]
+        df = filter_dataframe(df, search_term, searchable_columns)
 
     # Informações
     total_rows = len(df)
@@ -51,17 +153,17 @@ def interactive_table(
             sort_column = st.selectbox(
                 "Ordenar por",
                 options=df.columns.tolist(),
-                key=f"sort_col_{id(df)}"
+                key=f"sort_col_{key}"
             )
         with col2:
             sort_order = st.selectbox(
                 "Ordem",
                 options=["Crescente", "Decrescente"],
-                key=f"sort_order_{id(df)}"
+                key=f"sort_order_{key}"
             )
 
         ascending = sort_order == "Crescente"
-        df = df.sort_values(by=sort_column, ascending=ascending)
+        df = sort_dataframe(df, sort_column, ascending=ascending)
 
     # Paginação
     if total_rows > page_size:
@@ -71,21 +173,28 @@ def interactive_table(
             min_value=1,
             max_value=total_pages,
             value=1,
-            key=f"page_{id(df)}"
+            key=f"page_{key}"
         )
 
         start_idx = (page - 1) * page_size
         end_idx = min(start_idx + page_size, total_rows)
 
         st.caption(f"Exibindo {start_idx + 1}-{end_idx} de {total_rows}")
-        df_page = df.iloc[start_idx:end_idx]
+        df_page = paginate_dataframe(df, page, page_size)
     else:
         df_page = df
 
-    # Exibir tabela
-    st.dataframe(df_page, use_container_width=True, hide_index=True)
+    # Exibir tabela (apenas a página atual, compactada)
+    table = to_wire_table(df_page, columns=columns)
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        column_config=_column_config(table.column_names, column_config)
+    )
 
 
+@profiled
 def styled_dataframe(
     df: pd.DataFrame,
     title: Optional[str] = None,
@@ -126,6 +235,7 @@ def styled_dataframe(
     st.dataframe(styled, use_container_width=True, hide_index=True)
 
 
+@profiled
 def simple_table(
     data: list,
     columns: list,
@@ -143,21 +253,49 @@ def simple_table(
         st.subheader(title)
 
     df = pd.DataFrame(data, columns=columns)
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.dataframe(
+        to_wire_table(df),
+        use_container_width=True,
+        hide_index=True,
+        column_config=_column_config(columns)
+    )
 
 
+def _save_edits(editor_key: str, edits: EditSet, on_save: Callable[[EditSet], Any]):
+    try:
+        on_save(edits)
+    except (KeyError, ValueError, RuntimeError) as exc:
+        st.session_state[f"{editor_key}_error"] = str(exc)
+        return
+    st.session_state.pop(f"{editor_key}_error", None)
+    # Sem as edições pendentes, o editor volta a mostrar os dados salvos
+    st.session_state.pop(editor_key, None)
+
+
+@profiled
 def data_editor(
     df: pd.DataFrame,
     title: Optional[str] = None,
-    key: Optional[str] = None
+    key: Optional[str] = None,
+    on_save: Optional[Callable[[EditSet], Any]] = None,
+    key_column: str = 'ID',
+    disabled: Optional[List[str]] = None,
+    num_rows: str = 'fixed'
 ):
     """
     Renderiza um editor de dados interativo
 
+    Com `on_save`, mostra um botão que entrega só as alterações (células
+    editadas, linhas novas e removidas, por ID) em vez da tabela inteira.
+
     Args:
         df: DataFrame para editar
         title: Título da tabela
         key: Chave única para o widget
+        on_save: Recebe o EditSet ao salvar (ex.: DataStore.apply_edits)
+        key_column: Coluna com o ID das linhas
+        disabled: Colunas não editáveis
+        num_rows: 'fixed' ou 'dynamic' (permite inserir e remover linhas)
 
     Returns:
         DataFrame editado
@@ -165,16 +303,35 @@ def data_editor(
     if title:
         st.subheader(title)
 
+    key = key or f"editor_{id(df)}"
+    # Índice posicional: as edições do widget são guardadas por posição
     edited_df = st.data_editor(
-        df,
+        df.reset_index(drop=True),
         use_container_width=True,
         hide_index=True,
-        key=key or f"editor_{id(df)}"
+        disabled=disabled or False,
+        num_rows=num_rows,
+        column_config=_column_config(list(df.columns), editable=True),
+        key=key
     )
 
+    if on_save is not None:
+        edits = from_editor_state(df, st.session_state.get(key, {}), key_column)
+        st.button(
+            "Salvar alterações" if edits.empty else f"Salvar alterações ({edits.summary()})",
+            disabled=edits.empty,
+            on_click=_save_edits,
+            args=(key, edits, on_save),
+            key=f"{key}_save"
+        )
+        error = st.session_state.get(f"{key}_error")
+        if error:
+            st.error(f"Alterações não salvas: {error}")
+
     return edited_df
 
 
+@profiled
 def expandable_row_table(
     df: pd.DataFrame,
     summary_columns: List[str],
@@ -1,11 +1,31 @@
 """
 Componente de player de vídeo para o dashboard
 """
+import html
 import streamlit as st
-from streamlit_player import st_player
-from typing import Optional
+from typing import List, Optional, Union
 
+from ..data.schemas import TranscriptSegment
+from ..data.transcripts import TranscriptIndex, format_timestamp
+from ..profiling import profiled
 
+
+def _st_player(*args, **kwargs):
+    """Importa o streamlit_player apenas quando um player é renderizado"""
+    from streamlit_player import st_player
+
+    return st_player(*args, **kwargs)
+
+
+def _with_start_time(url: str, seconds: Optional[float]) -> str:
+    """Adiciona o fragmento #t= (aceito pelo react-player) para iniciar na posição"""
+    if not seconds:
+        return url
+    base = url.split('#', 1)[0]
+    return f"{base}#t={int(seconds)}"
+
+
+@profiled
 def video_player(
     url: str,
     title: Optional[str] = None,
@@ -28,7 +48,7 @@ def video_player(
     if title:
         st.subheader(title)
 
-    st_player(
+    _st_player(
         url,
         height=height,
         controls=controls,
@@ -37,49 +57,124 @@ def video_player(
     )
 
 
+@profiled
 def video_with_transcription(
     video_url: str,
-    transcription: str,
+    transcription: Union[str, List[TranscriptSegment], TranscriptIndex, None],
     title: Optional[str] = None,
-    video_height: int = 400
+    video_height: int = 400,
+    window_before: int = 3,
+    window_after: int = 12,
+    progress_interval_ms: int = 1000,
+    key: Optional[str] = None
 ):
     """
     Renderiza um player de vídeo com transcrição sincronizada
 
+    Apenas uma janela de segmentos em torno da posição atual é enviada ao
+    navegador; o segmento ativo é encontrado por busca binária.
+
     Args:
         video_url: URL do vídeo
-        transcription: Texto da transcrição
+        transcription: Segmentos com timestamps, TranscriptIndex ou texto
+                       corrido (distribuído uniformemente pela duração)
         title: Título do vídeo
         video_height: Altura do player em pixels
+        window_before: Segmentos exibidos antes do ativo
+        window_after: Segmentos exibidos depois do ativo
+        progress_interval_ms: Intervalo dos eventos de progresso do player
+        key: Chave única do componente (padrão: derivada da URL)
     """
     if title:
         st.subheader(title)
 
-    col1, col2 = st.columns([3, 2])
-
-    with col1:
-        st_player(video_url, height=video_height)
-
-    with col2:
-        st.markdown("### Transcrição")
-        st.markdown(
-            f"""
-            <div style="
-                height: {video_height}px;
-                overflow-y: auto;
-                padding: 15px;
-                background-color: #f8f9fa;
-                border-radius: 8px;
-                font-size: 14px;
-                line-height: 1.6;
-            ">
-                {transcription}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    if isinstance(transcription, TranscriptIndex):
+        index = transcription
+    elif isinstance(transcription, str) or transcription is None:
+        index = TranscriptIndex.from_text(transcription or '')
+    else:
+        index = TranscriptIndex(transcription)
+
+    key = key or f"transcript_{video_url}"
+    seek_key = f"{key}_seek"
+
+    def _on_seek():
+        st.session_state[seek_key] = float(st.session_state[f"{key}_seek_input"])
+
+    # O player envia progresso a cada progress_interval_ms; como fragmento,
+    # cada evento reexecuta só o player e a janela da transcrição, e não a
+    # página inteira
+    @st.fragment
+    def _synced_transcript():
+        seek = st.session_state.get(seek_key)
+
+        col1, col2 = st.columns([3, 2])
+
+        with col1:
+            event = _st_player(
+                _with_start_time(video_url, seek),
+                height=video_height,
+                events=["onProgress"],
+                progress_interval=progress_interval_ms,
+                key=f"{key}_player_{seek or 0:.0f}"
+            )
+
+        position = seek or 0.0
+        if getattr(event, 'name', None) == "onProgress" and event.data:
+            position = float(event.data.get("playedSeconds", position))
+
+        with col2:
+            st.markdown("### Transcrição")
+
+            if not len(index):
+                st.caption("Transcrição indisponível")
+                return
+
+            st.slider(
+                "Ir para",
+                min_value=0,
+                max_value=max(1, int(index.duration)),
+                value=int(min(seek or 0, index.duration)),
+                format="%d s",
+                key=f"{key}_seek_input",
+                on_change=_on_seek
+            )
+
+            first, segments = index.window(position, before=window_before, after=window_after)
+            current = index.find(position)
+
+            rows = []
+            for offset, segment in enumerate(segments):
+                active = first + offset == current
+                style = "background-color: #e3f2fd; border-left: 3px solid #1f77b4;" if active else ""
+                rows.append(
+                    f'<div style="padding: 4px 8px; {style}">'
+                    f'<span style="color: #1f77b4; font-family: monospace;">[{format_timestamp(segment.start)}]</span> '
+                    f'{html.escape(segment.text)}</div>'
+                )
+
+            st.markdown(
+                f"""
+                <div style="
+                    height: {video_height}px;
+                    overflow-y: auto;
+                    padding: 15px;
+                    background-color: #f8f9fa;
+                    border-radius: 8px;
+                    font-size: 14px;
+                    line-height: 1.6;
+                ">
+                    {''.join(rows)}
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+            st.caption(f"Trechos {first + 1}-{first + len(segments)} de {len(index)}")
+
+    _synced_transcript()
 
 
+@profiled
 def video_gallery(
     videos: list,
     columns: int = 3
@@ -114,9 +209,10 @@ def video_gallery(
             # Se selecionado, mostra o player
             if f'selected_video_{idx}' in st.session_state:
                 with st.expander("Player", expanded=True):
-                    st_player(st.session_state[f'selected_video_{idx}'])
+                    _st_player(st.session_state[f'selected_video_{idx}'])
 
 
+@profiled
 def video_thumbnail_card(
     thumbnail_url: str,
     title: str,
@@ -176,6 +272,7 @@ def video_thumbnail_card(
         on_click_callback()
 
 
+@profiled
 def placeholder_video():
     """
     Renderiza um placeholder quando não há vídeo disponível
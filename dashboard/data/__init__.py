@@ -1,13 +1,20 @@
 """
 Módulo de dados do dashboard Maiketeiro
+
+Os esquemas são leves e importados diretamente; o gerador de mocks
+(pandas + Faker) só é carregado no primeiro acesso.
 """
-from .schemas import Video, Task, Metric, VideoStatus, TaskType
-from .mock_data import (
-    MockDataGenerator,
-    get_mock_videos,
-    get_mock_tasks,
-    get_mock_metrics
-)
+import importlib
+
+from .schemas import Video, Task, Metric, VideoStatus, TaskType, TranscriptSegment
+from .transcripts import TranscriptIndex
+
+_LAZY_ATTRIBUTES = {
+    'MockDataGenerator': 'mock_data',
+    'get_mock_videos': 'mock_data',
+    'get_mock_tasks': 'mock_data',
+    'get_mock_metrics': 'mock_data'
+}
 
 __all__ = [
     'Video',
@@ -15,8 +22,25 @@ __all__ = [
     'Metric',
     'VideoStatus',
     'TaskType',
+    'TranscriptSegment',
+    'TranscriptIndex',
     'MockDataGenerator',
     'get_mock_videos',
     'get_mock_tasks',
     'get_mock_metrics'
 ]
+
+
+def __getattr__(name: str):
+    """Carrega o submódulo correspondente no primeiro acesso"""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,226 @@
+"""
+Feed de alterações de vídeos e tarefas
+
+Cada inserção ou atualização de um `Video`/`Task` recebe uma versão
+monotonicamente crescente. Uma sessão guarda a última versão que viu e,
+a cada execução, aplica só as alterações seguintes ao seu DataFrame em
+cache e aos agregados (contagens por coluna), em vez de reconstruir a
+tabela: o custo de uma atualização acompanha o número de alterações, não
+o tamanho da tabela.
+
+O feed guarda uma janela limitada de alterações; uma sessão que ficou
+para trás além dela recarrega a tabela inteira.
+"""
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+VIDEO = 'video'
+TASK = 'task'
+
+
+class ChangeKind(Enum):
+    """Tipo de alteração"""
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+@dataclass(frozen=True)
+class Change:
+    """Alteração de um registro em uma versão"""
+    version: int
+    kind: ChangeKind
+    entity: str
+    record: Any
+
+
+class ChangeFeed:
+    """
+    Sequência ordenada de alterações com versões crescentes
+
+    Args:
+        retention: Número de alterações mantidas para leitores atrasados
+    """
+
+    def __init__(self, retention: int = 10_000):
+        self._lock = threading.Lock()
+        self._changes: Deque[Change] = deque(maxlen=retention)
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Versão da última alteração publicada"""
+        return self._version
+
+    def publish(self, entity: str, records: Iterable[Any], kind: ChangeKind = ChangeKind.UPDATE) -> int:
+        """
+        Publica alterações, uma versão por registro
+
+        Args:
+            entity: 'video' ou 'task'
+            records: Registros alterados (o estado novo)
+            kind: Inserção ou atualização
+
+        Returns:
+            Versão da última alteração
+        """
+        return self.publish_many([(entity, kind, records)])
+
+    def publish_many(self, batches: Iterable[Tuple[str, ChangeKind, Iterable[Any]]]) -> int:
+        """
+        Publica vários grupos de alterações como uma transação: um leitor
+        vê todas ou nenhuma
+
+        Args:
+            batches: Trincas (entidade, tipo de alteração, registros)
+
+        Returns:
+            Versão da última alteração
+        """
+        with self._lock:
+            for entity, kind, records in batches:
+                for record in records:
+                    self._version += 1
+                    self._changes.append(Change(self._version, kind, entity, record))
+            return self._version
+
+    def since(self, version: int) -> Tuple[List[Change], bool]:
+        """
+        Alterações posteriores a uma versão
+
+        Args:
+            version: Última versão vista pelo leitor
+
+        Returns:
+            Tupla (alterações em ordem, completo). `completo` é False se
+            parte das alterações já saiu da janela de retenção.
+        """
+        with self._lock:
+            if version >= self._version:
+                return [], True
+            oldest = self._changes[0].version if self._changes else self._version + 1
+            complete = version + 1 >= oldest
+            return [c for c in self._changes if c.version > version], complete
+
+
+class LiveTable:
+    """
+    DataFrame de uma entidade, indexado por ID, mantido por deltas do feed
+
+    Args:
+        entity: 'video' ou 'task'
+        to_row: Converte um registro na linha do DataFrame
+        key_column: Coluna com o ID
+        count_columns: Colunas cujas contagens de valores são mantidas
+    """
+
+    def __init__(
+        self,
+        entity: str,
+        to_row: Callable[[Any], dict],
+        key_column: str = 'ID',
+        count_columns: Tuple[str, ...] = ('Status',)
+    ):
+        self.entity = entity
+        self.to_row = to_row
+        self.key_column = key_column
+        self.count_columns = count_columns
+        self.version = 0
+        self.df = pd.DataFrame()
+        self.counts: Dict[str, Counter] = {col: Counter() for col in count_columns}
+
+    def _frame(self, records: Iterable[Any]) -> pd.DataFrame:
+        df = pd.DataFrame([self.to_row(r) for r in records])
+        if df.empty:
+            return df
+        return df.set_index(self.key_column, drop=False).rename_axis(None)
+
+    def load(self, records: Iterable[Any], version: int):
+        """Substitui a tabela inteira (carga inicial ou leitor atrasado)"""
+        self.df = self._frame(records)
+        self.version = version
+        for col in self.count_columns:
+            self.counts[col] = Counter(self.df[col]) if col in self.df else Counter()
+
+    def apply(self, changes: Iterable[Change]) -> int:
+        """
+        Aplica alterações ao DataFrame e aos agregados
+
+        Atualizações são gravadas no lugar; inserções são acrescentadas
+        em um único concat por chamada e remoções saem em um único drop.
+
+        Args:
+            changes: Alterações em ordem de versão
+
+        Returns:
+            Número de linhas alteradas
+        """
+        latest: Dict[str, Change] = {}
+        for change in changes:
+            self.version = max(self.version, change.version)
+            if change.entity == self.entity:
+                latest[change.record.id] = change
+        if not latest:
+            return 0
+
+        deleted = [i for i, c in latest.items() if c.kind == ChangeKind.DELETE and i in self.df.index]
+        if deleted:
+            for col in self.count_columns:
+                self.counts[col].subtract(self.df.loc[deleted, col])
+                self.counts[col] = +self.counts[col]
+            self.df = self.df.drop(index=deleted)
+        records = [c.record for c in latest.values() if c.kind != ChangeKind.DELETE]
+        if not records:
+            return len(deleted)
+
+        new = self._frame(records)
+        if self.df.empty:
+            self.load(records, self.version)
+            return len(new) + len(deleted)
+
+        existing = new.index.intersection(self.df.index)
+        inserted = new.index.difference(self.df.index)
+
+        for col in self.count_columns:
+            self.counts[col].subtract(self.df.loc[existing, col])
+            self.counts[col].update(new[col])
+            self.counts[col] = +self.counts[col]
+
+        if len(existing):
+            updates = new.loc[existing]
+            for col in updates.columns:
+                values = updates[col]
+                if col in self.df and values.dtype != self.df[col].dtype:
+                    # Colunas só com None chegam como object
+                    try:
+                        values = values.astype(self.df[col].dtype)
+                    except (TypeError, ValueError):
+                        self.df[col] = self.df[col].astype(object)
+                self.df.loc[existing, col] = values
+        if len(inserted):
+            self.df = pd.concat([self.df, new.loc[inserted]])
+        return len(new) + len(deleted)
+
+    def refresh(self, feed: ChangeFeed, reload: Callable[[], Tuple[List[Any], int]]) -> int:
+        """
+        Traz a tabela para a versão atual do feed
+
+        Args:
+            feed: Feed de alterações
+            reload: Função que devolve (todos os registros, versão) para
+                    recarga quando o delta não está mais disponível
+
+        Returns:
+            Número de linhas alteradas (tamanho da tabela em uma recarga)
+        """
+        changes, complete = feed.since(self.version)
+        if not complete:
+            records, version = reload()
+            self.load(records, version)
+            return len(self.df)
+        return self.apply(changes)
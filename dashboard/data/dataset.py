@@ -0,0 +1,264 @@
+"""
+Fotografias de dados em disco, geradas com semente e escala fixas
+
+O `MockDataGenerator` usa o `random` global e o Faker sem semente: duas
+execuções nunca veem os mesmos dados e números de benchmark não se
+comparam. Esta ferramenta gera vídeos, tarefas e métricas a partir de uma
+semente, uma escala e uma data de referência fixas e grava cada conjunto
+em Arrow IPC (Feather v2) sem compressão, um formato colunar binário lido
+sem parsing de texto.
+
+Na carga, as colunas são convertidas de volta nos registros do
+`DataStore`; o custo de subir a partir de uma fotografia é essa
+conversão, não a leitura do arquivo.
+
+Com $MAIKETEIRO_DATASET apontando para uma fotografia, o dashboard sobe a
+partir dela (`store.get_store`) em vez de gerar dados em tempo de execução.
+
+Requer pyarrow.
+
+Uso:
+    python -m dashboard.data.dataset generate .datasets/seed42 --seed 42 --videos 10000
+    python -m dashboard.data.dataset info .datasets/seed42
+    MAIKETEIRO_DATASET=.datasets/seed42 streamlit run app.py
+"""
+import argparse
+import json
+import os
+import random
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional, Type
+
+from .schemas import Metric, Task, TaskType, Video, VideoStatus
+
+DATASET_ENV = "MAIKETEIRO_DATASET"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# Data de referência padrão: com ela, semente e escala definem os dados
+DEFAULT_ANCHOR = datetime(2025, 1, 1)
+
+_ENUM_FIELDS: Dict[str, Type[Enum]] = {'status': VideoStatus, 'task_type': TaskType}
+
+
+@dataclass
+class Dataset:
+    """Vídeos, tarefas e métricas de uma fotografia"""
+    seed: Optional[int]
+    anchor: datetime
+    videos: List[Video] = field(default_factory=list)
+    tasks: List[Task] = field(default_factory=list)
+    metrics: List[Metric] = field(default_factory=list)
+
+
+def _arrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("pyarrow não está instalado (pip install pyarrow)") from e
+    return pyarrow
+
+
+def _schemas() -> Dict[str, object]:
+    pa = _arrow()
+    ts = pa.timestamp('us')
+    return {
+        'videos': pa.schema([
+            ('id', pa.string()), ('title', pa.string()), ('filename', pa.string()),
+            ('duration', pa.int64()), ('size_mb', pa.float64()), ('format', pa.string()),
+            ('resolution', pa.string()), ('codec', pa.string()), ('fps', pa.int64()),
+            ('status', pa.string()), ('created_at', ts), ('processed_at', ts),
+            ('thumbnail_url', pa.string()), ('transcription', pa.string()),
+            ('subtitle_url', pa.string()), ('tags', pa.list_(pa.string())),
+        ]),
+        'tasks': pa.schema([
+            ('id', pa.string()), ('video_id', pa.string()), ('video_title', pa.string()),
+            ('task_type', pa.string()), ('status', pa.string()), ('progress', pa.int64()),
+            ('created_at', ts), ('started_at', ts), ('completed_at', ts),
+            ('error_message', pa.string()), ('duration_seconds', pa.float64()),
+            ('output_file', pa.string()),
+        ]),
+        'metrics': pa.schema([
+            ('date', ts), ('videos_processed', pa.int64()), ('total_duration_hours', pa.float64()),
+            ('tasks_completed', pa.int64()), ('tasks_failed', pa.int64()),
+            ('storage_used_gb', pa.float64()), ('avg_processing_time_min', pa.float64()),
+        ]),
+    }
+
+
+_RECORD_TYPES = {'videos': Video, 'tasks': Task, 'metrics': Metric}
+
+
+def generate_dataset(
+    seed: int,
+    videos: int = 1000,
+    tasks_per_video: int = 2,
+    days: int = 30,
+    anchor: datetime = DEFAULT_ANCHOR
+) -> Dataset:
+    """
+    Gera um conjunto reprodutível com o MockDataGenerator
+
+    Semeia o `random` global e o Faker compartilhado (como
+    benchmarks/run_benchmarks.py); não chamar dentro do servidor.
+
+    Args:
+        seed: Semente dos geradores
+        videos: Número de vídeos
+        tasks_per_video: Máximo de tarefas por vídeo
+        days: Dias de métricas
+        anchor: Data de referência ("agora") dos dados
+
+    Returns:
+        Dataset gerado
+    """
+    from .mock_data import MockDataGenerator, get_faker
+
+    random.seed(seed)
+    get_faker().seed_instance(seed)
+
+    video_list = MockDataGenerator.generate_videos(videos, now=anchor)
+    return Dataset(
+        seed=seed,
+        anchor=anchor,
+        videos=video_list,
+        tasks=MockDataGenerator.generate_tasks(video_list, tasks_per_video),
+        metrics=MockDataGenerator.generate_metrics(days, now=anchor, storage_history=False)
+    )
+
+
+def _to_table(records: list, schema):
+    pa = _arrow()
+    columns = {name: [] for name in schema.names}
+    for record in records:
+        for name, values in columns.items():
+            value = getattr(record, name)
+            values.append(value.name if isinstance(value, Enum) else value)
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def _from_table(table, record_type: type) -> list:
+    names = [f.name for f in fields(record_type)]
+    columns = {name: table.column(name).to_pylist() for name in names}
+    for name, enum in _ENUM_FIELDS.items():
+        if name in columns:
+            columns[name] = [enum[v] for v in columns[name]]
+    return [record_type(*row) for row in zip(*(columns[n] for n in names))]
+
+
+def write_dataset(dataset: Dataset, path: str) -> str:
+    """
+    Grava a fotografia em um diretório (um arquivo Arrow por conjunto)
+
+    Cada arquivo é substituído atomicamente; o manifesto é gravado por
+    último, então um diretório com manifesto está completo.
+
+    Args:
+        dataset: Dados a gravar
+        path: Diretório de destino
+
+    Returns:
+        Caminho do diretório
+    """
+    pa = _arrow()
+    os.makedirs(path, exist_ok=True)
+
+    counts = {}
+    for name, schema in _schemas().items():
+        records = getattr(dataset, name)
+        table = _to_table(records, schema)
+        target = os.path.join(path, f"{name}.arrow")
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, target)
+        counts[name] = len(records)
+
+    manifest = {
+        'format': FORMAT_VERSION,
+        'seed': dataset.seed,
+        'anchor': dataset.anchor.isoformat(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'rows': counts,
+    }
+    target = os.path.join(path, MANIFEST_FILE)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, target)
+    return path
+
+
+def read_manifest(path: str) -> dict:
+    """Lê o manifesto de uma fotografia"""
+    with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Formato de fotografia não suportado: {manifest.get('format')}")
+    return manifest
+
+
+def read_table(path: str, name: str):
+    """
+    Tabela Arrow de um conjunto ('videos', 'tasks' ou 'metrics')
+
+    Returns:
+        pyarrow.Table
+    """
+    pa = _arrow()
+    with pa.OSFile(os.path.join(path, f"{name}.arrow"), 'rb') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def load_dataset(path: str) -> Dataset:
+    """
+    Carrega uma fotografia gravada por write_dataset
+
+    Args:
+        path: Diretório da fotografia
+
+    Returns:
+        Dataset com os registros reconstruídos
+    """
+    manifest = read_manifest(path)
+    loaded = {name: _from_table(read_table(path, name), record_type)
+              for name, record_type in _RECORD_TYPES.items()}
+    return Dataset(
+        seed=manifest.get('seed'),
+        anchor=datetime.fromisoformat(manifest['anchor']),
+        **loaded
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fotografias de dados com semente")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    generate = sub.add_parser('generate', help='Gera e grava uma fotografia')
+    generate.add_argument('path')
+    generate.add_argument('--seed', type=int, default=42)
+    generate.add_argument('--videos', type=int, default=1000)
+    generate.add_argument('--tasks-per-video', type=int, default=2)
+    generate.add_argument('--days', type=int, default=30)
+    generate.add_argument('--anchor', type=datetime.fromisoformat, default=DEFAULT_ANCHOR,
+                          help='Data de referência (ISO 8601)')
+
+    info = sub.add_parser('info', help='Mostra o manifesto de uma fotografia')
+    info.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        dataset = generate_dataset(args.seed, args.videos, args.tasks_per_video, args.days, args.anchor)
+        write_dataset(dataset, args.path)
+        print(f"{len(dataset.videos)} vídeos, {len(dataset.tasks)} tarefas e "
+              f"{len(dataset.metrics)} métricas gravados em {args.path}")
+    else:
+        print(json.dumps(read_manifest(args.path), ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
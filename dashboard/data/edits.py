@@ -0,0 +1,231 @@
+"""
+Alterações feitas em tabelas editáveis, como conjunto mínimo por ID
+
+O `st.data_editor` devolve o DataFrame inteiro; gravá-lo de volta
+reescreveria todas as linhas após a edição de uma única célula. Aqui as
+edições viram um `EditSet` com só as células alteradas, as linhas novas
+e os IDs removidos, que o `DataStore` aplica em uma única transação
+(`DataStore.apply_edits`): o custo acompanha o número de edições, não o
+tamanho da tabela.
+
+O `EditSet` pode vir do estado do widget (`from_editor_state`, que já
+registra as edições por posição) ou da comparação de dois DataFrames
+(`diff_frames`). Cada entidade declara as colunas editáveis e como cada
+valor exibido volta ao campo do registro (`EDITABLE_FIELDS`).
+"""
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .changes import TASK, VIDEO
+from .schemas import Video, VideoStatus
+
+
+@dataclass
+class EditSet:
+    """Células alteradas por ID, linhas inseridas e IDs removidos"""
+    updated: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.updated or self.added or self.deleted)
+
+    @property
+    def cells(self) -> int:
+        """Número de células alteradas"""
+        return sum(len(cols) for cols in self.updated.values())
+
+    def summary(self) -> str:
+        """Resumo legível ('células: 3 · novas: 1 · removidas: 0')"""
+        return f"células: {self.cells} · novas: {len(self.added)} · removidas: {len(self.deleted)}"
+
+
+def _split_tags(value) -> List[str]:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    if isinstance(value, str):
+        return [t.strip() for t in value.split(',') if t.strip()]
+    return [str(t) for t in value]
+
+
+def _text(value) -> str:
+    return '' if value is None or value is pd.NA else str(value)
+
+
+def _progress(value) -> int:
+    progress = int(value)
+    if not 0 <= progress <= 100:
+        raise ValueError(f"Progresso fora de 0-100: {progress}")
+    return progress
+
+
+# Coluna exibida -> (campo do registro, conversão do valor editado)
+EDITABLE_FIELDS: Dict[str, Dict[str, Tuple[str, Callable[[Any], Any]]]] = {
+    VIDEO: {
+        'Título': ('title', _text),
+        'Tags': ('tags', _split_tags),
+        'Status': ('status', VideoStatus),
+    },
+    TASK: {
+        'Status': ('status', VideoStatus),
+        'Progresso': ('progress', _progress),
+        'Erro': ('error_message', lambda v: None if v in (None, '') else str(v)),
+    },
+}
+
+
+def record_changes(entity: str, cells: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Converte células editadas nos campos do registro
+
+    Args:
+        entity: 'video' ou 'task'
+        cells: Valores editados por coluna exibida
+
+    Returns:
+        Valores por campo do registro (para dataclasses.replace)
+
+    Raises:
+        ValueError: Coluna não editável ou valor inválido
+    """
+    fields = EDITABLE_FIELDS.get(entity, {})
+    changes = {}
+    for column, value in cells.items():
+        if column not in fields:
+            raise ValueError(f"Coluna '{column}' não é editável")
+        name, convert = fields[column]
+        try:
+            changes[name] = convert(value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Valor inválido para '{column}': {value!r}") from exc
+    return changes
+
+
+def new_record(entity: str, cells: Mapping[str, Any]) -> Video:
+    """
+    Registro novo a partir de uma linha inserida no editor
+
+    Só vídeos podem ser inseridos; campos não editáveis recebem valores
+    padrão e, sem 'ID', um ID novo é gerado.
+
+    Args:
+        entity: 'video' ou 'task'
+        cells: Valores da linha por coluna exibida
+
+    Returns:
+        Video novo
+
+    Raises:
+        ValueError: Entidade sem inserção ou valores inválidos
+    """
+    if entity != VIDEO:
+        raise ValueError(f"Inserção de '{entity}' pelo editor não é suportada")
+    record_id = cells.get('ID')
+    values = {'title': '', 'tags': [], 'status': VideoStatus.PENDING}
+    values.update(record_changes(entity, {k: v for k, v in cells.items() if k != 'ID'}))
+    return Video(
+        id=str(record_id) if not _missing(record_id) else f"video_{uuid.uuid4().hex[:8]}",
+        filename='', duration=0, size_mb=0.0, format='', resolution='', codec='', fps=0,
+        created_at=datetime.now(), processed_at=None, thumbnail_url=None,
+        transcription=None, subtitle_url=None, **values
+    )
+
+
+def _missing(value) -> bool:
+    return value is None or (np.isscalar(value) and bool(pd.isna(value)))
+
+
+def _same(a, b) -> bool:
+    if _missing(a) or _missing(b):
+        return _missing(a) and _missing(b)
+    return bool(a == b)
+
+
+def from_editor_state(
+    df: pd.DataFrame,
+    editor_state: Mapping[str, Any],
+    key_column: str = 'ID'
+) -> EditSet:
+    """
+    EditSet a partir do estado de um `st.data_editor`
+
+    O widget guarda as edições por posição ('edited_rows', 'added_rows',
+    'deleted_rows'); as posições são traduzidas para o ID da linha e
+    células devolvidas ao valor original são descartadas. O custo é
+    proporcional ao número de edições.
+
+    Args:
+        df: DataFrame exibido no editor (na mesma ordem)
+        editor_state: st.session_state[key] do editor
+        key_column: Coluna com o ID
+
+    Returns:
+        EditSet
+    """
+    ids = df[key_column]
+    columns = {col: i for i, col in enumerate(df.columns)}
+    edits = EditSet()
+
+    for position, cells in editor_state.get('edited_rows', {}).items():
+        position = int(position)
+        changed = {
+            col: value for col, value in cells.items()
+            if col in columns and not _same(df.iat[position, columns[col]], value)
+        }
+        if changed:
+            edits.updated[str(ids.iat[position])] = changed
+
+    edits.added = [dict(row) for row in editor_state.get('added_rows', []) if row]
+    edits.deleted = [str(ids.iat[int(p)]) for p in editor_state.get('deleted_rows', [])]
+    for record_id in edits.deleted:
+        edits.updated.pop(record_id, None)
+    return edits
+
+
+def diff_frames(
+    original: pd.DataFrame,
+    edited: pd.DataFrame,
+    key_column: str = 'ID',
+    columns: Optional[List[str]] = None
+) -> EditSet:
+    """
+    EditSet comparando duas versões de uma tabela, alinhadas pelo ID
+
+    A comparação é vetorizada por coluna; só as células diferentes são
+    convertidas em objetos Python.
+
+    Args:
+        original: Tabela antes da edição
+        edited: Tabela depois da edição
+        key_column: Coluna com o ID (linhas sem ID são inserções)
+        columns: Colunas comparadas (padrão: as comuns, menos o ID)
+
+    Returns:
+        EditSet
+    """
+    before = original.set_index(key_column, drop=False)
+    has_id = edited[key_column].notna()
+    after = edited[has_id].set_index(key_column, drop=False)
+
+    edits = EditSet()
+    edits.deleted = [str(i) for i in before.index.difference(after.index)]
+    new_ids = after.index.difference(before.index)
+    edits.added = (
+        edited[~has_id].to_dict('records') + after.loc[new_ids].to_dict('records')
+    )
+
+    common = after.index.intersection(before.index, sort=False)
+    columns = columns or [c for c in after.columns if c in before.columns and c != key_column]
+    left, right = before.loc[common, columns], after.loc[common, columns]
+    for column in columns:
+        a, b = left[column], right[column]
+        differs = (a != b).to_numpy() & ~(a.isna() & b.isna()).to_numpy()
+        for position in np.flatnonzero(differs):
+            edits.updated.setdefault(str(common[position]), {})[column] = b.iat[position]
+    return edits
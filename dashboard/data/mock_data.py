@@ -3,13 +3,27 @@ Gerador de dados mockados para o dashboard Maiketeiro
 """
 import random
 from datetime import datetime, timedelta
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 import pandas as pd
-from faker import Faker
 
 from .schemas import Video, Task, Metric, VideoStatus, TaskType
+from .storage_history import load_storage_history
 
-fake = Faker('pt_BR')
+
+@lru_cache(maxsize=None)
+def get_faker():
+    """Instância Faker pt_BR, criada apenas no primeiro uso"""
+    from faker import Faker
+
+    return Faker('pt_BR')
+
+
+def __getattr__(name: str):
+    # Compatibilidade com o antigo global `fake` sem pagar o custo no import
+    if name == 'fake':
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class MockDataGenerator:
@@ -40,12 +54,14 @@ class MockDataGenerator:
     ]
 
     @staticmethod
-    def generate_videos(count: int = 25) -> List[Video]:
-        """Gera lista de vídeos mockados"""
+    def generate_videos(count: int = 25, now: Optional[datetime] = None) -> List[Video]:
+        """Gera lista de vídeos mockados, criados nos 30 dias até `now`"""
         videos = []
+        fake = get_faker()
+        now = now or datetime.now()
 
         for i in range(count):
-            created_at = fake.date_time_between(start_date='-30d', end_date='now')
+            created_at = fake.date_time_between(start_date=now - timedelta(days=30), end_date=now)
 
             # Define status com distribuição realista
             status_weights = [0.1, 0.15, 0.65, 0.05, 0.05]
@@ -145,10 +161,20 @@ class MockDataGenerator:
         return tasks
 
     @staticmethod
-    def generate_metrics(days: int = 30) -> List[Metric]:
-        """Gera métricas diárias dos últimos N dias"""
+    def generate_metrics(
+        days: int = 30,
+        now: Optional[datetime] = None,
+        storage_history: bool = True
+    ) -> List[Metric]:
+        """
+        Gera métricas diárias dos últimos N dias
+
+        O armazenamento vem do histórico real (processing.storage) nos dias
+        em que houver registro, a menos que `storage_history` seja False.
+        """
         metrics = []
-        end_date = datetime.now()
+        end_date = now or datetime.now()
+        storage_by_day = {s.day: s.total_gb for s in load_storage_history()} if storage_history else {}
 
         for i in range(days):
             date = end_date - timedelta(days=days - i - 1)
@@ -163,53 +189,97 @@ class MockDataGenerator:
                 total_duration_hours=round(random.uniform(2, 15), 2),
                 tasks_completed=max(0, videos_processed * random.randint(1, 3)),
                 tasks_failed=random.randint(0, 2),
-                storage_used_gb=round(50 + i * 1.5 + random.uniform(-5, 5), 2),
+                storage_used_gb=storage_by_day.get(
+                    date.date(), round(50 + i * 1.5 + random.uniform(-5, 5), 2)
+                ),
                 avg_processing_time_min=round(random.uniform(5, 45), 2)
             )
             metrics.append(metric)
 
         return metrics
 
+    @staticmethod
+    def video_row(v: Video) -> dict:
+        """Linha de DataFrame de um vídeo"""
+        return {
+            'ID': v.id,
+            'Título': v.title,
+            'Arquivo': v.filename,
+            'Duração (min)': round(v.duration / 60, 1),
+            'Tamanho (MB)': v.size_mb,
+            'Formato': v.format,
+            'Resolução': v.resolution,
+            'Codec': v.codec,
+            'FPS': v.fps,
+            'Status': v.status.value,
+            'Criado em': v.created_at,
+            'Processado em': v.processed_at,
+            'Tags': ', '.join(v.tags)
+        }
+
+    @staticmethod
+    def task_row(t: Task) -> dict:
+        """Linha de DataFrame de uma tarefa"""
+        return {
+            'ID': t.id,
+            'ID do Vídeo': t.video_id,
+            'Vídeo': t.video_title,
+            'Tipo': t.task_type.value,
+            'Status': t.status.value,
+            'Progresso': t.progress,
+            'Criado em': t.created_at,
+            'Iniciado em': t.started_at,
+            'Concluído em': t.completed_at,
+            'Duração (min)': round(t.duration_seconds / 60, 1) if t.duration_seconds else None,
+            'Erro': t.error_message
+        }
+
     @staticmethod
     def videos_to_dataframe(videos: List[Video]) -> pd.DataFrame:
         """Converte lista de vídeos para DataFrame"""
-        data = []
-        for v in videos:
-            data.append({
-                'ID': v.id,
-                'Título': v.title,
-                'Arquivo': v.filename,
-                'Duração (min)': round(v.duration / 60, 1),
-                'Tamanho (MB)': v.size_mb,
-                'Formato': v.format,
-                'Resolução': v.resolution,
-                'Codec': v.codec,
-                'FPS': v.fps,
-                'Status': v.status.value,
-                'Criado em': v.created_at,
-                'Processado em': v.processed_at,
-                'Tags': ', '.join(v.tags)
-            })
-        return pd.DataFrame(data)
+        return pd.DataFrame([MockDataGenerator.video_row(v) for v in videos])
 
     @staticmethod
     def tasks_to_dataframe(tasks: List[Task]) -> pd.DataFrame:
         """Converte lista de tarefas para DataFrame"""
-        data = []
-        for t in tasks:
-            data.append({
-                'ID': t.id,
-                'Vídeo': t.video_title,
-                'Tipo': t.task_type.value,
-                'Status': t.status.value,
-                'Progresso': f"{t.progress}%",
-                'Criado em': t.created_at,
-                'Iniciado em': t.started_at,
-                'Concluído em': t.completed_at,
-                'Duração (min)': round(t.duration_seconds / 60, 1) if t.duration_seconds else None,
-                'Erro': t.error_message
-            })
-        return pd.DataFrame(data)
+        return pd.DataFrame([MockDataGenerator.task_row(t) for t in tasks])
+
+    @staticmethod
+    def simulate_activity(tasks: List[Task], count: int) -> List[Task]:
+        """
+        Avança o processamento de algumas tarefas, imitando o backend
+
+        Tarefas na fila começam, em processamento avançam (e às vezes
+        concluem ou falham).
+
+        Args:
+            tasks: Tarefas existentes (modificadas no lugar)
+            count: Número máximo de tarefas alteradas
+
+        Returns:
+            Tarefas alteradas
+        """
+        active = [t for t in tasks if t.status in (VideoStatus.QUEUED, VideoStatus.PROCESSING)]
+        changed = random.sample(active, min(count, len(active)))
+        now = datetime.now()
+
+        for task in changed:
+            if task.status == VideoStatus.QUEUED:
+                task.status = VideoStatus.PROCESSING
+                task.started_at = now
+                task.progress = random.randint(1, 10)
+                continue
+
+            task.progress = min(100, task.progress + random.randint(5, 30))
+            if task.progress == 100 or random.random() < 0.02:
+                failed = task.progress < 100
+                task.status = VideoStatus.FAILED if failed else VideoStatus.COMPLETED
+                task.error_message = "Erro ao processar arquivo" if failed else None
+                task.completed_at = now
+                if task.started_at:
+                    task.duration_seconds = (now - task.started_at).total_seconds()
+
+        return changed
 
     @staticmethod
     def metrics_to_dataframe(metrics: List[Metric]) -> pd.DataFrame:
@@ -0,0 +1,137 @@
+"""
+Estado da fila de processamento publicado pelo agendador
+
+O agendador (`processing.scheduler`) grava periodicamente um JSON com as
+tarefas em execução, prontas, aguardando (dependências ou backoff),
+falhas e em dead letter; o dashboard só lê esse arquivo, sem depender do
+processo que executa as tarefas.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from .schemas import Task, TaskType, VideoStatus
+
+QUEUE_FILE_ENV = "MAIKETEIRO_QUEUE_FILE"
+DEFAULT_QUEUE_FILE = os.path.join(".scheduler", "queue.json")
+
+_DATETIME_FIELDS = ('created_at', 'started_at', 'completed_at')
+
+
+@dataclass
+class QueueEntry:
+    """Tarefa na fila com o comprimento do caminho crítico que ela inicia"""
+    task: Task
+    critical_path_seconds: float
+
+
+@dataclass
+class QueueState:
+    """Fotografia da fila de processamento"""
+    updated_at: datetime
+    workers: int
+    running: List[QueueEntry] = field(default_factory=list)
+    ready: List[QueueEntry] = field(default_factory=list)
+    waiting: List[QueueEntry] = field(default_factory=list)
+    failed: List[QueueEntry] = field(default_factory=list)
+    dead_letter: List[QueueEntry] = field(default_factory=list)
+    completed: int = 0
+
+
+def task_to_dict(task: Task) -> dict:
+    """Serializa uma tarefa para JSON"""
+    data = dict(task.__dict__)
+    data['task_type'] = task.task_type.name
+    data['status'] = task.status.name
+    for name in _DATETIME_FIELDS:
+        value = data[name]
+        data[name] = value.isoformat() if value else None
+    return data
+
+
+def task_from_dict(data: dict) -> Task:
+    """Reconstrói uma tarefa serializada por task_to_dict"""
+    data = dict(data)
+    data['task_type'] = TaskType[data['task_type']]
+    data['status'] = VideoStatus[data['status']]
+    for name in _DATETIME_FIELDS:
+        value = data[name]
+        data[name] = datetime.fromisoformat(value) if value else None
+    return Task(**data)
+
+
+def _entries_to_json(entries: List[QueueEntry]) -> list:
+    return [
+        {'task': task_to_dict(e.task), 'critical_path_seconds': e.critical_path_seconds}
+        for e in entries
+    ]
+
+
+def _entries_from_json(items: list) -> List[QueueEntry]:
+    return [QueueEntry(task_from_dict(i['task']), i['critical_path_seconds']) for i in items]
+
+
+def save_queue_state(state: QueueState, path: Optional[str] = None) -> str:
+    """
+    Grava o estado da fila (substituição atômica)
+
+    Args:
+        state: Estado a gravar
+        path: Caminho do arquivo. Padrão: $MAIKETEIRO_QUEUE_FILE ou
+              .scheduler/queue.json
+
+    Returns:
+        Caminho gravado
+    """
+    path = path or os.environ.get(QUEUE_FILE_ENV, DEFAULT_QUEUE_FILE)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    data = {
+        'updated_at': state.updated_at.isoformat(),
+        'workers': state.workers,
+        'running': _entries_to_json(state.running),
+        'ready': _entries_to_json(state.ready),
+        'waiting': _entries_to_json(state.waiting),
+        'failed': _entries_to_json(state.failed),
+        'dead_letter': _entries_to_json(state.dead_letter),
+        'completed': state.completed,
+    }
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_queue_state(path: Optional[str] = None) -> Optional[QueueState]:
+    """
+    Lê o estado da fila gravado pelo agendador
+
+    Args:
+        path: Caminho do arquivo (mesmo padrão de save_queue_state)
+
+    Returns:
+        QueueState, ou None se não houver agendador publicando estado
+    """
+    path = path or os.environ.get(QUEUE_FILE_ENV, DEFAULT_QUEUE_FILE)
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    return QueueState(
+        updated_at=datetime.fromisoformat(data['updated_at']),
+        workers=data['workers'],
+        running=_entries_from_json(data['running']),
+        ready=_entries_from_json(data['ready']),
+        waiting=_entries_from_json(data['waiting']),
+        failed=_entries_from_json(data['failed']),
+        dead_letter=_entries_from_json(data.get('dead_letter', [])),
+        completed=data['completed'],
+    )
@@ -26,6 +26,14 @@ class TaskType(Enum):
     COMPRESS = "Compressão"
 
 
+@dataclass
+class TranscriptSegment:
+    """Trecho de transcrição com tempos em segundos desde o início do vídeo"""
+    start: float
+    end: float
+    text: str
+
+
 @dataclass
 class Video:
     """Modelo de dados para vídeos"""
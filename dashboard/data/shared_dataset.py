@@ -0,0 +1,268 @@
+"""
+Segmento de dados compartilhado entre os workers do dashboard
+
+Um processo carregador publica as tabelas de vídeos, tarefas e métricas
+(as mesmas colunas exibidas pelo dashboard) uma única vez, em arquivos
+Arrow IPC sem compressão dentro de um diretório em memória compartilhada
+(/dev/shm por padrão; qualquer diretório serve como arquivo mapeado). Cada
+worker mapeia esses arquivos e monta DataFrames cujas colunas de texto
+(dtypes Arrow) apontam para os mesmos buffers, sem cópia: as páginas ficam
+no page cache uma única vez por host, e a RAM não cresce com o número de
+workers.
+
+Cada publicação é uma geração nova (`gen-000001`, `gen-000002`...);
+o ponteiro `CURRENT` é trocado atomicamente depois que a geração está
+completa. Os workers verificam o ponteiro periodicamente e passam para a
+nova geração; a anterior continua válida enquanto estiver mapeada, mesmo
+depois de removida pelo carregador.
+
+Uso:
+    python -m dashboard.data.shared_dataset publish --dataset .datasets/seed42
+    python -m dashboard.data.shared_dataset publish --seed 42 --videos 100000 --interval 300
+    python -m dashboard.data.shared_dataset info
+    MAIKETEIRO_SHARED_DATASET=/dev/shm/maiketeiro streamlit run app.py
+"""
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .dataset import Dataset, _arrow, generate_dataset, load_dataset
+from .snapshot import DatasetSnapshot
+
+SHARED_DATASET_ENV = "MAIKETEIRO_SHARED_DATASET"
+DEFAULT_SHARED_ROOT = os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else ".datasets", "maiketeiro")
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+TABLES = ('videos', 'tasks', 'metrics')
+COUNT_COLUMNS = ('Status',)
+
+# Gerações mantidas no diretório além da atual
+KEEP_GENERATIONS = 1
+
+
+def _root(root: Optional[str]) -> str:
+    return root or os.environ.get(SHARED_DATASET_ENV, DEFAULT_SHARED_ROOT)
+
+
+def _generation_name(generation: int) -> str:
+    return f"gen-{generation:06d}"
+
+
+def _frames(dataset: Dataset) -> Dict[str, pd.DataFrame]:
+    from .mock_data import MockDataGenerator
+
+    return {
+        'videos': MockDataGenerator.videos_to_dataframe(dataset.videos),
+        'tasks': MockDataGenerator.tasks_to_dataframe(dataset.tasks),
+        'metrics': MockDataGenerator.metrics_to_dataframe(dataset.metrics),
+    }
+
+
+def _shared_dtype(arrow_type):
+    # Textos e listas (a maior parte dos bytes) ficam sobre os buffers
+    # mapeados; datas e números viram numpy (8 bytes por linha) para
+    # continuarem compatíveis com nlargest, .dt etc.
+    import pyarrow as pa
+
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or pa.types.is_list(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def current_generation(root: Optional[str] = None) -> Optional[int]:
+    """Geração apontada por CURRENT, ou None se nada foi publicado"""
+    try:
+        with open(os.path.join(_root(root), CURRENT_FILE), encoding='utf-8') as f:
+            return int(f.read().strip().rsplit('-', 1)[-1])
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def publish(dataset: Dataset, root: Optional[str] = None, keep: int = KEEP_GENERATIONS) -> int:
+    """
+    Publica uma nova geração e a torna a atual
+
+    Args:
+        dataset: Dados a publicar
+        root: Diretório do segmento (padrão: $MAIKETEIRO_SHARED_DATASET ou
+              /dev/shm/maiketeiro)
+        keep: Gerações anteriores mantidas no diretório
+
+    Returns:
+        Número da geração publicada
+    """
+    pa = _arrow()
+    root = _root(root)
+    os.makedirs(root, exist_ok=True)
+
+    generation = (current_generation(root) or 0) + 1
+    final_dir = os.path.join(root, _generation_name(generation))
+    tmp_dir = f"{final_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir)
+
+    frames = _frames(dataset)
+    for name, df in frames.items():
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(os.path.join(tmp_dir, f"{name}.arrow"), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    manifest = {
+        'generation': generation,
+        'published_at': datetime.now().isoformat(timespec='seconds'),
+        'seed': dataset.seed,
+        'rows': {name: len(df) for name, df in frames.items()},
+        'counts': {
+            name: {col: frames[name][col].value_counts().to_dict() for col in COUNT_COLUMNS}
+            for name in ('videos', 'tasks')
+        },
+    }
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.rename(tmp_dir, final_dir)
+
+    pointer = os.path.join(root, CURRENT_FILE)
+    tmp_pointer = f"{pointer}.{os.getpid()}.tmp"
+    with open(tmp_pointer, 'w', encoding='utf-8') as f:
+        f.write(_generation_name(generation))
+    os.replace(tmp_pointer, pointer)
+
+    # Mapeamentos existentes sobrevivem à remoção dos arquivos
+    for old in range(1, generation - keep):
+        shutil.rmtree(os.path.join(root, _generation_name(old)), ignore_errors=True)
+    return generation
+
+
+def attach(root: Optional[str] = None, generation: Optional[int] = None) -> DatasetSnapshot:
+    """
+    Mapeia uma geração e devolve a fotografia sobre os buffers compartilhados
+
+    Args:
+        root: Diretório do segmento
+        generation: Geração (padrão: a atual)
+
+    Returns:
+        DatasetSnapshot com as colunas de texto sobre os buffers mapeados
+    """
+    pa = _arrow()
+    root = _root(root)
+    generation = generation or current_generation(root)
+    if generation is None:
+        raise FileNotFoundError(f"Nenhuma geração publicada em {root}")
+    directory = os.path.join(root, _generation_name(generation))
+
+    with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    frames = {}
+    for name in TABLES:
+        source = pa.memory_map(os.path.join(directory, f"{name}.arrow"), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        frames[name] = table.to_pandas(types_mapper=_shared_dtype)
+
+    def counts(name: str) -> Dict[str, Counter]:
+        return {col: Counter(values) for col, values in manifest['counts'][name].items()}
+
+    return DatasetSnapshot(
+        version=generation,
+        built_at=datetime.fromisoformat(manifest['published_at']),
+        videos=frames['videos'].set_index('ID', drop=False).rename_axis(None),
+        tasks=frames['tasks'].set_index('ID', drop=False).rename_axis(None),
+        video_counts=counts('videos'),
+        task_counts=counts('tasks'),
+        metrics=frames['metrics'],
+    )
+
+
+class SharedSnapshotCache:
+    """
+    Fotografia de um segmento compartilhado, trocada quando o carregador
+    publica uma nova geração (mesma interface de SnapshotCache)
+
+    Args:
+        root: Diretório do segmento
+        check_interval: Segundos entre verificações do ponteiro CURRENT
+    """
+
+    def __init__(self, root: Optional[str] = None, check_interval: float = 1.0):
+        self.root = _root(root)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[DatasetSnapshot] = None
+        self._checked_at = 0.0
+        self.builds = 0
+
+    def get(self) -> DatasetSnapshot:
+        """
+        Fotografia da geração atual
+
+        Returns:
+            DatasetSnapshot compartilhada (não alterar)
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+            generation = current_generation(self.root)
+            if self._snapshot is None or (generation is not None and generation != self._snapshot.version):
+                self._snapshot = attach(self.root, generation)
+                self.builds += 1
+            return self._snapshot
+
+    def invalidate(self):
+        """Força a verificação do ponteiro na próxima leitura"""
+        self._checked_at = 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segmento de dados compartilhado entre workers")
+    parser.add_argument('--root', default=None, help='Diretório do segmento')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    pub = sub.add_parser('publish', help='Publica uma nova geração')
+    pub.add_argument('--dataset', help='Fotografia de origem (dashboard.data.dataset)')
+    pub.add_argument('--seed', type=int, default=42)
+    pub.add_argument('--videos', type=int, default=1000)
+    pub.add_argument('--interval', type=float, default=None,
+                     help='Republica a cada N segundos (carregador contínuo)')
+
+    sub.add_parser('info', help='Mostra a geração atual')
+    args = parser.parse_args(argv)
+    root = _root(args.root)
+
+    if args.command == 'info':
+        generation = current_generation(root)
+        if generation is None:
+            print(f"Nenhuma geração publicada em {root}")
+            return
+        with open(os.path.join(root, _generation_name(generation), MANIFEST_FILE), encoding='utf-8') as f:
+            print(json.dumps(json.load(f), ensure_ascii=False, indent=2))
+        return
+
+    iteration = 0
+    while True:
+        if args.dataset:
+            dataset = load_dataset(args.dataset)
+        else:
+            dataset = generate_dataset(args.seed + iteration, args.videos, anchor=datetime.now())
+        iteration += 1
+        generation = publish(dataset, root)
+        print(f"Geração {generation} publicada em {root} "
+              f"({len(dataset.videos)} vídeos, {len(dataset.tasks)} tarefas)")
+        if args.interval is None:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Fotografia versionada e imutável dos dados do dashboard
+
+Uma única `DatasetSnapshot` por processo do servidor é compartilhada, só
+para leitura, por todas as sessões: a memória e a CPU gastas montando os
+DataFrames não crescem com o número de pessoas olhando o dashboard.
+
+A fotografia é refeita apenas quando a versão do repositório muda (pelas
+alterações do feed, sem reconstruir as tabelas), quando passa do TTL
+(recarga completa) ou quando `invalidate` é chamado.
+
+Os DataFrames publicados são cópias rasas com copy-on-write do pandas 3:
+quem alterar um deles recebe uma cópia e não afeta as outras sessões.
+Sem copy-on-write (pandas 2), as cópias rasas dividiriam os buffers que
+`LiveTable.apply` altera no lugar; nesse caso a cópia é profunda.
+"""
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Mapping, Optional
+
+import pandas as pd
+
+from .changes import TASK, VIDEO, LiveTable
+from .store import DataStore
+
+# Copy-on-write é o único modo do pandas a partir da 3.0; antes dela as
+# fotografias publicadas precisam de cópias profundas
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+# Idade máxima de uma fotografia antes de uma recarga completa
+SNAPSHOT_TTL_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """Vídeos e tarefas em uma versão do repositório"""
+    version: int
+    built_at: datetime
+    videos: pd.DataFrame
+    tasks: pd.DataFrame
+    video_counts: Mapping[str, Counter]
+    task_counts: Mapping[str, Counter]
+    metrics: Optional[pd.DataFrame] = None
+
+
+class SnapshotCache:
+    """
+    Mantém a fotografia atual de um DataStore
+
+    Args:
+        store: Repositório de vídeos e tarefas
+        ttl: Segundos até uma recarga completa, mesmo sem alterações
+    """
+
+    def __init__(self, store: DataStore, ttl: float = SNAPSHOT_TTL_SECONDS):
+        from .mock_data import MockDataGenerator
+
+        self.store = store
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tables: Dict[str, LiveTable] = {
+            VIDEO: LiveTable(VIDEO, MockDataGenerator.video_row),
+            TASK: LiveTable(TASK, MockDataGenerator.task_row),
+        }
+        self._snapshot: Optional[DatasetSnapshot] = None
+        self._loaded_at = 0.0
+        self.builds = 0
+
+    def _expired(self) -> bool:
+        return time.monotonic() - self._loaded_at > self.ttl
+
+    def _stale(self, snapshot: Optional[DatasetSnapshot]) -> bool:
+        return snapshot is None or snapshot.version != self.store.version or self._expired()
+
+    def get(self) -> DatasetSnapshot:
+        """
+        Fotografia da versão atual, refeita só se necessário
+
+        Returns:
+            DatasetSnapshot compartilhada (não alterar)
+        """
+        self.store.tick()
+        snapshot = self._snapshot
+        if not self._stale(snapshot):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if not self._stale(snapshot):
+                return snapshot
+
+            if snapshot is None or self._expired():
+                for entity, table in self._tables.items():
+                    table.load(*self.store.records(entity))
+                self._loaded_at = time.monotonic()
+            else:
+                for entity, table in self._tables.items():
+                    table.refresh(self.store.feed, lambda e=entity: self.store.records(e))
+
+            videos, tasks = self._tables[VIDEO], self._tables[TASK]
+            snapshot = DatasetSnapshot(
+                version=min(videos.version, tasks.version),
+                built_at=datetime.now(),
+                videos=videos.df.copy(deep=not _COPY_ON_WRITE),
+                tasks=tasks.df.copy(deep=not _COPY_ON_WRITE),
+                video_counts={col: Counter(c) for col, c in videos.counts.items()},
+                task_counts={col: Counter(c) for col, c in tasks.counts.items()},
+            )
+            self._snapshot = snapshot
+            self.builds += 1
+            return snapshot
+
+    def invalidate(self):
+        """Descarta a fotografia; a próxima leitura recarrega tudo do repositório"""
+        with self._lock:
+            self._snapshot = None
+            self._loaded_at = 0.0
@@ -0,0 +1,85 @@
+"""
+Histórico diário de uso de armazenamento
+
+O rastreador de armazenamento (`processing.storage`) grava uma linha
+JSON por dia com o total e a divisão por categoria (uploads e cada
+TaskType); as métricas do dashboard usam esse histórico em
+`Metric.storage_used_gb`.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional
+
+STORAGE_HISTORY_ENV = "MAIKETEIRO_STORAGE_HISTORY"
+DEFAULT_STORAGE_HISTORY = os.path.join(".storage", "history.jsonl")
+
+GB = 1024 ** 3
+
+
+@dataclass
+class StorageSnapshot:
+    """Uso de armazenamento em um dia"""
+    day: date
+    total_bytes: int
+    by_category: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_gb(self) -> float:
+        return round(self.total_bytes / GB, 2)
+
+
+def _history_path(path: Optional[str]) -> str:
+    return path or os.environ.get(STORAGE_HISTORY_ENV, DEFAULT_STORAGE_HISTORY)
+
+
+def load_storage_history(path: Optional[str] = None) -> List[StorageSnapshot]:
+    """
+    Lê o histórico, um registro por dia (o último gravado prevalece)
+
+    Args:
+        path: Arquivo JSONL. Padrão: $MAIKETEIRO_STORAGE_HISTORY ou
+              .storage/history.jsonl
+
+    Returns:
+        Registros em ordem de data (lista vazia se não houver histórico)
+    """
+    snapshots: Dict[date, StorageSnapshot] = {}
+    try:
+        with open(_history_path(path), encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                day = date.fromisoformat(data['day'])
+                snapshots[day] = StorageSnapshot(day, data['total_bytes'], data.get('by_category', {}))
+    except FileNotFoundError:
+        return []
+    return [snapshots[d] for d in sorted(snapshots)]
+
+
+def append_storage_snapshot(snapshot: StorageSnapshot, path: Optional[str] = None) -> str:
+    """
+    Acrescenta um registro ao histórico
+
+    Args:
+        snapshot: Registro do dia
+        path: Arquivo JSONL (mesmo padrão de load_storage_history)
+
+    Returns:
+        Caminho gravado
+    """
+    path = _history_path(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    record = {
+        'day': snapshot.day.isoformat(),
+        'total_bytes': snapshot.total_bytes,
+        'by_category': snapshot.by_category,
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return path
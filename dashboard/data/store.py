@@ -0,0 +1,216 @@
+"""
+Repositório de vídeos e tarefas do processo, com feed de alterações
+
+Os registros vivem uma vez por processo do servidor; toda escrita passa
+por `upsert_videos`/`upsert_tasks` ou `apply_edits` (edições de tabelas
+em lote), que publicam no `ChangeFeed`. Sem backend real, o repositório
+é populado com dados mockados e simula o andamento das tarefas conforme
+o tempo passa.
+"""
+import os
+import threading
+import time
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .changes import TASK, VIDEO, ChangeFeed, ChangeKind
+from .edits import EditSet, new_record, record_changes
+from .schemas import Task, Video, VideoStatus
+
+# Tarefas alteradas por segundo na simulação
+SIMULATED_CHANGES_PER_SECOND = 1.0
+
+
+class DataStore:
+    """
+    Vídeos e tarefas por ID, com versões publicadas no feed
+
+    Args:
+        feed: Feed de alterações (padrão: um novo)
+        simulate: Simula o andamento das tarefas (dados mockados)
+    """
+
+    def __init__(self, feed: Optional[ChangeFeed] = None, simulate: bool = False):
+        self.feed = feed or ChangeFeed()
+        self.simulate = simulate
+        self._lock = threading.RLock()
+        self._videos: Dict[str, Video] = {}
+        self._tasks: Dict[str, Task] = {}
+        # IDs das tarefas de cada vídeo, para remover em cascata
+        self._tasks_by_video: Dict[str, Set[str]] = {}
+        self._last_tick = time.monotonic()
+
+    @property
+    def version(self) -> int:
+        return self.feed.version
+
+    def _upsert(self, table: Dict[str, object], entity: str, records: Iterable[object]) -> int:
+        inserted, updated = [], []
+        with self._lock:
+            for record in records:
+                (updated if record.id in table else inserted).append(record)
+                table[record.id] = record
+            if inserted:
+                self.feed.publish(entity, inserted, ChangeKind.INSERT)
+            if updated:
+                self.feed.publish(entity, updated, ChangeKind.UPDATE)
+            return self.feed.version
+
+    def upsert_videos(self, videos: Iterable[Video]) -> int:
+        """Insere ou atualiza vídeos; retorna a nova versão"""
+        return self._upsert(self._videos, VIDEO, videos)
+
+    def upsert_tasks(self, tasks: Iterable[Task]) -> int:
+        """Insere ou atualiza tarefas; retorna a nova versão"""
+        tasks = list(tasks)
+        with self._lock:
+            self._index_tasks(tasks)
+            return self._upsert(self._tasks, TASK, tasks)
+
+    def apply_edits(self, entity: str, edits: EditSet) -> int:
+        """
+        Aplica as edições de uma tabela como uma única transação
+
+        Todas as edições são validadas antes de qualquer escrita; as
+        alterações saem no feed como um único lote. Remover um vídeo
+        remove também as suas tarefas. O custo é proporcional ao número de
+        edições.
+
+        Args:
+            entity: 'video' ou 'task'
+            edits: Células alteradas, linhas novas e IDs removidos
+
+        Returns:
+            A nova versão
+
+        Raises:
+            KeyError: ID inexistente ou repetido
+            ValueError: Coluna não editável, valor inválido ou linha
+                        alterada e removida ao mesmo tempo
+        """
+        with self._lock:
+            table = self._videos if entity == VIDEO else self._tasks
+            missing = [i for i in (*edits.updated, *edits.deleted) if i not in table]
+            if missing:
+                raise KeyError(f"IDs inexistentes: {', '.join(missing[:5])}")
+            deleted_ids = set(edits.deleted)
+            if len(deleted_ids) < len(edits.deleted):
+                raise KeyError("IDs repetidos entre as linhas removidas")
+            conflicting = deleted_ids.intersection(edits.updated)
+            if conflicting:
+                raise ValueError(f"Linhas alteradas e removidas: {', '.join(sorted(conflicting)[:5])}")
+
+            updated = [replace(table[i], **record_changes(entity, cells)) for i, cells in edits.updated.items()]
+            inserted = [new_record(entity, row) for row in edits.added]
+            duplicated = [r.id for r in inserted if r.id in table]
+            if duplicated or len({r.id for r in inserted}) < len(inserted):
+                raise KeyError(f"IDs repetidos: {', '.join(duplicated[:5]) or 'linhas novas'}")
+
+            # Daqui em diante nada falha: as escritas vão inteiras
+            orphaned = []
+            if entity == VIDEO:
+                orphaned = [t for i in edits.deleted for t in self._video_tasks(i)]
+                self._delete(self._tasks, orphaned)
+            deleted = [table[i] for i in edits.deleted]
+            self._delete(table, deleted)
+            for record in (*updated, *inserted):
+                table[record.id] = record
+            if entity == TASK:
+                self._index_tasks(updated)
+            return self.feed.publish_many([
+                (entity, ChangeKind.INSERT, inserted),
+                (entity, ChangeKind.UPDATE, updated),
+                (TASK, ChangeKind.DELETE, orphaned),
+                (entity, ChangeKind.DELETE, deleted),
+            ])
+
+    def _video_tasks(self, video_id: str) -> List[Task]:
+        return [self._tasks[i] for i in self._tasks_by_video.get(video_id, ())]
+
+    def _index_tasks(self, tasks: Iterable[Task]):
+        for task in tasks:
+            self._tasks_by_video.setdefault(task.video_id, set()).add(task.id)
+
+    def _delete(self, table: Dict[str, object], records: Iterable[object]):
+        for record in records:
+            del table[record.id]
+            if table is self._tasks:
+                video_tasks = self._tasks_by_video.get(record.video_id)
+                if video_tasks is not None:
+                    video_tasks.discard(record.id)
+
+    def records(self, entity: str) -> Tuple[List[object], int]:
+        """
+        Todos os registros de uma entidade com a versão correspondente
+
+        Args:
+            entity: 'video' ou 'task'
+
+        Returns:
+            Tupla (registros, versão)
+        """
+        with self._lock:
+            table = self._videos if entity == VIDEO else self._tasks
+            return list(table.values()), self.feed.version
+
+    def tick(self):
+        """Na simulação, avança tarefas proporcionalmente ao tempo decorrido"""
+        if not self.simulate:
+            return
+        from .mock_data import MockDataGenerator
+
+        with self._lock:
+            now = time.monotonic()
+            count = int((now - self._last_tick) * SIMULATED_CHANGES_PER_SECOND)
+            if count <= 0:
+                return
+            self._last_tick = now
+            # Cópias: registros já publicados não mudam depois de lidos
+            active = [
+                replace(t) for t in self._tasks.values()
+                if t.status in (VideoStatus.QUEUED, VideoStatus.PROCESSING)
+            ]
+            changed = MockDataGenerator.simulate_activity(active, count)
+            if changed:
+                self.upsert_tasks(changed)
+
+
+_store: Optional[DataStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> DataStore:
+    """
+    Repositório compartilhado do processo, populado na primeira chamada
+
+    Com $MAIKETEIRO_DATASET, os dados vêm dessa fotografia em disco (sem
+    simulação, para que execuções sejam comparáveis); sem ela, são
+    gerados dados mockados com andamento simulado.
+
+    Returns:
+        DataStore do processo
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from .dataset import DATASET_ENV
+
+                dataset_path = os.environ.get(DATASET_ENV)
+                if dataset_path:
+                    from .dataset import load_dataset
+
+                    dataset = load_dataset(dataset_path)
+                    store = DataStore(simulate=False)
+                    videos, tasks = dataset.videos, dataset.tasks
+                else:
+                    from .mock_data import get_mock_tasks, get_mock_videos
+
+                    store = DataStore(simulate=True)
+                    videos = get_mock_videos(50)
+                    tasks = get_mock_tasks(videos)
+                store.upsert_videos(videos)
+                store.upsert_tasks(tasks)
+                _store = store
+    _store.tick()
+    return _store
@@ -0,0 +1,176 @@
+"""
+Índice de tags por bitsets sobre as linhas de vídeos
+
+Cada tag guarda um bitset (uint64 empacotado) com um bit por linha da
+tabela de vídeos. Filtros E/OU/NÃO viram operações bit a bit sobre
+N/64 palavras, em vez de buscas de substring na coluna 'Tags', e a
+matriz de coocorrência sai de produtos matriciais NumPy em blocos.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Linhas por bloco ao desempacotar bitsets para os produtos matriciais
+_BLOCK_ROWS = 1 << 16
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Bits ligados por palavra uint64 (np.bitwise_count no NumPy 2)"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    as_bytes = words.view(np.uint8).reshape(*words.shape, 8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1)
+
+
+class TagIndex:
+    """
+    Bitsets de tags sobre as posições das linhas
+
+    Args:
+        row_tags: Tags de cada linha, na ordem da tabela
+        tag_separator: Separador quando as tags vêm como texto ('a, b')
+    """
+
+    def __init__(self, row_tags: Iterable, tag_separator: str = ', '):
+        rows: List[int] = []
+        names: List[str] = []
+        count = 0
+        for row, tags in enumerate(row_tags):
+            count = row + 1
+            if isinstance(tags, str):
+                tags = tags.split(tag_separator) if tags else []
+            elif tags is None:
+                tags = []
+            for tag in tags:
+                rows.append(row)
+                names.append(tag)
+
+        self.size = count
+        words = (count + 63) // 64
+        codes, vocabulary = pd.factorize(pd.Series(names, dtype=object), sort=True)
+        self.tags: List[str] = [str(t) for t in vocabulary]
+        self._positions: Dict[str, int] = {t: i for i, t in enumerate(self.tags)}
+
+        self.bits = np.zeros((len(self.tags), max(words, 1)), dtype=np.uint64)
+        if rows:
+            row_ids = np.asarray(rows, dtype=np.int64)
+            np.bitwise_or.at(
+                self.bits,
+                (codes, row_ids >> 6),
+                np.left_shift(np.uint64(1), (row_ids & 63).astype(np.uint64))
+            )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str = 'Tags') -> 'TagIndex':
+        """Índice da coluna de tags de um DataFrame (posições de df.iloc)"""
+        return cls(df[column].tolist())
+
+    @classmethod
+    def from_videos(cls, videos: Sequence) -> 'TagIndex':
+        """Índice das listas `Video.tags`, na ordem da sequência"""
+        return cls(v.tags for v in videos)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def bitset(self, tag: str) -> np.ndarray:
+        """Bitset de uma tag (vazio se a tag não existe)"""
+        position = self._positions.get(tag)
+        if position is None:
+            return np.zeros(self.bits.shape[1], dtype=np.uint64)
+        return self.bits[position]
+
+    def _full(self) -> np.ndarray:
+        full = np.full(self.bits.shape[1], np.iinfo(np.uint64).max, dtype=np.uint64)
+        extra = self.bits.shape[1] * 64 - self.size
+        if extra:
+            full[-1] = np.uint64((1 << (64 - extra)) - 1) if extra < 64 else np.uint64(0)
+        return full
+
+    def query(
+        self,
+        all_of: Optional[Iterable[str]] = None,
+        any_of: Optional[Iterable[str]] = None,
+        none_of: Optional[Iterable[str]] = None
+    ) -> np.ndarray:
+        """
+        Bitset das linhas que satisfazem o filtro
+
+        Args:
+            all_of: Tags obrigatórias (E)
+            any_of: Ao menos uma destas tags (OU); vazio não restringe
+            none_of: Tags excluídas
+
+        Returns:
+            Bitset (uint64) com as linhas selecionadas
+        """
+        result = self._full()
+        for tag in all_of or ():
+            result &= self.bitset(tag)
+        any_of = list(any_of or ())
+        if any_of:
+            union = np.zeros_like(result)
+            for tag in any_of:
+                union |= self.bitset(tag)
+            result &= union
+        for tag in none_of or ():
+            result &= ~self.bitset(tag)
+        return result
+
+    def to_mask(self, bitset: np.ndarray) -> np.ndarray:
+        """Converte um bitset em máscara booleana com uma posição por linha"""
+        as_bytes = bitset.astype('<u8').view(np.uint8)
+        return np.unpackbits(as_bytes, bitorder='little')[:self.size].astype(bool)
+
+    def mask(self, all_of=None, any_of=None, none_of=None) -> np.ndarray:
+        """Máscara booleana do filtro (mesmos argumentos de query)"""
+        return self.to_mask(self.query(all_of, any_of, none_of))
+
+    def filter(self, df: pd.DataFrame, all_of=None, any_of=None, none_of=None) -> pd.DataFrame:
+        """Linhas de `df` (o DataFrame indexado) que satisfazem o filtro"""
+        if len(df) != self.size:
+            raise ValueError(f"Índice de {self.size} linhas aplicado a um DataFrame de {len(df)}")
+        return df[self.mask(all_of, any_of, none_of)]
+
+    def count(self, bitset: np.ndarray) -> int:
+        """Número de linhas em um bitset"""
+        return int(_popcount(bitset).sum())
+
+    def counts(self) -> pd.Series:
+        """Número de vídeos por tag, em ordem decrescente"""
+        totals = _popcount(self.bits).sum(axis=1) if len(self.tags) else np.array([], dtype=np.int64)
+        return pd.Series(totals.astype(np.int64), index=self.tags, name='Vídeos').sort_values(ascending=False)
+
+    def cooccurrence(self, top: Optional[int] = None, normalize: bool = False) -> pd.DataFrame:
+        """
+        Matriz de coocorrência de tags (diagonal = vídeos com a tag)
+
+        Os bitsets são desempacotados em blocos de linhas e multiplicados
+        (X·Xᵀ), acumulando as contagens.
+
+        Args:
+            top: Mantém só as `top` tags mais frequentes
+            normalize: Divide cada linha pela diagonal (P(coluna | linha))
+
+        Returns:
+            DataFrame quadrado indexado pelas tags, pronto para charts.heatmap
+        """
+        tags = list(self.counts().index[:top]) if top else list(self.tags)
+        positions = [self._positions[t] for t in tags]
+        bits = self.bits[positions]
+
+        matrix = np.zeros((len(tags), len(tags)), dtype=np.int64)
+        words_per_block = _BLOCK_ROWS // 64
+        for start in range(0, bits.shape[1], words_per_block):
+            block = np.ascontiguousarray(bits[:, start:start + words_per_block]).astype('<u8')
+            dense = np.unpackbits(block.view(np.uint8), axis=1, bitorder='little').astype(np.float32)
+            matrix += np.rint(dense @ dense.T).astype(np.int64)
+
+        df = pd.DataFrame(matrix, index=tags, columns=tags)
+        if normalize:
+            diagonal = np.diag(matrix).astype(float)
+            df = df.div(np.where(diagonal == 0, 1, diagonal), axis=0).round(3)
+        return df
@@ -0,0 +1,344 @@
+"""
+Linha do tempo da fila: tarefas na fila e em execução a cada momento
+
+Cada tarefa contribui com dois intervalos: na fila de `created_at` até
+`started_at` (ou `completed_at`, se terminou sem iniciar) e em execução de
+`started_at` até `completed_at`. Em vez de contar, para cada intervalo de
+tempo do gráfico, as tarefas ativas (O(tarefas × intervalos)), os inícios
+(+1) e fins (-1) viram eventos ordenados uma única vez; a soma acumulada
+dá o nível exato de cada série após cada evento (varredura), e qualquer
+janela é amostrada por busca binária.
+
+Tarefas novas ou alteradas estendem a linha do tempo: só os eventos
+ainda não vistos de cada tarefa são acrescentados e, no caso comum (todos
+posteriores ao último evento), a soma acumulada continua de onde parou.
+"""
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .changes import TASK, ChangeFeed, ChangeKind
+from .schemas import Task, VideoStatus
+
+QUEUED_COLUMN = 'Na fila'
+RUNNING_COLUMN = 'Em execução'
+
+# Pontos do gráfico após a redução por intervalo
+DEFAULT_POINTS = 500
+
+# Eventos já emitidos por tarefa (bits)
+_CREATED = 1
+_STARTED = 2
+_ENDED = 4
+
+
+def _ns(value) -> Optional[int]:
+    if value is None or value is pd.NaT:
+        return None
+    return pd.Timestamp(value).value
+
+
+class QueueTimeline:
+    """
+    Níveis de fila e execução ao longo do tempo, mantidos por eventos
+
+    Tarefas com falha sem `completed_at` não têm fim conhecido: são
+    ignoradas se ainda não vistas e encerradas no momento da leitura se já
+    estavam abertas. Um reinício após falha transitória mantém só a
+    primeira execução.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stages: Dict[str, int] = {}
+        self._times = np.empty(0, dtype=np.int64)
+        self._queued = np.empty(0, dtype=np.int64)
+        self._running = np.empty(0, dtype=np.int64)
+        self._pending: List[Tuple[int, int, int]] = []
+        self._distinct: Optional[Tuple[np.ndarray, ...]] = None
+        self.version = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._times) + len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Construção
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task], version: int = 0) -> 'QueueTimeline':
+        """Linha do tempo de um conjunto de tarefas"""
+        timeline = cls()
+        timeline.extend(tasks)
+        timeline.version = version
+        return timeline
+
+    @classmethod
+    def from_frame(cls, tasks: pd.DataFrame, version: int = 0) -> 'QueueTimeline':
+        """
+        Linha do tempo da tabela de tarefas do dashboard, montada de forma
+        vetorizada
+
+        Args:
+            tasks: DataFrame com 'ID', 'Status', 'Criado em', 'Iniciado em'
+                   e 'Concluído em'
+            version: Versão dos dados
+
+        Returns:
+            QueueTimeline
+        """
+        created = pd.to_datetime(tasks['Criado em']).to_numpy('datetime64[ns]').view(np.int64)
+        started = pd.to_datetime(tasks['Iniciado em']).to_numpy('datetime64[ns]').view(np.int64)
+        completed = pd.to_datetime(tasks['Concluído em']).to_numpy('datetime64[ns]').view(np.int64)
+        nat = np.iinfo(np.int64).min
+        has_start, has_end = started != nat, completed != nat
+        unknown_end = (tasks['Status'] == VideoStatus.FAILED.value).to_numpy() & ~has_end
+        tracked = (created != nat) & ~unknown_end
+
+        queue_end = np.where(has_start, started, completed)
+        queue_closed = tracked & (queue_end != nat)
+        run_start = tracked & has_start
+        run_end = run_start & has_end
+
+        timeline = cls()
+        timeline._add_arrays(
+            np.concatenate([created[tracked], queue_end[queue_closed], started[run_start], completed[run_end]]),
+            np.concatenate([
+                np.ones(tracked.sum(), dtype=np.int64), np.full(queue_closed.sum(), -1),
+                np.zeros(run_start.sum() + run_end.sum(), dtype=np.int64)
+            ]),
+            np.concatenate([
+                np.zeros(tracked.sum() + queue_closed.sum(), dtype=np.int64),
+                np.ones(run_start.sum(), dtype=np.int64), np.full(run_end.sum(), -1)
+            ])
+        )
+        stages = (
+            np.where(tracked, _CREATED, 0)
+            | np.where(run_start, _STARTED, 0)
+            | np.where(tracked & has_end, _ENDED, 0)
+        )
+        timeline._stages = {
+            task_id: int(stage) for task_id, stage in zip(tasks['ID'].tolist(), stages.tolist()) if stage
+        }
+        timeline.version = version
+        return timeline
+
+    def extend(self, tasks: Iterable[Task]) -> int:
+        """
+        Acrescenta os eventos ainda não vistos de tarefas novas ou alteradas
+
+        Args:
+            tasks: Estado atual das tarefas
+
+        Returns:
+            Número de eventos acrescentados
+        """
+        now = None
+        events = []
+        with self._lock:
+            for task in tasks:
+                stage = self._stages.get(task.id, 0)
+                created, started, completed = _ns(task.created_at), _ns(task.started_at), _ns(task.completed_at)
+                if not stage & _CREATED:
+                    if created is None or (task.status == VideoStatus.FAILED and completed is None):
+                        continue
+                    events.append((created, 1, 0))
+                    stage |= _CREATED
+                if started is not None and not stage & (_STARTED | _ENDED):
+                    events.append((started, -1, 1))
+                    stage |= _STARTED
+                if not stage & _ENDED and (completed is not None or task.status == VideoStatus.FAILED):
+                    if completed is None:
+                        now = now or pd.Timestamp(datetime.now()).value
+                        completed = now
+                    events.append((completed, 0, -1) if stage & _STARTED else (completed, -1, 0))
+                    stage |= _ENDED
+                self._stages[task.id] = stage
+            self._pending.extend(events)
+        return len(events)
+
+    def close(self, task_ids: Iterable[str], at: Optional[datetime] = None) -> int:
+        """
+        Encerra tarefas removidas que ainda estavam na fila ou em execução
+
+        O histórico da tarefa é mantido; só o intervalo aberto termina em
+        `at`.
+
+        Args:
+            task_ids: IDs das tarefas removidas
+            at: Instante do encerramento (padrão: agora)
+
+        Returns:
+            Número de eventos acrescentados
+        """
+        moment = _ns(at or datetime.now())
+        events = []
+        with self._lock:
+            for task_id in task_ids:
+                stage = self._stages.pop(task_id, 0)
+                if stage & _CREATED and not stage & _ENDED:
+                    events.append((moment, 0, -1) if stage & _STARTED else (moment, -1, 0))
+            self._pending.extend(events)
+        return len(events)
+
+    def load(self, tasks: Iterable[Task], version: int):
+        """Descarta tudo e reconstrói a partir das tarefas"""
+        with self._lock:
+            self._stages.clear()
+            self._times = self._times[:0]
+            self._queued = self._queued[:0]
+            self._running = self._running[:0]
+            self._pending = []
+        self.extend(tasks)
+        self.version = version
+
+    def refresh(self, feed: ChangeFeed, reload: Callable[[], Tuple[List[Any], int]]) -> int:
+        """
+        Traz a linha do tempo para a versão atual do feed
+
+        Args:
+            feed: Feed de alterações
+            reload: Função que devolve (todas as tarefas, versão) para
+                    recarga quando o delta não está mais disponível
+
+        Returns:
+            Número de eventos acrescentados (todos, em uma recarga)
+        """
+        with self._refresh_lock:
+            changes, complete = feed.since(self.version)
+            if not complete:
+                self.load(*reload())
+                return len(self)
+            if not changes:
+                return 0
+            added = 0
+            batch: List[Task] = []
+            for change in changes:
+                if change.entity != TASK:
+                    continue
+                if change.kind != ChangeKind.DELETE:
+                    batch.append(change.record)
+                    continue
+                # Tarefas removidas continuam no histórico da fila, mas um
+                # intervalo ainda aberto termina na remoção
+                added += self.extend(batch) + self.close([change.record.id])
+                batch = []
+            added += self.extend(batch)
+            self.version = changes[-1].version
+            return added
+
+    def _add_arrays(self, times: np.ndarray, queued: np.ndarray, running: np.ndarray):
+        # Recebe variações (+1/-1); guarda os níveis acumulados
+        order = np.argsort(times, kind='stable')
+        times, queued, running = times[order], queued[order], running[order]
+        if len(self._times) and len(times) and times[0] < self._times[-1]:
+            # Eventos no passado: junta as duas sequências ordenadas (o
+            # timsort aproveita as sequências) e refaz a soma acumulada
+            all_times = np.concatenate([self._times, times])
+            order = np.argsort(all_times, kind='stable')
+            self._times = all_times[order]
+            self._queued = np.cumsum(np.concatenate([np.diff(self._queued, prepend=0), queued])[order])
+            self._running = np.cumsum(np.concatenate([np.diff(self._running, prepend=0), running])[order])
+            return
+        queued_offset = self._queued[-1] if len(self._queued) else 0
+        running_offset = self._running[-1] if len(self._running) else 0
+        self._times = np.concatenate([self._times, times])
+        self._queued = np.concatenate([self._queued, np.cumsum(queued) + queued_offset])
+        self._running = np.concatenate([self._running, np.cumsum(running) + running_offset])
+
+    def _consolidate(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        with self._lock:
+            if self._pending:
+                times, queued, running = (np.asarray(c, dtype=np.int64) for c in zip(*self._pending))
+                self._pending = []
+                self._add_arrays(times, queued, running)
+            times, queued, running = self._times, self._queued, self._running
+            # Só o último nível de cada instante vale: os intermediários
+            # (um fim e um início no mesmo instante) não existiram
+            cached = self._distinct
+            if cached is None or cached[0] is not times:
+                last = np.append(times[1:] != times[:-1], True) if len(times) else np.empty(0, dtype=bool)
+                cached = (times, times[last], queued[last], running[last])
+                self._distinct = cached
+            return cached[1:]
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def levels(self) -> pd.DataFrame:
+        """
+        Níveis exatos após cada instante com eventos
+
+        Returns:
+            DataFrame indexado pelo instante com 'Na fila' e 'Em execução'
+        """
+        times, queued, running = self._consolidate()
+        return pd.DataFrame(
+            {QUEUED_COLUMN: queued, RUNNING_COLUMN: running},
+            index=pd.DatetimeIndex(times.view('datetime64[ns]'))
+        )
+
+    def at(self, moments) -> pd.DataFrame:
+        """Níveis em instantes arbitrários (um por linha)"""
+        times, queued, running = self._consolidate()
+        points = pd.DatetimeIndex(moments).as_unit('ns')
+        positions = np.searchsorted(times, points.asi8, side='right') - 1
+        valid = positions >= 0
+        return pd.DataFrame({
+            QUEUED_COLUMN: np.where(valid, queued[positions], 0),
+            RUNNING_COLUMN: np.where(valid, running[positions], 0),
+        }, index=points)
+
+    def sample(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        points: int = DEFAULT_POINTS
+    ) -> pd.DataFrame:
+        """
+        Linha do tempo reduzida a `points` intervalos para o gráfico
+
+        Cada intervalo mostra o pico de cada série dentro dele (o nível no
+        início do intervalo e todos os níveis atingidos até o seu fim), de
+        modo que rajadas curtas continuam visíveis.
+
+        Args:
+            start: Início da janela (padrão: primeiro evento)
+            end: Fim da janela (padrão: agora)
+            points: Número de intervalos
+
+        Returns:
+            DataFrame com 'Momento', 'Na fila' e 'Em execução'
+        """
+        times, queued, running = self._consolidate()
+        columns = ['Momento', QUEUED_COLUMN, RUNNING_COLUMN]
+        if not len(times):
+            return pd.DataFrame(columns=columns)
+        start_ns = _ns(start) if start is not None else int(times[0])
+        end_ns = _ns(end) if end is not None else max(int(times[-1]), pd.Timestamp(datetime.now()).value)
+        if end_ns <= start_ns:
+            return pd.DataFrame(columns=columns)
+
+        edges = np.linspace(start_ns, end_ns, points + 1).astype(np.int64)
+        before = np.searchsorted(times, edges[:-1], side='right') - 1
+        inside_from, inside_to = before + 1, np.searchsorted(times, edges[1:], side='left')
+        has_inside = inside_to > inside_from
+
+        result = {'Momento': pd.DatetimeIndex(edges[:-1].view('datetime64[ns]'))}
+        for column, levels in ((QUEUED_COLUMN, queued), (RUNNING_COLUMN, running)):
+            peak = np.where(before >= 0, levels[np.maximum(before, 0)], 0)
+            if has_inside.any():
+                # reduceat sobre pares [início, fim) de cada intervalo com
+                # eventos; o sentinela permite fim == len(levels)
+                bounds = np.column_stack([inside_from[has_inside], inside_to[has_inside]]).ravel()
+                padded = np.append(levels, levels.min() if len(levels) else 0)
+                inside_peak = np.maximum.reduceat(padded, bounds)[::2]
+                peak[has_inside] = np.maximum(peak[has_inside], inside_peak)
+            result[column] = peak
+        return pd.DataFrame(result, columns=columns)
@@ -0,0 +1,107 @@
+"""
+Índice de segmentos de transcrição por tempo de início
+"""
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+from .schemas import TranscriptSegment
+
+
+def format_timestamp(seconds: float) -> str:
+    """Formata segundos como HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class TranscriptIndex:
+    """
+    Segmentos de transcrição ordenados por início, com busca binária do
+    segmento ativo em qualquer posição de reprodução
+    """
+
+    def __init__(self, segments: Iterable[TranscriptSegment]):
+        self.segments: List[TranscriptSegment] = sorted(segments, key=lambda s: s.start)
+        self.starts: List[float] = [s.start for s in self.segments]
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    @property
+    def duration(self) -> float:
+        return max((s.end for s in self.segments), default=0.0)
+
+    def find(self, position: float) -> int:
+        """
+        Índice do segmento em reprodução na posição dada
+
+        Args:
+            position: Posição em segundos
+
+        Returns:
+            Índice do último segmento iniciado até `position` (0 antes do
+            primeiro, -1 se não houver segmentos)
+        """
+        if not self.segments:
+            return -1
+        return max(0, bisect_right(self.starts, position) - 1)
+
+    def window(
+        self,
+        position: float,
+        before: int = 3,
+        after: int = 12
+    ) -> Tuple[int, List[TranscriptSegment]]:
+        """
+        Janela de segmentos em torno da posição
+
+        Args:
+            position: Posição em segundos
+            before: Segmentos anteriores ao ativo
+            after: Segmentos posteriores ao ativo
+
+        Returns:
+            Tupla (índice do primeiro segmento da janela, segmentos)
+        """
+        current = self.find(position)
+        if current < 0:
+            return 0, []
+        first = max(0, current - before)
+        return first, self.segments[first:current + after + 1]
+
+    @classmethod
+    def from_text(
+        cls,
+        text: str,
+        duration: Optional[float] = None,
+        words_per_segment: int = 25,
+        seconds_per_word: float = 0.4
+    ) -> 'TranscriptIndex':
+        """
+        Cria segmentos a partir de texto sem timestamps, distribuindo as
+        palavras uniformemente pela duração
+
+        Args:
+            text: Transcrição em texto corrido
+            duration: Duração do vídeo em segundos (padrão: estimada pelas palavras)
+            words_per_segment: Palavras por segmento
+            seconds_per_word: Ritmo de fala usado quando não há duração
+
+        Returns:
+            TranscriptIndex com os segmentos estimados
+        """
+        words = (text or '').split()
+        if not words:
+            return cls([])
+
+        total = duration or len(words) * seconds_per_word
+        per_word = total / len(words)
+
+        segments = []
+        for i in range(0, len(words), words_per_segment):
+            chunk = words[i:i + words_per_segment]
+            segments.append(TranscriptSegment(
+                start=i * per_word,
+                end=min(total, (i + len(chunk)) * per_word),
+                text=' '.join(chunk)
+            ))
+        return cls(segments)
@@ -0,0 +1,6 @@
+"""
+Páginas do dashboard Maiketeiro
+
+Cada arquivo é um script executado por `st.navigation` apenas quando a
+página está ativa, carregando somente as próprias dependências.
+"""
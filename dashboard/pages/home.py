@@ -0,0 +1,182 @@
+"""
+Página inicial do dashboard MAIKETEIRO
+"""
+from datetime import datetime, time
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from dashboard import state
+from dashboard.components import charts, metrics_cards, tables
+from dashboard.data import queue
+
+QUEUE_REFRESH_SECONDS = 5
+QUEUE_COLUMNS = ['Estado', 'Vídeo', 'Tipo', 'Progresso', 'Caminho crítico (min)']
+QUEUE_TABLE_ROWS = 10
+TAG_HEATMAP_SIZE = 12
+TIMELINE_POINTS = 300
+DEAD_LETTER_COLUMNS = ['ID', 'Vídeo', 'Tipo', 'Erro']
+
+# Custom CSS
+st.markdown("""
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: bold;
+        color: #1f77b4;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .metric-card {
+        background-color: #f0f2f6;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border-left: 0.25rem solid #1f77b4;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+
+@st.fragment(run_every=QUEUE_REFRESH_SECONDS)
+def processing_queue():
+    """Fila publicada pelo agendador de tarefas, atualizada periodicamente"""
+    state = queue.load_queue_state()
+    if state is None:
+        return
+
+    st.subheader("Fila de Processamento")
+    metrics_cards.metrics_row([
+        {"label": "Em execução", "value": f"{len(state.running)}/{state.workers}", "icon": "⚙️"},
+        {"label": "Prontas", "value": str(len(state.ready)), "icon": "📥"},
+        {"label": "Aguardando dependências", "value": str(len(state.waiting)), "icon": "⏳"},
+        {"label": "Falhas", "value": str(len(state.failed)), "icon": "❌"},
+        {"label": "Dead letter", "value": str(len(state.dead_letter)), "icon": "🪦"}
+    ])
+
+    entries = [("Executando", e) for e in state.running] + [("Pronta", e) for e in state.ready]
+    rows = [
+        [label, e.task.video_title, e.task.task_type.value, e.task.progress,
+         round(e.critical_path_seconds / 60, 1)]
+        for label, e in entries[:QUEUE_TABLE_ROWS]
+    ]
+    tables.simple_table(rows, QUEUE_COLUMNS)
+    st.caption(f"{state.completed} tarefas concluídas · atualizado às {state.updated_at:%H:%M:%S}")
+
+    if state.dead_letter:
+        with st.expander(f"Dead letter ({len(state.dead_letter)})"):
+            tables.simple_table(
+                [[e.task.id, e.task.video_title, e.task.task_type.value, e.task.error_message]
+                 for e in state.dead_letter],
+                DEAD_LETTER_COLUMNS
+            )
+            st.caption(
+                "`python -m processing.jobs retry <ID>` tira a tarefa do dead letter; "
+                "ela volta a rodar (dos segmentos já prontos) na próxima vez que o "
+                "vídeo for enviado ao agendador."
+            )
+
+
+def main():
+    st.markdown('<h1 class="main-header">Dashboard MAIKETEIRO</h1>', unsafe_allow_html=True)
+
+    # Key Metrics Row
+    metrics_data = [
+        {"label": "Total de Vídeos", "value": "1,247", "delta": "+12%", "icon": "🎬"},
+        {"label": "Visualizações", "value": "2.4M", "delta": "+8%", "icon": "👁️"},
+        {"label": "Engajamento", "value": "15.3%", "delta": "-2%", "delta_color": "inverse", "icon": "📈"},
+        {"label": "Conversões", "value": "342", "delta": "+25%", "icon": "💰"}
+    ]
+
+    metrics_cards.metrics_row(metrics_data)
+
+    st.markdown("---")
+
+    # Charts Row
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Visualizações por Plataforma")
+
+        # Sample data
+        platforms = ['YouTube', 'TikTok', 'Instagram', 'LinkedIn']
+        views = [850000, 650000, 480000, 420000]
+
+        charts.pie_chart(
+            labels=platforms,
+            values=views,
+            title="Distribuição de Visualizações"
+        )
+
+    with col2:
+        st.subheader("Crescimento Mensal")
+
+        # Sample time series data
+        dates = pd.date_range(start='2024-01-01', end='2024-12-01', freq='MS')
+        growth_data = pd.DataFrame({
+            'Data': dates,
+            'Visualizações': np.random.randint(50000, 200000, len(dates)),
+            'Engajamento': np.random.uniform(10, 20, len(dates))
+        })
+
+        charts.line_chart(
+            df=growth_data,
+            x_col='Data',
+            y_col='Visualizações',
+            title="Visualizações ao Longo do Tempo"
+        )
+
+    # Recent Videos Table
+    st.subheader("Vídeos Recentes")
+    snapshot = state.get_snapshot()
+    tag_index = state.get_tag_index(snapshot)
+    selected_tags = st.multiselect("Tags", tag_index.tags, key="recent_videos_tags", placeholder="Todas")
+    videos = tag_index.filter(snapshot.videos, all_of=selected_tags) if selected_tags else snapshot.videos
+    tables.interactive_table(
+        videos.nlargest(10, 'Criado em'), title=None, page_size=5, key="recent_videos"
+    )
+
+    task_counts = snapshot.task_counts['Status']
+    st.caption(" · ".join(f"{count} {status.lower()}" for status, count in task_counts.most_common()))
+
+    st.subheader("Latência de Processamento")
+    filters = state.get_filters()
+    start, end = filters.date_range[0], filters.date_range[-1]
+    latency = state.get_latency_sketch(snapshot, start, end)
+    metrics_cards.metrics_row([
+        {"label": "Tarefas concluídas", "value": f"{latency.completed:,}", "icon": "✅"},
+        {"label": "Vídeos processados", "value": f"~{latency.videos.cardinality():,}", "icon": "🎞️"},
+        {"label": "Falhas", "value": f"{latency.failed:,}", "icon": "❌"}
+    ])
+    summary = latency.summary()
+    if summary.empty:
+        st.info("Nenhuma tarefa concluída no período.")
+    else:
+        tables.simple_table(summary.values.tolist(), list(summary.columns))
+    st.caption(f"{start:%d/%m/%Y} a {end:%d/%m/%Y} · quantis aproximados (t-digest)")
+
+    st.subheader("Fila ao Longo do Tempo")
+    timeline = state.get_queue_timeline(snapshot)
+    depth = timeline.sample(
+        datetime.combine(start, time.min), min(datetime.combine(end, time.max), datetime.now()),
+        points=TIMELINE_POINTS
+    )
+    charts.area_chart(
+        df=depth,
+        x_col='Momento',
+        y_cols=['Em execução', 'Na fila'],
+        title="Pico de tarefas por intervalo",
+        y_label="Tarefas"
+    )
+
+    st.subheader("Coocorrência de Tags")
+    charts.heatmap(
+        tag_index.cooccurrence(top=TAG_HEATMAP_SIZE),
+        title="Vídeos com as duas tags"
+    )
+
+    processing_queue()
+
+
+if __name__ == "__main__":
+    main()
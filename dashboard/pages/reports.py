@@ -0,0 +1,41 @@
+"""
+Página de relatórios
+"""
+import streamlit as st
+import pandas as pd
+
+from dashboard.components import tables
+
+
+def main():
+    st.header("📊 Relatórios")
+
+    # Report generation
+    st.subheader("Gerar Relatório")
+
+    report_type = st.selectbox(
+        "Tipo de Relatório",
+        ["Performance de Campanhas", "Análise de Vídeos", "Relatório Financeiro"]
+    )
+
+    date_range = st.date_input("Período do Relatório", [])
+
+    if st.button("Gerar Relatório"):
+        with st.spinner("Gerando relatório..."):
+            st.success("Relatório gerado com sucesso!")
+
+            # Mock report content
+            st.subheader("Relatório de Performance")
+
+            # Sample metrics
+            report_data = {
+                'Métrica': ['Visualizações Totais', 'Engajamento Médio', 'Conversões', 'ROI'],
+                'Valor': ['2.4M', '15.3%', '342', '245%'],
+                'Variação': ['+8%', '-2%', '+25%', '+12%']
+            }
+
+            tables.styled_dataframe(pd.DataFrame(report_data))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Página de configurações
+"""
+import streamlit as st
+
+
+def main():
+    st.header("⚙️ Configurações")
+
+    # API Keys section
+    st.subheader("Chaves de API")
+
+    with st.form("api_keys"):
+        openai_key = st.text_input("OpenAI API Key", type="password")
+        anthropic_key = st.text_input("Anthropic API Key", type="password")
+        google_key = st.text_input("Google AI API Key", type="password")
+
+        if st.form_submit_button("Salvar Chaves"):
+            st.success("Chaves salvas com sucesso!")
+
+    # Preferences
+    st.subheader("Preferências")
+
+    theme = st.selectbox("Tema", ["Claro", "Escuro", "Automático"])
+    language = st.selectbox("Idioma", ["Português", "English"])
+
+    auto_save = st.checkbox("Salvar automaticamente", value=True)
+
+
+if __name__ == "__main__":
+    main()
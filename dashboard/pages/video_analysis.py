@@ -0,0 +1,66 @@
+"""
+Página de análise de vídeos
+"""
+from functools import partial
+
+import streamlit as st
+
+from dashboard import state
+from dashboard.components import tables
+from dashboard.data.changes import VIDEO
+from dashboard.data.edits import EDITABLE_FIELDS
+
+CATALOGUE_COLUMNS = ['ID', 'Título', 'Tags', 'Status', 'Formato', 'Resolução', 'Criado em']
+
+
+def main():
+    st.header("🎬 Análise de Vídeos")
+
+    # Video upload/analysis section
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.subheader("Upload de Vídeo")
+        uploaded_file = st.file_uploader(
+            "Escolha um vídeo para análise",
+            type=['mp4', 'mov', 'avi', 'mkv']
+        )
+
+        if uploaded_file:
+            # Video player
+            st.video(uploaded_file)
+
+    with col2:
+        st.subheader("Análise Automática")
+        if st.button("Analisar Vídeo", type="primary"):
+            with st.spinner("Analisando vídeo..."):
+                # Mock analysis
+                st.success("Análise completa!")
+
+                # Analysis results
+                st.subheader("Resultados da Análise")
+                analysis_col1, analysis_col2 = st.columns(2)
+
+                with analysis_col1:
+                    st.metric("Duração", "12:34")
+                    st.metric("Qualidade", "1080p")
+
+                with analysis_col2:
+                    st.metric("Tamanho", "245 MB")
+                    st.metric("Formato", "MP4")
+
+    # Catalogue editor: only the edited cells are written back
+    st.subheader("Catálogo de Vídeos")
+    snapshot = state.get_snapshot()
+    editable = state.can_edit()
+    tables.data_editor(
+        snapshot.videos[CATALOGUE_COLUMNS],
+        key="video_catalogue",
+        on_save=partial(state.save_edits, VIDEO) if editable else None,
+        disabled=[c for c in CATALOGUE_COLUMNS if not editable or c not in EDITABLE_FIELDS[VIDEO]],
+        num_rows='dynamic' if editable else 'fixed'
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Instrumentação opcional de renderização dos componentes do dashboard
+
+Quando ativada (variável de ambiente MAIKETEIRO_PROFILE=1 ou `enable()`),
+cada função pública de `dashboard.components` registra por chamada o tempo
+de parede, o número de linhas recebidas e os bytes enviados ao frontend
+(soma de `ForwardMsg.ByteSize()` enfileirados durante a chamada).
+
+Os registros da execução atual aparecem em um painel de debug recolhível
+e os totais do processo são gravados em formato texto do Prometheus.
+Desativada, a instrumentação custa apenas uma verificação booleana.
+"""
+import functools
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+import streamlit as st
+
+PROFILE_ENV = "MAIKETEIRO_PROFILE"
+METRICS_FILE_ENV = "MAIKETEIRO_PROFILE_FILE"
+DEFAULT_METRICS_FILE = os.path.join(".profiling", "components.prom")
+
+_RECORDS_KEY = "_profiling_records"
+_ROW_ARGUMENTS = ('df', 'data', 'metrics_data', 'videos', 'values', 'labels')
+
+_enabled = os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+_totals_lock = threading.Lock()
+_totals: Dict[str, Dict[str, float]] = {}
+
+
+@dataclass
+class CallRecord:
+    """Medição de uma chamada de componente"""
+    component: str
+    wall_ms: float
+    rows_in: Optional[int]
+    bytes_sent: int
+
+
+def enable(value: bool = True):
+    """Ativa ou desativa a instrumentação para o processo"""
+    global _enabled
+    _enabled = value
+
+
+def is_enabled() -> bool:
+    """Indica se a instrumentação está ativa"""
+    return _enabled
+
+
+def _count_rows(args: tuple, kwargs: dict) -> Optional[int]:
+    """Obtém o número de linhas do primeiro argumento tabular da chamada"""
+    candidates = [kwargs[name] for name in _ROW_ARGUMENTS if name in kwargs]
+    if args:
+        candidates.insert(0, args[0])
+
+    for value in candidates:
+        if isinstance(value, (str, bytes)):
+            continue
+        if hasattr(value, '__len__'):
+            return len(value)
+    return None
+
+
+def _get_ctx():
+    """Contexto de execução do Streamlit, ou None fora de uma sessão"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    return get_script_run_ctx(suppress_warning=True)
+
+
+def _record(record: CallRecord):
+    """Armazena o registro na sessão e acumula os totais do processo"""
+    with _totals_lock:
+        totals = _totals.setdefault(record.component, {
+            'calls': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0
+        })
+        totals['calls'] += 1
+        totals['seconds'] += record.wall_ms / 1000
+        totals['rows'] += record.rows_in or 0
+        totals['bytes'] += record.bytes_sent
+
+    if _get_ctx() is not None:
+        st.session_state.setdefault(_RECORDS_KEY, []).append(record)
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Decorador que mede a chamada de um componente quando a instrumentação
+    está ativa
+
+    Args:
+        func: Função de componente
+
+    Returns:
+        Função decorada
+    """
+    component = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+
+        ctx = _get_ctx()
+        sent = [0]
+        original_enqueue = None
+
+        if ctx is not None:
+            original_enqueue = ctx._enqueue
+
+            def counting_enqueue(msg):
+                sent[0] += msg.ByteSize()
+                original_enqueue(msg)
+
+            ctx._enqueue = counting_enqueue
+
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            if ctx is not None:
+                ctx._enqueue = original_enqueue
+            _record(CallRecord(
+                component=component,
+                wall_ms=wall_ms,
+                rows_in=_count_rows(args, kwargs),
+                bytes_sent=sent[0]
+            ))
+
+    return wrapper
+
+
+def reset_run():
+    """Descarta os registros da execução anterior da sessão"""
+    if _enabled and _get_ctx() is not None:
+        st.session_state[_RECORDS_KEY] = []
+
+
+def get_run_records() -> List[CallRecord]:
+    """Registros da execução atual da sessão"""
+    if _get_ctx() is None:
+        return []
+    return list(st.session_state.get(_RECORDS_KEY, []))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text() -> str:
+    """
+    Totais do processo no formato texto de exposição do Prometheus
+
+    Returns:
+        Texto com as séries por componente
+    """
+    series = [
+        ('maiketeiro_component_calls_total', 'counter', 'Chamadas de componentes', 'calls'),
+        ('maiketeiro_component_seconds_total', 'counter', 'Tempo de parede acumulado (s)', 'seconds'),
+        ('maiketeiro_component_rows_total', 'counter', 'Linhas recebidas pelos componentes', 'rows'),
+        ('maiketeiro_component_bytes_total', 'counter', 'Bytes enviados ao frontend', 'bytes'),
+    ]
+
+    with _totals_lock:
+        snapshot = {name: dict(values) for name, values in _totals.items()}
+
+    lines = []
+    for metric, metric_type, help_text, field in series:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for component in sorted(snapshot):
+            value = snapshot[component][field]
+            lines.append(f'{metric}{{component="{_escape_label(component)}"}} {value:g}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics_file(path: Optional[str] = None) -> str:
+    """
+    Grava os totais do processo em arquivo (substituição atômica)
+
+    Args:
+        path: Caminho do arquivo. Padrão: $MAIKETEIRO_PROFILE_FILE ou
+              .profiling/components.prom
+
+    Returns:
+        Caminho gravado
+    """
+    path = path or os.environ.get(METRICS_FILE_ENV, DEFAULT_METRICS_FILE)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+    return path
+
+
+def debug_panel():
+    """
+    Renderiza o painel de debug recolhível com as medições da execução
+    atual e atualiza o arquivo de métricas. Não faz nada se desativado.
+    """
+    if not _enabled:
+        return
+
+    import pandas as pd
+
+    records = get_run_records()
+    path = write_metrics_file()
+
+    with st.expander("🛠️ Perfil de renderização", expanded=False):
+        if not records:
+            st.caption("Nenhum componente medido nesta execução.")
+            return
+
+        df = pd.DataFrame([asdict(r) for r in records]).rename(columns={
+            'component': 'Componente',
+            'wall_ms': 'Tempo (ms)',
+            'rows_in': 'Linhas',
+            'bytes_sent': 'Bytes enviados'
+        })
+        total_ms = sum(r.wall_ms for r in records)
+        total_bytes = sum(r.bytes_sent for r in records)
+
+        st.caption(
+            f"{len(records)} chamadas · {total_ms:.1f} ms · {total_bytes / 1024:.1f} KB "
+            f"(valores incluem componentes aninhados) · métricas em {path}"
+        )
+        st.dataframe(
+            df.sort_values('Tempo (ms)', ascending=False),
+            use_container_width=True,
+            hide_index=True
+        )
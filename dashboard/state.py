@@ -0,0 +1,206 @@
+"""
+Estado compartilhado entre as páginas do dashboard Maiketeiro
+
+Centraliza as chaves de `st.session_state` usadas pelos filtros da
+sidebar, para que cada página leia os mesmos valores sem depender de
+variáveis globais do script principal, e o acesso à fotografia de
+vídeos/tarefas compartilhada entre as sessões, aos sketches de latência e
+à linha do tempo da fila.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+import streamlit as st
+
+DATE_RANGE_KEY = "filter_date_range"
+CAMPAIGN_TYPES_KEY = "filter_campaign_types"
+
+CAMPAIGN_TYPES = ["Social Media", "YouTube", "TikTok", "Instagram", "LinkedIn"]
+DEFAULT_CAMPAIGN_TYPES = ["Social Media", "YouTube"]
+DEFAULT_PERIOD_DAYS = 30
+LATENCY_SKETCH_TTL_SECONDS = 30
+
+
+@dataclass
+class Filters:
+    """Filtros globais selecionados na sidebar"""
+    date_range: Tuple[date, ...]
+    campaign_types: List[str]
+
+
+def init_state():
+    """Define os valores padrão do estado compartilhado (apenas uma vez por sessão)"""
+    if DATE_RANGE_KEY not in st.session_state:
+        now = datetime.now()
+        st.session_state[DATE_RANGE_KEY] = (
+            (now - timedelta(days=DEFAULT_PERIOD_DAYS)).date(),
+            now.date()
+        )
+
+    if CAMPAIGN_TYPES_KEY not in st.session_state:
+        st.session_state[CAMPAIGN_TYPES_KEY] = list(DEFAULT_CAMPAIGN_TYPES)
+
+
+def get_filters() -> Filters:
+    """
+    Retorna os filtros atuais da sessão
+
+    Returns:
+        Filters com o período e os tipos de campanha selecionados
+    """
+    init_state()
+    return Filters(
+        date_range=tuple(st.session_state[DATE_RANGE_KEY]),
+        campaign_types=list(st.session_state[CAMPAIGN_TYPES_KEY])
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _snapshot_cache():
+    import os
+
+    from dashboard.data.shared_dataset import SHARED_DATASET_ENV, SharedSnapshotCache
+
+    # Vários workers no mesmo host: dados do segmento publicado pelo carregador
+    if os.environ.get(SHARED_DATASET_ENV):
+        return SharedSnapshotCache()
+
+    from dashboard.data.snapshot import SnapshotCache
+    from dashboard.data.store import get_store
+
+    return SnapshotCache(get_store())
+
+
+def get_snapshot():
+    """
+    Fotografia dos vídeos e tarefas compartilhada por todas as sessões
+
+    Returns:
+        DatasetSnapshot da versão atual (somente leitura)
+    """
+    return _snapshot_cache().get()
+
+
+def invalidate_snapshot():
+    """Força a recarga da fotografia compartilhada na próxima leitura"""
+    _snapshot_cache().invalidate()
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _tag_index(version: int, _videos):
+    from dashboard.data.tags import TagIndex
+
+    return TagIndex.from_frame(_videos)
+
+
+def get_tag_index(snapshot):
+    """
+    Índice de tags dos vídeos de uma fotografia, construído uma vez por
+    versão e compartilhado entre as sessões
+
+    Args:
+        snapshot: DatasetSnapshot de get_snapshot()
+
+    Returns:
+        TagIndex sobre as linhas de snapshot.videos
+    """
+    return _tag_index(snapshot.version, snapshot.videos)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _daily_sketches(version: int, _tasks):
+    from dashboard.data.sketches import daily_sketches_from_frame
+
+    return daily_sketches_from_frame(_tasks)
+
+
+@st.cache_resource(ttl=LATENCY_SKETCH_TTL_SECONDS, max_entries=16, show_spinner=False)
+def _stored_latency_sketch(start: date, end: date):
+    from dashboard.data.sketches import SketchStore
+
+    store = SketchStore()
+    return store.window(start, end) if store.days() else None
+
+
+def get_latency_sketch(snapshot, start: date, end: date):
+    """
+    Sketch de latência das tarefas concluídas entre `start` e `end`
+
+    Usa os sketches gravados pelos workers do agendador; sem nenhum,
+    usa sketches diários montados uma vez por versão da fotografia.
+
+    Args:
+        snapshot: DatasetSnapshot de get_snapshot()
+        start: Primeiro dia da janela
+        end: Último dia da janela
+
+    Returns:
+        LatencySketch da janela (somente leitura)
+    """
+    from dashboard.data.sketches import merge_window
+
+    stored = _stored_latency_sketch(start, end)
+    if stored is not None:
+        return stored
+    return merge_window(_daily_sketches(snapshot.version, snapshot.tasks), start, end)
+
+
+@st.cache_resource(show_spinner=False)
+def _queue_timeline():
+    from dashboard.data.timeline import QueueTimeline
+
+    return QueueTimeline()
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _frame_queue_timeline(version: int, _tasks):
+    from dashboard.data.timeline import QueueTimeline
+
+    return QueueTimeline.from_frame(_tasks, version)
+
+
+def get_queue_timeline(snapshot):
+    """
+    Linha do tempo de tarefas na fila e em execução
+
+    Com o repositório do processo, é estendida pelos deltas do feed a cada
+    leitura; com o segmento compartilhado, é montada uma vez por geração.
+
+    Args:
+        snapshot: DatasetSnapshot de get_snapshot()
+
+    Returns:
+        QueueTimeline compartilhada entre as sessões
+    """
+    store = getattr(_snapshot_cache(), 'store', None)
+    if store is None:
+        return _frame_queue_timeline(snapshot.version, snapshot.tasks)
+
+    from dashboard.data.changes import TASK
+
+    timeline = _queue_timeline()
+    timeline.refresh(store.feed, lambda: store.records(TASK))
+    return timeline
+
+
+def can_edit() -> bool:
+    """Indica se os dados aceitam edições (o segmento compartilhado é somente leitura)"""
+    return hasattr(_snapshot_cache(), 'store')
+
+
+def save_edits(entity: str, edits):
+    """
+    Grava as edições de uma tabela no repositório como uma única transação
+
+    Args:
+        entity: 'video' ou 'task'
+        edits: EditSet do editor
+
+    Raises:
+        RuntimeError: Dados somente leitura
+    """
+    store = getattr(_snapshot_cache(), 'store', None)
+    if store is None:
+        raise RuntimeError("dados somente leitura (segmento compartilhado)")
+    store.apply_edits(entity, edits)
@@ -0,0 +1,7 @@
+"""
+Pipeline de processamento de mídia do Maiketeiro
+
+Módulos que executam as tarefas (`TaskType`) sobre os arquivos de vídeo:
+transcrição, legendas, cortes, transcodificação e a infraestrutura de
+execução (agendamento, cache, concorrência, checkpoints).
+"""
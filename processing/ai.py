@@ -0,0 +1,728 @@
+"""
+Cliente de IA para ideias de publicações e prompts de mídia (VEO3/Image4)
+
+Camada assíncrona e independente de provedor (OpenAI, Anthropic, Google
+ou qualquer classe registrada) com:
+
+- pool de concorrência limitado por um semáforo (por event loop);
+- coalescência: prompts idênticos em andamento compartilham uma única
+  requisição;
+- cache de respostas em disco com TTL, por hash do provedor + prompt;
+- envio em lote: ideias para muitos vídeos vão agrupadas em poucas
+  requisições, com a resposta em JSON por ID do vídeo;
+- contadores de requisições, cache, tokens e latência.
+
+As requisições HTTP usam só a biblioteca padrão (urllib em threads).
+`StubServer` sobe um servidor local compatível com a API de chat da
+OpenAI, para testes e benchmarks sem rede nem chave.
+
+Uso:
+    python -m processing.ai ideas --stub --videos 40
+    python -m processing.ai ideas --provider anthropic --videos 10 --batch-size 5
+    python -m processing.ai prompt "Vídeo de 30s sobre café especial" --target veo3 --stub
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, Type
+
+from dashboard.data.schemas import Video
+
+from .jobs import RetryPolicy, TransientError
+
+AI_CACHE_ENV = "MAIKETEIRO_AI_CACHE"
+DEFAULT_CACHE_DIR = ".ai_cache"
+DEFAULT_CACHE_TTL = 7 * 24 * 3600.0
+
+# Status HTTP que valem nova tentativa
+_TRANSIENT_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class AIError(RuntimeError):
+    """Falha definitiva de uma chamada ao provedor"""
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """Pedido de texto a um modelo"""
+    user: str
+    system: str = ''
+    model: Optional[str] = None
+    max_tokens: int = 1024
+    temperature: float = 0.7
+
+    def key(self, provider: str) -> str:
+        """Hash estável do pedido para um provedor"""
+        payload = json.dumps([provider, asdict(self)], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class Completion:
+    """Resposta de um modelo"""
+    text: str
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0
+    cached: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Provedores
+# ---------------------------------------------------------------------------
+
+class Provider(ABC):
+    """
+    Formato das requisições de um provedor
+
+    Args:
+        api_key: Chave da API (padrão: variável de ambiente `api_key_env`)
+        base_url: URL base (ex.: a de um StubServer)
+        model: Modelo padrão
+    """
+
+    name = ''
+    api_key_env = ''
+    default_base_url = ''
+    default_model = ''
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 model: Optional[str] = None):
+        self.api_key = api_key or os.environ.get(self.api_key_env, '')
+        self.base_url = (base_url or self.default_base_url).rstrip('/')
+        self.model = model or self.default_model
+
+    @abstractmethod
+    def request(self, prompt: Prompt) -> Tuple[str, Dict[str, str], dict]:
+        """
+        Monta a requisição
+
+        Returns:
+            Tupla (url, cabeçalhos, corpo JSON)
+        """
+
+    @abstractmethod
+    def parse(self, data: dict, model: str) -> Completion:
+        """Converte a resposta JSON do provedor"""
+
+
+class OpenAIProvider(Provider):
+    """API de chat completions da OpenAI (e servidores compatíveis)"""
+
+    name = 'openai'
+    api_key_env = 'OPENAI_API_KEY'
+    default_base_url = 'https://api.openai.com'
+    default_model = 'gpt-4o-mini'
+
+    def request(self, prompt: Prompt) -> Tuple[str, Dict[str, str], dict]:
+        messages = [{'role': 'system', 'content': prompt.system}] if prompt.system else []
+        messages.append({'role': 'user', 'content': prompt.user})
+        body = {
+            'model': prompt.model or self.model,
+            'messages': messages,
+            'max_tokens': prompt.max_tokens,
+            'temperature': prompt.temperature,
+        }
+        return f"{self.base_url}/v1/chat/completions", {'Authorization': f"Bearer {self.api_key}"}, body
+
+    def parse(self, data: dict, model: str) -> Completion:
+        usage = data.get('usage') or {}
+        return Completion(
+            text=data['choices'][0]['message']['content'],
+            model=data.get('model', model),
+            input_tokens=usage.get('prompt_tokens', 0),
+            output_tokens=usage.get('completion_tokens', 0)
+        )
+
+
+class AnthropicProvider(Provider):
+    """API de mensagens da Anthropic"""
+
+    name = 'anthropic'
+    api_key_env = 'ANTHROPIC_API_KEY'
+    default_base_url = 'https://api.anthropic.com'
+    default_model = 'claude-3-5-haiku-latest'
+
+    def request(self, prompt: Prompt) -> Tuple[str, Dict[str, str], dict]:
+        body = {
+            'model': prompt.model or self.model,
+            'max_tokens': prompt.max_tokens,
+            'temperature': prompt.temperature,
+            'messages': [{'role': 'user', 'content': prompt.user}],
+        }
+        if prompt.system:
+            body['system'] = prompt.system
+        headers = {'x-api-key': self.api_key, 'anthropic-version': '2023-06-01'}
+        return f"{self.base_url}/v1/messages", headers, body
+
+    def parse(self, data: dict, model: str) -> Completion:
+        usage = data.get('usage') or {}
+        text = ''.join(block.get('text', '') for block in data.get('content', []) if block.get('type') == 'text')
+        return Completion(
+            text=text,
+            model=data.get('model', model),
+            input_tokens=usage.get('input_tokens', 0),
+            output_tokens=usage.get('output_tokens', 0)
+        )
+
+
+class GoogleProvider(Provider):
+    """API generateContent do Google AI (Gemini)"""
+
+    name = 'google'
+    api_key_env = 'GOOGLE_API_KEY'
+    default_base_url = 'https://generativelanguage.googleapis.com'
+    default_model = 'gemini-1.5-flash'
+
+    def request(self, prompt: Prompt) -> Tuple[str, Dict[str, str], dict]:
+        model = prompt.model or self.model
+        body = {
+            'contents': [{'role': 'user', 'parts': [{'text': prompt.user}]}],
+            'generationConfig': {'maxOutputTokens': prompt.max_tokens, 'temperature': prompt.temperature},
+        }
+        if prompt.system:
+            body['systemInstruction'] = {'parts': [{'text': prompt.system}]}
+        url = f"{self.base_url}/v1beta/models/{model}:generateContent"
+        return url, {'x-goog-api-key': self.api_key}, body
+
+    def parse(self, data: dict, model: str) -> Completion:
+        usage = data.get('usageMetadata') or {}
+        parts = data['candidates'][0]['content'].get('parts', [])
+        return Completion(
+            text=''.join(p.get('text', '') for p in parts),
+            model=model,
+            input_tokens=usage.get('promptTokenCount', 0),
+            output_tokens=usage.get('candidatesTokenCount', 0)
+        )
+
+
+PROVIDERS: Dict[str, Type[Provider]] = {
+    OpenAIProvider.name: OpenAIProvider,
+    AnthropicProvider.name: AnthropicProvider,
+    GoogleProvider.name: GoogleProvider,
+}
+
+
+def register_provider(provider_cls: Type[Provider]):
+    """Registra um provedor pelo atributo `name`"""
+    PROVIDERS[provider_cls.name] = provider_cls
+    return provider_cls
+
+
+def create_provider(name: str, **options) -> Provider:
+    """Instancia um provedor registrado"""
+    if name not in PROVIDERS:
+        raise ValueError(f"Provedor desconhecido: {name}. Disponíveis: {', '.join(sorted(PROVIDERS))}")
+    return PROVIDERS[name](**options)
+
+
+# ---------------------------------------------------------------------------
+# Cache e contadores
+# ---------------------------------------------------------------------------
+
+class ResponseCache:
+    """
+    Respostas em disco, um JSON por chave, válidas por `ttl` segundos
+
+    Args:
+        root: Diretório (padrão: $MAIKETEIRO_AI_CACHE ou .ai_cache)
+        ttl: Validade em segundos
+    """
+
+    def __init__(self, root: Optional[str] = None, ttl: float = DEFAULT_CACHE_TTL):
+        self.root = root or os.environ.get(AI_CACHE_ENV, DEFAULT_CACHE_DIR)
+        self.ttl = ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Completion]:
+        """Resposta em cache ainda válida, ou None"""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if time.time() - data['stored_at'] > self.ttl:
+            return None
+        return Completion(**data['completion'])
+
+    def put(self, key: str, completion: Completion):
+        """Grava uma resposta (substituição atômica)"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'stored_at': time.time(), 'completion': asdict(completion)}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def prune(self) -> int:
+        """Remove respostas expiradas; retorna quantas"""
+        removed = 0
+        now = time.time()
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(directory, name)
+                if now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+
+@dataclass
+class ClientStats:
+    """Contadores de um AIClient"""
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    retries: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def record(self, completion: Completion):
+        self.requests += 1
+        self.input_tokens += completion.input_tokens
+        self.output_tokens += completion.output_tokens
+        self.latencies.append(completion.latency)
+
+    def as_dict(self) -> dict:
+        """Contadores e latência p50/p95 (ms) das últimas requisições"""
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'coalesced': self.coalesced,
+            'retries': self.retries,
+            'errors': self.errors,
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens,
+            'latency_p50_ms': percentile(0.5),
+            'latency_p95_ms': percentile(0.95),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Cliente
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _LoopState:
+    """Semáforo e requisições em andamento de um event loop"""
+    semaphore: asyncio.Semaphore
+    in_flight: Dict[str, asyncio.Future] = field(default_factory=dict)
+
+
+class AIClient:
+    """
+    Cliente assíncrono para um provedor
+
+    O mesmo cliente pode ser usado por vários `asyncio.run` (um a cada
+    rerun do Streamlit, por exemplo): primitivas asyncio ficam presas ao
+    loop em que foram criadas, então semáforo e coalescência são mantidos
+    por event loop, e o limite de concorrência vale para cada loop.
+
+    Args:
+        provider: Provedor (ex.: create_provider('openai'))
+        max_concurrency: Requisições simultâneas
+        cache: Cache de respostas (None desativa)
+        timeout: Timeout de cada requisição em segundos
+        retry_policy: Novas tentativas para falhas transitórias (429, 5xx, rede)
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        max_concurrency: int = 4,
+        cache: Optional[ResponseCache] = None,
+        timeout: float = 60.0,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=30.0)
+        self.stats = ClientStats()
+        # Event loop -> _LoopState; loops encerrados saem sozinhos
+        self._loops = weakref.WeakKeyDictionary()
+        self._loops_lock = threading.Lock()
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            state = self._loops.get(loop)
+            if state is None:
+                state = self._loops[loop] = _LoopState(asyncio.Semaphore(self.max_concurrency))
+            return state
+
+    def _post(self, prompt: Prompt) -> Completion:
+        url, headers, body = self.provider.request(prompt)
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(body).encode('utf-8'),
+            headers={'Content-Type': 'application/json', **headers},
+            method='POST'
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            detail = e.read()[:500].decode('utf-8', 'replace')
+            if e.code in _TRANSIENT_STATUS:
+                raise TransientError(f"HTTP {e.code}: {detail}") from e
+            raise AIError(f"HTTP {e.code}: {detail}") from e
+        except urllib.error.URLError as e:
+            raise TransientError(str(e.reason)) from e
+        completion = self.provider.parse(data, body.get('model', prompt.model or self.provider.model))
+        completion.latency = time.perf_counter() - start
+        return completion
+
+    async def _send(self, prompt: Prompt) -> Completion:
+        semaphore = self._loop_state().semaphore
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with semaphore:
+                    return await asyncio.to_thread(self._post, prompt)
+            except Exception as e:
+                if attempt >= self.retry_policy.max_attempts or not self.retry_policy.retryable(e):
+                    raise
+                self.stats.retries += 1
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+
+    async def complete(self, prompt: Prompt) -> Completion:
+        """
+        Resposta para um prompt, do cache, de uma requisição idêntica em
+        andamento ou de uma nova requisição
+
+        Args:
+            prompt: Pedido
+
+        Returns:
+            Completion
+        """
+        key = prompt.key(self.provider.name)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats.cache_hits += 1
+                cached.cached = True
+                return cached
+
+        in_flight = self._loop_state().in_flight
+        pending = in_flight.get(key)
+        if pending is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        in_flight[key] = future
+        try:
+            completion = await self._send(prompt)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Os que aguardam esta requisição não foram cancelados:
+                # recebem um erro em vez de esperar para sempre
+                future.set_exception(AIError("Requisição compartilhada cancelada"))
+            else:
+                if isinstance(e, Exception):
+                    self.stats.errors += 1
+                future.set_exception(e)
+            # Evita "exception was never retrieved" quando ninguém aguardava
+            future.exception()
+            raise
+        finally:
+            in_flight.pop(key, None)
+
+        self.stats.record(completion)
+        if self.cache is not None:
+            self.cache.put(key, completion)
+        future.set_result(completion)
+        return completion
+
+    async def complete_many(self, prompts: Sequence[Prompt], return_exceptions: bool = False) -> list:
+        """
+        Respostas para vários prompts, respeitando o pool de concorrência
+
+        Args:
+            prompts: Pedidos
+            return_exceptions: Devolve a exceção no lugar da resposta de um
+                               pedido que falhou, em vez de propagá-la
+
+        Returns:
+            Completions (ou exceções) na ordem dos prompts
+        """
+        return list(await asyncio.gather(*(self.complete(p) for p in prompts),
+                                         return_exceptions=return_exceptions))
+
+
+# ---------------------------------------------------------------------------
+# Ideias de publicações e prompts de mídia
+# ---------------------------------------------------------------------------
+
+IDEAS_SYSTEM = (
+    "Você é um estrategista de marketing de conteúdo. Responda apenas com JSON válido, "
+    "sem texto antes ou depois."
+)
+
+MEDIA_TARGETS = {
+    'veo3': "um prompt para o modelo de vídeo VEO3 (cena, movimento de câmera, iluminação, "
+            "estilo e duração)",
+    'image4': "um prompt para o modelo de imagem Image4 (composição, sujeito, estilo, "
+              "iluminação e proporção)",
+}
+
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def _video_summary(video: Video) -> dict:
+    return {
+        'id': video.id,
+        'titulo': video.title,
+        'duracao_min': round(video.duration / 60, 1),
+        'tags': video.tags,
+        'transcricao': (video.transcription or '')[:400],
+    }
+
+
+def ideas_prompt(videos: Sequence[Video], ideas_per_video: int = 3) -> Prompt:
+    """Prompt que pede ideias de publicação para um lote de vídeos"""
+    items = json.dumps([_video_summary(v) for v in videos], ensure_ascii=False)
+    user = (
+        f"Para cada vídeo abaixo, sugira {ideas_per_video} ideias de publicações para redes "
+        f"sociais. Responda com um objeto JSON cujas chaves são os IDs dos vídeos e os valores "
+        f"são listas de strings.\n\nVídeos: {items}"
+    )
+    return Prompt(user=user, system=IDEAS_SYSTEM, max_tokens=200 + 120 * ideas_per_video * len(videos))
+
+
+def parse_ideas(text: str) -> Dict[str, List[str]]:
+    """Extrai o objeto {id: [ideias]} de uma resposta"""
+    match = _JSON_RE.search(text)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    return {str(k): [str(i) for i in v] for k, v in data.items() if isinstance(v, list)}
+
+
+async def generate_post_ideas(
+    client: AIClient,
+    videos: Sequence[Video],
+    ideas_per_video: int = 3,
+    batch_size: int = 10
+) -> Dict[str, List[str]]:
+    """
+    Ideias de publicações para muitos vídeos, em lotes
+
+    Os vídeos são agrupados em lotes de `batch_size` por requisição; os
+    lotes correm em paralelo no pool do cliente. Vídeos ausentes da
+    resposta de um lote (ou de um lote que falhou) são pedidos de novo
+    individualmente; um vídeo cujo pedido individual também falha fica
+    sem ideias.
+
+    Args:
+        client: Cliente de IA
+        videos: Vídeos
+        ideas_per_video: Ideias por vídeo
+        batch_size: Vídeos por requisição
+
+    Returns:
+        Mapa ID do vídeo -> ideias
+
+    Raises:
+        Exception: A falha do primeiro pedido, se nenhum pedido teve sucesso
+    """
+    batches = [videos[i:i + batch_size] for i in range(0, len(videos), batch_size)]
+    results = await client.complete_many([ideas_prompt(b, ideas_per_video) for b in batches],
+                                         return_exceptions=True)
+
+    ideas: Dict[str, List[str]] = {}
+    for result in results:
+        if not isinstance(result, BaseException):
+            ideas.update(parse_ideas(result.text))
+
+    missing = [v for v in videos if not ideas.get(v.id)]
+    if missing and batch_size > 1:
+        retried = await client.complete_many([ideas_prompt([v], ideas_per_video) for v in missing],
+                                             return_exceptions=True)
+        results += retried
+        for result in retried:
+            if not isinstance(result, BaseException):
+                ideas.update(parse_ideas(result.text))
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures and len(failures) == len(results):
+        raise failures[0]
+    return {v.id: ideas.get(v.id, []) for v in videos}
+
+
+def media_prompt(brief: str, target: str = 'veo3') -> Prompt:
+    """Pedido de um prompt otimizado para VEO3 (vídeo) ou Image4 (imagem)"""
+    if target not in MEDIA_TARGETS:
+        raise ValueError(f"Alvo desconhecido: {target}. Disponíveis: {', '.join(MEDIA_TARGETS)}")
+    return Prompt(
+        user=f"Escreva {MEDIA_TARGETS[target]} a partir deste briefing: {brief}",
+        system="Você escreve prompts detalhados e objetivos para modelos generativos de mídia.",
+        max_tokens=400
+    )
+
+
+# ---------------------------------------------------------------------------
+# Servidor stub
+# ---------------------------------------------------------------------------
+
+class StubServer:
+    """
+    Servidor local compatível com /v1/chat/completions da OpenAI
+
+    Responde de forma determinística: pedidos de ideias recebem um JSON
+    com ideias por ID de vídeo; os demais, um eco do prompt. Tokens são
+    contados por palavras.
+
+    Args:
+        latency: Atraso de cada resposta em segundos
+        fail_every: Responde 503 a cada N requisições (0 desativa)
+    """
+
+    def __init__(self, latency: float = 0.05, fail_every: int = 0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _reply(self, body: dict) -> Tuple[int, dict]:
+        with self._lock:
+            self.requests += 1
+            count = self.requests
+        time.sleep(self.latency)
+        if self.fail_every and count % self.fail_every == 0:
+            return 503, {'error': {'message': 'stub overloaded'}}
+
+        user = body['messages'][-1]['content']
+        ids = re.findall(r'"id": "([^"]+)"', user)
+        if ids:
+            per_video = int(re.search(r'sugira (\d+)', user).group(1))
+            text = json.dumps({
+                vid: [f"Ideia {i + 1} para {vid}" for i in range(per_video)] for vid in ids
+            }, ensure_ascii=False)
+        else:
+            text = f"[stub] {user}"
+        return 200, {
+            'model': body.get('model', 'stub'),
+            'choices': [{'message': {'role': 'assistant', 'content': text}}],
+            'usage': {'prompt_tokens': len(user.split()), 'completion_tokens': len(text.split())},
+        }
+
+    def start(self) -> 'StubServer':
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                status, payload = stub._reply(json.loads(self.rfile.read(length)))
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cliente de IA: ideias de publicações e prompts de mídia")
+    parser.add_argument('--provider', choices=sorted(PROVIDERS), default='openai')
+    parser.add_argument('--model', default=None)
+    parser.add_argument('--stub', action='store_true', help='Usa um StubServer local')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--no-cache', action='store_true')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ideas = sub.add_parser('ideas', help='Ideias de publicações para vídeos mockados')
+    ideas.add_argument('--videos', type=int, default=20)
+    ideas.add_argument('--ideas', type=int, default=3)
+    ideas.add_argument('--batch-size', type=int, default=10)
+
+    prompt = sub.add_parser('prompt', help='Prompt para VEO3/Image4 a partir de um briefing')
+    prompt.add_argument('brief')
+    prompt.add_argument('--target', choices=sorted(MEDIA_TARGETS), default='veo3')
+    args = parser.parse_args(argv)
+
+    stub = StubServer().start() if args.stub else None
+    try:
+        options = {'model': args.model}
+        if stub is not None:
+            options.update(base_url=stub.url, api_key='stub')
+        provider = create_provider('openai' if stub else args.provider, **options)
+        client = AIClient(provider, args.concurrency, cache=None if args.no_cache else ResponseCache())
+
+        if args.command == 'ideas':
+            from dashboard.data.mock_data import get_mock_videos
+
+            videos = get_mock_videos(args.videos)
+            result = asyncio.run(generate_post_ideas(client, videos, args.ideas, args.batch_size))
+            for video in videos:
+                print(f"{video.id} {video.title}")
+                for idea in result[video.id]:
+                    print(f"  - {idea}")
+        else:
+            print(asyncio.run(client.complete(media_prompt(args.brief, args.target))).text)
+
+        print(json.dumps(client.stats.as_dict(), indent=2))
+    finally:
+        if stub is not None:
+            stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Controle adaptativo de concorrência por TaskType
+
+O custo de um job de ffmpeg varia muito com o codec (H.265 e AV1 pesam
+bem mais que H.264), a resolução e a máquina, então um número fixo de
+workers ou deixa núcleos ociosos ou sobrecarrega o sistema.
+
+O controlador mede, para cada tipo de tarefa, a vazão em segundos de
+mídia processados por segundo de parede e sobe ou desce o limite de jobs
+simultâneos por subida de encosta: continua na direção que aumentou a
+vazão, inverte quando ela cai e recua sempre que CPU ou memória passam
+do limite. Cada decisão é registrada (logger `processing.concurrency` e,
+opcionalmente, um arquivo JSONL) para revisão.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Optional, Tuple, Union
+
+from dashboard.data.schemas import TaskType
+
+logger = logging.getLogger(__name__)
+
+# Variação relativa de vazão considerada ruído
+THROUGHPUT_TOLERANCE = 0.05
+
+
+class ResourceSampler:
+    """
+    Amostra uso de CPU e memória (0-1)
+
+    Usa psutil quando instalado; senão /proc/stat e /proc/meminfo, e por
+    fim a carga média do sistema.
+    """
+
+    def __init__(self):
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        self._psutil = psutil
+        self._last_cpu: Optional[Tuple[int, int]] = None
+        if psutil is not None:
+            psutil.cpu_percent(None)
+
+    def _proc_cpu(self) -> Optional[float]:
+        try:
+            with open('/proc/stat') as f:
+                values = [int(v) for v in f.readline().split()[1:]]
+        except OSError:
+            return None
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        total = sum(values)
+        previous, self._last_cpu = self._last_cpu, (idle, total)
+        if previous is None or total == previous[1]:
+            return None
+        return 1 - (idle - previous[0]) / (total - previous[1])
+
+    @staticmethod
+    def _proc_memory() -> Optional[float]:
+        info = {}
+        try:
+            with open('/proc/meminfo') as f:
+                for line in f:
+                    name, value = line.split(':', 1)
+                    info[name] = int(value.split()[0])
+        except OSError:
+            return None
+        if 'MemTotal' not in info or 'MemAvailable' not in info:
+            return None
+        return 1 - info['MemAvailable'] / info['MemTotal']
+
+    def sample(self) -> Tuple[float, float]:
+        """
+        Returns:
+            Tupla (uso de CPU, uso de memória)
+        """
+        if self._psutil is not None:
+            return (
+                self._psutil.cpu_percent(None) / 100,
+                self._psutil.virtual_memory().percent / 100
+            )
+
+        cpu = self._proc_cpu()
+        if cpu is None and hasattr(os, 'getloadavg'):
+            cpu = os.getloadavg()[0] / (os.cpu_count() or 1)
+        return min(cpu or 0.0, 1.0), self._proc_memory() or 0.0
+
+
+@dataclass
+class Decision:
+    """Avaliação do limite de um tipo de tarefa"""
+    timestamp: float
+    task_type: str
+    old_limit: int
+    new_limit: int
+    throughput: float
+    cpu: float
+    memory: float
+    reason: str
+
+
+@dataclass
+class _TypeState:
+    limit: int
+    active: int = 0
+    media_seconds: float = 0.0
+    denied: int = 0
+    window_start: float = 0.0
+    last_throughput: Optional[float] = None
+    direction: int = 1
+
+
+class ConcurrencyController:
+    """
+    Limites de jobs simultâneos por TaskType ajustados pela vazão
+
+    Args:
+        initial: Limite inicial (único ou por tipo)
+        min_limit: Limite mínimo por tipo
+        max_limit: Limite máximo por tipo (padrão: número de CPUs)
+        interval: Segundos entre avaliações de cada tipo
+        cpu_high: Uso de CPU a partir do qual o limite é reduzido
+        memory_high: Uso de memória a partir do qual o limite é reduzido
+        sampler: Fonte de uso de CPU/memória
+        log_path: Arquivo JSONL onde as decisões são anexadas
+        history: Decisões mantidas em memória
+    """
+
+    def __init__(
+        self,
+        initial: Union[int, Dict[TaskType, int]] = 2,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        interval: float = 30.0,
+        cpu_high: float = 0.95,
+        memory_high: float = 0.90,
+        sampler: Optional[ResourceSampler] = None,
+        log_path: Optional[str] = None,
+        history: int = 500
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit or os.cpu_count() or 1
+        self.interval = interval
+        self.cpu_high = cpu_high
+        self.memory_high = memory_high
+        self.sampler = sampler or ResourceSampler()
+        self.log_path = log_path
+        self.decisions: Deque[Decision] = deque(maxlen=history)
+
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        self._states: Dict[TaskType, _TypeState] = {}
+        for task_type in TaskType:
+            limit = initial.get(task_type, min_limit) if isinstance(initial, dict) else initial
+            self._states[task_type] = _TypeState(limit=self._clamp(limit), window_start=now)
+
+    def _clamp(self, limit: int) -> int:
+        return max(self.min_limit, min(self.max_limit, limit))
+
+    def limit(self, task_type: TaskType) -> int:
+        """Limite atual de jobs simultâneos do tipo"""
+        return self._states[task_type].limit
+
+    def limits(self) -> Dict[TaskType, int]:
+        return {t: s.limit for t, s in self._states.items()}
+
+    def try_acquire(self, task_type: TaskType) -> bool:
+        """
+        Reserva uma vaga para um job do tipo, se houver
+
+        Returns:
+            True se o job pode começar
+        """
+        with self._lock:
+            state = self._states[task_type]
+            if state.active >= state.limit:
+                state.denied += 1
+                return False
+            state.active += 1
+            return True
+
+    def release(self, task_type: TaskType, media_seconds: float = 0.0):
+        """
+        Libera a vaga de um job concluído e contabiliza a mídia processada
+
+        Args:
+            task_type: Tipo da tarefa
+            media_seconds: Duração da mídia processada pelo job
+        """
+        with self._lock:
+            state = self._states[task_type]
+            state.active = max(0, state.active - 1)
+            state.media_seconds += media_seconds
+        self.adjust()
+
+    def adjust(self, now: Optional[float] = None):
+        """Avalia os tipos cuja janela de medição terminou"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = [t for t, s in self._states.items() if now - s.window_start >= self.interval]
+            if not due:
+                return
+            cpu, memory = self.sampler.sample()
+            decisions = [self._evaluate(t, now, cpu, memory) for t in due]
+
+        for decision in decisions:
+            if decision is not None:
+                self._record(decision)
+
+    def _evaluate(self, task_type: TaskType, now: float, cpu: float, memory: float) -> Optional[Decision]:
+        state = self._states[task_type]
+        if state.media_seconds == 0:
+            # Nenhum job terminou: a janela se estende até haver medição
+            if state.active == 0:
+                state.window_start = now
+                state.denied = 0
+            return None
+
+        elapsed = now - state.window_start
+        throughput = state.media_seconds / elapsed if elapsed > 0 else 0.0
+        saturated = state.denied > 0
+
+        state.window_start = now
+        state.media_seconds = 0.0
+        state.denied = 0
+
+        old = state.limit
+        if cpu >= self.cpu_high or memory >= self.memory_high:
+            state.direction = -1
+            new, reason = old - 1, 'pressão de recursos'
+        elif state.last_throughput is None:
+            new, reason = (old + 1, 'sondagem inicial') if saturated else (old, 'sem fila')
+        elif throughput > state.last_throughput * (1 + THROUGHPUT_TOLERANCE):
+            new, reason = old + state.direction, 'vazão aumentou'
+        elif throughput < state.last_throughput * (1 - THROUGHPUT_TOLERANCE):
+            state.direction = -state.direction
+            new, reason = old + state.direction, 'vazão caiu'
+        else:
+            new, reason = old, 'vazão estável'
+
+        if new > old and not saturated:
+            new, reason = old, 'sem fila'
+
+        state.limit = self._clamp(new)
+        if state.limit != new:
+            # No limite da faixa, a próxima tentativa vai na direção oposta
+            state.direction = -state.direction
+        state.last_throughput = throughput
+        return Decision(
+            timestamp=time.time(),
+            task_type=task_type.name,
+            old_limit=old,
+            new_limit=state.limit,
+            throughput=round(throughput, 3),
+            cpu=round(cpu, 3),
+            memory=round(memory, 3),
+            reason=reason
+        )
+
+    def _record(self, decision: Decision):
+        self.decisions.append(decision)
+        logger.info(
+            "%s: limite %d -> %d (%s; vazão %.2fx, CPU %.0f%%, memória %.0f%%)",
+            decision.task_type, decision.old_limit, decision.new_limit, decision.reason,
+            decision.throughput, decision.cpu * 100, decision.memory * 100
+        )
+        if self.log_path:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(asdict(decision), ensure_ascii=False) + '\n')
@@ -0,0 +1,385 @@
+"""
+Sugestão de cortes inteligentes (TaskType.CUT)
+
+O ffmpeg decodifica o áudio (PCM mono 16 bits) e quadros reduzidos em
+tons de cinza direto para stdout, lidos em blocos de tamanho fixo. Cada
+bloco vira, com NumPy, um resumo por janela: energia em dB do áudio e
+diferença média entre quadros consecutivos. Só os resumos são mantidos
+(poucos KB por hora de vídeo), então a memória não cresce com a duração.
+
+Silêncios e mudanças de cena delimitam os trechos candidatos, que são
+pontuados por fala, volume e movimento e ranqueados para clipes curtos.
+
+Uso:
+    python -m processing.cuts episodio.mp4 --top 10 --min-clip 15 --max-clip 60
+"""
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from dashboard.data.transcripts import format_timestamp
+
+from . import ffmpeg
+
+# Referência de dB para PCM 16 bits (escala completa)
+_FULL_SCALE = 32768.0
+_SILENCE_FLOOR_DB = -100.0
+
+
+@dataclass
+class Signals:
+    """Sinais resumidos de um vídeo"""
+    window_seconds: float
+    energy_db: np.ndarray
+    frame_seconds: float
+    frame_diff: np.ndarray
+
+    @property
+    def duration(self) -> float:
+        return max(
+            len(self.energy_db) * self.window_seconds,
+            len(self.frame_diff) * self.frame_seconds
+        )
+
+
+@dataclass
+class CandidateClip:
+    """Trecho sugerido para corte"""
+    start: float
+    end: float
+    score: float
+    speech_ratio: float
+    loudness: float
+    motion: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def to_dict(self) -> dict:
+        return {k: round(v, 3) for k, v in asdict(self).items()}
+
+
+# ---------------------------------------------------------------------------
+# Extração dos sinais
+# ---------------------------------------------------------------------------
+
+def audio_energy(
+    source_path: str,
+    sample_rate: int = 16000,
+    window_seconds: float = 0.1,
+    chunk_seconds: float = 30.0
+) -> np.ndarray:
+    """
+    Energia RMS em dBFS por janela, lendo o áudio em blocos fixos
+
+    Args:
+        source_path: Arquivo de mídia
+        sample_rate: Taxa de amostragem da decodificação
+        window_seconds: Tamanho da janela de análise
+        chunk_seconds: Áudio lido por bloco (múltiplo da janela)
+
+    Returns:
+        Array float32 com a energia de cada janela
+    """
+    window = int(sample_rate * window_seconds)
+    windows_per_chunk = max(1, int(chunk_seconds / window_seconds))
+    block_size = window * windows_per_chunk * 2
+
+    args = ['-v', 'error', '-i', source_path, '-vn', '-ac', '1', '-ar', str(sample_rate),
+            '-f', 's16le', '-acodec', 'pcm_s16le', '-']
+
+    parts = []
+    pending = b''
+    for block in ffmpeg.stream(args, block_size):
+        data = pending + block
+        usable = len(data) - len(data) % (window * 2)
+        pending = data[usable:]
+        if usable:
+            parts.append(_energy_db(np.frombuffer(data[:usable], dtype='<i2').reshape(-1, window)))
+
+    if len(pending) >= 2:
+        samples = np.frombuffer(pending[:len(pending) - len(pending) % 2], dtype='<i2')
+        parts.append(_energy_db(samples.reshape(1, -1)))
+
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.float32)
+
+
+def _energy_db(frames: np.ndarray) -> np.ndarray:
+    samples = frames.astype(np.float32) / _FULL_SCALE
+    rms = np.sqrt(np.mean(samples * samples, axis=1))
+    with np.errstate(divide='ignore'):
+        db = 20 * np.log10(rms)
+    return np.maximum(db, _SILENCE_FLOOR_DB).astype(np.float32)
+
+
+def frame_differences(
+    source_path: str,
+    fps: float = 2.0,
+    width: int = 64,
+    height: int = 36,
+    chunk_frames: int = 256
+) -> np.ndarray:
+    """
+    Diferença média absoluta (0-1) entre quadros consecutivos reduzidos
+
+    Args:
+        source_path: Arquivo de mídia
+        fps: Quadros analisados por segundo
+        width: Largura do quadro reduzido
+        height: Altura do quadro reduzido
+        chunk_frames: Quadros lidos por bloco
+
+    Returns:
+        Array float32 com uma diferença por quadro (0 no primeiro)
+    """
+    frame_size = width * height
+    args = ['-v', 'error', '-i', source_path, '-an',
+            '-vf', f'fps={fps},scale={width}:{height},format=gray',
+            '-f', 'rawvideo', '-']
+
+    parts = []
+    previous: Optional[np.ndarray] = None
+    pending = b''
+    for block in ffmpeg.stream(args, frame_size * chunk_frames):
+        data = pending + block
+        usable = len(data) - len(data) % frame_size
+        pending = data[usable:]
+        if not usable:
+            continue
+
+        frames = np.frombuffer(data[:usable], dtype=np.uint8).reshape(-1, frame_size).astype(np.int16)
+        reference = np.vstack([frames[:1] if previous is None else previous, frames[:-1]])
+        parts.append((np.abs(frames - reference).mean(axis=1) / 255).astype(np.float32))
+        previous = frames[-1:]
+
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.float32)
+
+
+def extract_signals(
+    source_path: str,
+    window_seconds: float = 0.1,
+    fps: float = 2.0
+) -> Signals:
+    """
+    Extrai os sinais de áudio e vídeo em paralelo (um ffmpeg para cada)
+
+    Streams ausentes resultam em sinais vazios.
+
+    Args:
+        source_path: Arquivo de mídia
+        window_seconds: Janela da energia de áudio
+        fps: Quadros analisados por segundo
+
+    Returns:
+        Signals do arquivo
+    """
+    info = ffmpeg.probe(source_path)
+    empty = np.empty(0, dtype=np.float32)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        audio = (
+            pool.submit(audio_energy, source_path, window_seconds=window_seconds)
+            if ffmpeg.first_stream(info, 'audio') else None
+        )
+        video = (
+            pool.submit(frame_differences, source_path, fps=fps)
+            if ffmpeg.first_stream(info, 'video') else None
+        )
+        return Signals(
+            window_seconds=window_seconds,
+            energy_db=audio.result() if audio else empty,
+            frame_seconds=1 / fps,
+            frame_diff=video.result() if video else empty
+        )
+
+
+# ---------------------------------------------------------------------------
+# Pontos de corte
+# ---------------------------------------------------------------------------
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Início e fim (exclusivo) de cada sequência de True"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def find_silences(
+    energy_db: np.ndarray,
+    window_seconds: float,
+    threshold_db: float = -40.0,
+    min_duration: float = 0.4
+) -> List[Tuple[float, float]]:
+    """
+    Silêncios como intervalos (início, fim) em segundos
+
+    Args:
+        energy_db: Energia por janela
+        window_seconds: Tamanho da janela
+        threshold_db: Energia abaixo da qual a janela é silêncio
+        min_duration: Duração mínima de um silêncio
+
+    Returns:
+        Lista de intervalos
+    """
+    starts, ends = _runs(energy_db < threshold_db)
+    keep = (ends - starts) * window_seconds >= min_duration
+    return [
+        (float(s * window_seconds), float(e * window_seconds))
+        for s, e in zip(starts[keep], ends[keep])
+    ]
+
+
+def find_scene_changes(
+    frame_diff: np.ndarray,
+    frame_seconds: float,
+    sensitivity: float = 4.0,
+    min_diff: float = 0.08
+) -> np.ndarray:
+    """
+    Instantes de mudança de cena
+
+    Um quadro é corte de cena quando sua diferença supera a mediana em
+    `sensitivity` desvios absolutos medianos (e pelo menos `min_diff`).
+
+    Args:
+        frame_diff: Diferença por quadro
+        frame_seconds: Intervalo entre quadros
+        sensitivity: Limiar em desvios absolutos medianos
+        min_diff: Limiar mínimo absoluto
+
+    Returns:
+        Array de tempos em segundos
+    """
+    if frame_diff.size == 0:
+        return np.empty(0)
+    median = float(np.median(frame_diff))
+    mad = float(np.median(np.abs(frame_diff - median)))
+    threshold = max(min_diff, median + sensitivity * mad)
+    return np.flatnonzero(frame_diff > threshold) * frame_seconds
+
+
+def _normalize(values: np.ndarray) -> np.ndarray:
+    if values.size == 0:
+        return values
+    low, high = np.percentile(values, [5, 95])
+    if high <= low:
+        return np.zeros_like(values)
+    return np.clip((values - low) / (high - low), 0, 1)
+
+
+def _window_means(prefix: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                  step: float) -> np.ndarray:
+    """Média de um sinal em [start, end) usando a soma acumulada"""
+    n = len(prefix) - 1
+    if n == 0:
+        return np.zeros(len(starts))
+    a = np.clip((starts / step).astype(np.int64), 0, n)
+    b = np.clip((ends / step).astype(np.int64), 0, n)
+    return (prefix[b] - prefix[a]) / np.maximum(b - a, 1)
+
+
+def propose_clips(
+    signals: Signals,
+    min_clip: float = 15.0,
+    max_clip: float = 60.0,
+    top: int = 10,
+    silence_db: float = -40.0,
+    max_overlap: float = 0.5,
+    weights: Tuple[float, float, float] = (0.5, 0.3, 0.2)
+) -> List[CandidateClip]:
+    """
+    Ranqueia trechos entre silêncios/mudanças de cena para clipes curtos
+
+    Todos os pares de fronteiras com duração entre `min_clip` e
+    `max_clip` são pontuados de uma vez por somas acumuladas; em seguida
+    trechos muito sobrepostos a um melhor colocado são descartados.
+
+    Args:
+        signals: Sinais extraídos
+        min_clip: Duração mínima do clipe (s)
+        max_clip: Duração máxima do clipe (s)
+        top: Número de sugestões
+        silence_db: Limiar de silêncio
+        max_overlap: Sobreposição máxima, relativa ao menor clipe
+        weights: Pesos de fala, volume e movimento
+
+    Returns:
+        Clipes sugeridos, do melhor para o pior
+    """
+    duration = signals.duration
+    silences = find_silences(signals.energy_db, signals.window_seconds, silence_db)
+    boundaries = np.unique(np.concatenate([
+        [0.0, duration],
+        [(s + e) / 2 for s, e in silences],
+        find_scene_changes(signals.frame_diff, signals.frame_seconds),
+    ]))
+
+    # Pares (i, j) com min_clip <= b[j] - b[i] <= max_clip
+    first = np.searchsorted(boundaries, boundaries + min_clip, side='left')
+    last = np.searchsorted(boundaries, boundaries + max_clip, side='right')
+    counts = np.maximum(last - first, 0)
+    if counts.sum() == 0:
+        return []
+    i = np.repeat(np.arange(len(boundaries)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    starts = boundaries[i]
+    ends = boundaries[first[i] + offsets]
+
+    speech_prefix = np.concatenate(([0.0], np.cumsum(signals.energy_db >= silence_db)))
+    loud_prefix = np.concatenate(([0.0], np.cumsum(_normalize(signals.energy_db))))
+    motion_prefix = np.concatenate(([0.0], np.cumsum(_normalize(signals.frame_diff))))
+
+    speech = _window_means(speech_prefix, starts, ends, signals.window_seconds)
+    loudness = _window_means(loud_prefix, starts, ends, signals.window_seconds)
+    motion = _window_means(motion_prefix, starts, ends, signals.frame_seconds)
+    scores = weights[0] * speech + weights[1] * loudness + weights[2] * motion
+
+    selected: List[CandidateClip] = []
+    for k in np.argsort(-scores, kind='stable'):
+        start, end = float(starts[k]), float(ends[k])
+        overlapping = any(
+            min(end, c.end) - max(start, c.start) > max_overlap * min(end - start, c.duration)
+            for c in selected
+        )
+        if overlapping:
+            continue
+        selected.append(CandidateClip(
+            start=start, end=end, score=float(scores[k]),
+            speech_ratio=float(speech[k]), loudness=float(loudness[k]), motion=float(motion[k])
+        ))
+        if len(selected) >= top:
+            break
+
+    return selected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sugere cortes para clipes curtos")
+    parser.add_argument('source', help='Arquivo de vídeo')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--min-clip', type=float, default=15.0)
+    parser.add_argument('--max-clip', type=float, default=60.0)
+    parser.add_argument('--silence-db', type=float, default=-40.0)
+    parser.add_argument('--json', action='store_true', help='Saída em JSON')
+    args = parser.parse_args(argv)
+
+    signals = extract_signals(args.source)
+    clips = propose_clips(signals, args.min_clip, args.max_clip, args.top, args.silence_db)
+
+    if args.json:
+        print(json.dumps([c.to_dict() for c in clips], ensure_ascii=False, indent=2))
+        return
+
+    for rank, clip in enumerate(clips, start=1):
+        print(f"{rank:2d}. {format_timestamp(clip.start)} - {format_timestamp(clip.end)}"
+              f"  score {clip.score:.2f}  fala {clip.speech_ratio:.0%}"
+              f"  volume {clip.loudness:.2f}  movimento {clip.motion:.2f}")
+
+
+if __name__ == '__main__':
+    main()
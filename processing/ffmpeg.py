@@ -0,0 +1,108 @@
+"""
+Utilitários para invocar ffmpeg/ffprobe
+"""
+import json
+import shutil
+import subprocess
+import tempfile
+from typing import Iterator, List, Optional
+
+FFMPEG_BIN = "ffmpeg"
+FFPROBE_BIN = "ffprobe"
+
+
+class FFmpegError(RuntimeError):
+    """Falha na execução do ffmpeg/ffprobe"""
+
+    def __init__(self, cmd: List[str], returncode: int, stderr: str):
+        self.cmd = cmd
+        self.returncode = returncode
+        self.stderr = stderr
+        tail = stderr.strip().splitlines()[-1] if stderr.strip() else ''
+        super().__init__(f"{cmd[0]} terminou com código {returncode}: {tail}")
+
+
+def ensure_available(binary: str = FFMPEG_BIN):
+    """Verifica se o executável está no PATH"""
+    if shutil.which(binary) is None:
+        raise FileNotFoundError(f"{binary} não encontrado no PATH")
+
+
+def run(args: List[str], binary: str = FFMPEG_BIN) -> subprocess.CompletedProcess:
+    """
+    Executa o ffmpeg (ou ffprobe) e levanta FFmpegError em caso de falha
+
+    Args:
+        args: Argumentos sem o executável
+        binary: Executável a usar
+
+    Returns:
+        Processo concluído, com stdout/stderr em texto
+    """
+    cmd = [binary, '-hide_banner', *args]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise FFmpegError(cmd, result.returncode, result.stderr)
+    return result
+
+
+def probe(path: str) -> dict:
+    """
+    Lê formato e streams de um arquivo com ffprobe
+
+    Args:
+        path: Caminho do arquivo de mídia
+
+    Returns:
+        Dicionário com as chaves 'format' e 'streams'
+    """
+    result = run(
+        ['-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', path],
+        binary=FFPROBE_BIN
+    )
+    return json.loads(result.stdout)
+
+
+def probe_duration(path: str) -> float:
+    """Duração do arquivo em segundos"""
+    return float(probe(path)['format']['duration'])
+
+
+def first_stream(info: dict, codec_type: str) -> Optional[dict]:
+    """Primeiro stream do tipo ('video' ou 'audio') no resultado de probe()"""
+    return next((s for s in info.get('streams', []) if s.get('codec_type') == codec_type), None)
+
+
+def stream(args: List[str], block_size: int, binary: str = FFMPEG_BIN) -> Iterator[bytes]:
+    """
+    Executa o ffmpeg com saída bruta em stdout e entrega blocos de tamanho fixo
+
+    Apenas um bloco fica em memória por vez; o último pode ser menor.
+    Levanta FFmpegError se o processo falhar.
+
+    Args:
+        args: Argumentos sem o executável (a saída deve ser '-')
+        block_size: Tamanho de cada bloco em bytes
+        binary: Executável a usar
+
+    Yields:
+        Blocos de bytes da saída
+    """
+    cmd = [binary, '-hide_banner', '-nostdin', *args]
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            while True:
+                block = process.stdout.read(block_size)
+                if not block:
+                    break
+                yield block
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            returncode = process.wait()
+
+        if returncode != 0:
+            stderr.seek(0)
+            raise FFmpegError(cmd, returncode, stderr.read().decode('utf-8', 'replace'))
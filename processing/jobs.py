@@ -0,0 +1,259 @@
+"""
+Jobs retomáveis: checkpoints por segmento, novas tentativas e dead letter
+
+Um job longo (ex.: transcodificação de 2 horas) é dividido em segmentos;
+cada segmento concluído é gravado em um checkpoint JSON por tarefa, de
+modo que um worker reiniciado continua do último segmento pronto em vez
+de recomeçar do zero.
+
+Falhas transitórias (E/S, timeouts, `TransientError`) são repetidas com
+backoff exponencial e jitter completo. Ao esgotar as tentativas a tarefa
+vai para o estado de dead letter, que fica registrado no checkpoint e é
+exibido no dashboard. `retry` só libera o checkpoint: a tarefa volta a
+rodar quando o vídeo for enviado de novo a um `Scheduler`, que ignora as
+tarefas em dead letter.
+
+Uso:
+    python -m processing.jobs list
+    python -m processing.jobs retry task_0042
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from dashboard.data.schemas import Task
+
+from . import ffmpeg
+
+CHECKPOINT_DIR_ENV = "MAIKETEIRO_JOBS_DIR"
+DEFAULT_CHECKPOINT_DIR = ".jobs"
+
+RUNNING = 'running'
+DEAD_LETTER = 'dead_letter'
+
+
+class TransientError(RuntimeError):
+    """Falha que pode desaparecer em uma nova tentativa"""
+
+
+# Códigos de saída do ffmpeg por sinal (interrupção, falta de memória)
+_TRANSIENT_RETURNCODES = {-9, -15, 137, 143, 255}
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    Indica se uma falha vale nova tentativa
+
+    Args:
+        exc: Exceção levantada pelo job
+
+    Returns:
+        True para erros de E/S, timeouts, processos interrompidos e TransientError
+    """
+    if isinstance(exc, (TransientError, TimeoutError, ConnectionError, subprocess.TimeoutExpired)):
+        return True
+    if isinstance(exc, ffmpeg.FFmpegError):
+        return exc.returncode in _TRANSIENT_RETURNCODES
+    if isinstance(exc, OSError):
+        return not isinstance(exc, (FileNotFoundError, PermissionError, IsADirectoryError))
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Política de novas tentativas com backoff exponencial e jitter completo
+
+    Args:
+        max_attempts: Tentativas antes do dead letter
+        base_delay: Atraso base em segundos
+        max_delay: Atraso máximo em segundos
+        retryable: Função que decide se a falha é transitória
+    """
+    max_attempts: int = 5
+    base_delay: float = 5.0
+    max_delay: float = 600.0
+    retryable: Callable[[BaseException], bool] = is_transient
+
+    def delay(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        """Atraso antes da tentativa seguinte à de número `attempt` (1, 2, ...)"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return (rng or random).uniform(0, ceiling)
+
+
+@dataclass
+class Checkpoint:
+    """Progresso persistido de uma tarefa"""
+    task_id: str
+    segments_total: int = 0
+    completed: Dict[int, str] = field(default_factory=dict)
+    attempts: int = 0
+    last_error: Optional[str] = None
+    state: str = RUNNING
+    updated_at: Optional[str] = None
+
+    @property
+    def progress(self) -> int:
+        if not self.segments_total:
+            return 0
+        return int(100 * len(self.completed) / self.segments_total)
+
+
+class CheckpointStore:
+    """
+    Checkpoints em JSON, um arquivo por tarefa
+
+    Args:
+        root: Diretório dos checkpoints. Padrão: $MAIKETEIRO_JOBS_DIR ou .jobs
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.environ.get(CHECKPOINT_DIR_ENV, DEFAULT_CHECKPOINT_DIR)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, task_id: str) -> str:
+        return os.path.join(self.root, f"{task_id}.json")
+
+    def load(self, task_id: str) -> Optional[Checkpoint]:
+        try:
+            with open(self._path(task_id), encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        data['completed'] = {int(k): v for k, v in data['completed'].items()}
+        return Checkpoint(**data)
+
+    def save(self, checkpoint: Checkpoint):
+        """Grava o checkpoint (substituição atômica)"""
+        checkpoint.updated_at = datetime.now().isoformat(timespec='seconds')
+        path = self._path(checkpoint.task_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint.__dict__, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def clear(self, task_id: str):
+        """Remove o checkpoint de uma tarefa concluída"""
+        try:
+            os.remove(self._path(task_id))
+        except FileNotFoundError:
+            pass
+
+    def record_failure(self, task_id: str, error: str) -> Checkpoint:
+        """Contabiliza uma tentativa falha"""
+        checkpoint = self.load(task_id) or Checkpoint(task_id=task_id)
+        checkpoint.attempts += 1
+        checkpoint.last_error = error
+        self.save(checkpoint)
+        return checkpoint
+
+    def mark_dead_letter(self, task_id: str, error: str) -> Checkpoint:
+        checkpoint = self.load(task_id) or Checkpoint(task_id=task_id)
+        checkpoint.state = DEAD_LETTER
+        checkpoint.last_error = error
+        self.save(checkpoint)
+        return checkpoint
+
+    def requeue(self, task_id: str) -> Optional[Checkpoint]:
+        """Tira a tarefa do dead letter, mantendo os segmentos já prontos"""
+        checkpoint = self.load(task_id)
+        if checkpoint is None:
+            return None
+        checkpoint.state = RUNNING
+        checkpoint.attempts = 0
+        self.save(checkpoint)
+        return checkpoint
+
+    def all(self) -> List[Checkpoint]:
+        checkpoints = []
+        for name in sorted(os.listdir(self.root)):
+            if name.endswith('.json'):
+                checkpoint = self.load(name[:-len('.json')])
+                if checkpoint is not None:
+                    checkpoints.append(checkpoint)
+        return checkpoints
+
+    def dead_letters(self) -> List[Checkpoint]:
+        return [c for c in self.all() if c.state == DEAD_LETTER]
+
+
+def run_segments(
+    task: Optional[Task],
+    segments_total: int,
+    work: Callable[[int], str],
+    store: Optional[CheckpointStore] = None,
+    workers: int = 1
+) -> List[str]:
+    """
+    Processa os segmentos de uma tarefa, pulando os já concluídos
+
+    Cada segmento concluído é gravado no checkpoint assim que termina;
+    segmentos cujo arquivo sumiu são refeitos. Se a divisão mudou (outro
+    número de segmentos), o progresso anterior é descartado.
+
+    Args:
+        task: Tarefa (progress é atualizado); sem ela, não há checkpoint
+        segments_total: Número de segmentos
+        work: Processa o segmento i e devolve o arquivo gerado
+        store: Onde os checkpoints são gravados (None desativa)
+        workers: Segmentos processados ao mesmo tempo
+
+    Returns:
+        Arquivos dos segmentos, em ordem
+    """
+    checkpoint: Optional[Checkpoint] = None
+    if task is not None and store is not None:
+        checkpoint = store.load(task.id) or Checkpoint(task_id=task.id)
+        if checkpoint.segments_total != segments_total:
+            checkpoint.segments_total = segments_total
+            checkpoint.completed = {}
+    lock = threading.Lock()
+
+    def run(index: int) -> str:
+        if checkpoint is not None:
+            done = checkpoint.completed.get(index)
+            if done is not None and os.path.exists(done):
+                return done
+        path = work(index)
+        if checkpoint is not None:
+            with lock:
+                checkpoint.completed[index] = path
+                store.save(checkpoint)
+                task.progress = checkpoint.progress
+        return path
+
+    if workers <= 1:
+        return [run(i) for i in range(segments_total)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, range(segments_total)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checkpoints e dead letter de tarefas")
+    parser.add_argument('--root', default=None, help='Diretório dos checkpoints')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help='Lista tarefas com checkpoint')
+    retry = sub.add_parser('retry', help='Tira uma tarefa do dead letter')
+    retry.add_argument('task_id')
+    args = parser.parse_args(argv)
+
+    store = CheckpointStore(args.root)
+    if args.command == 'list':
+        for c in store.all():
+            print(f"{c.task_id:<12} {c.state:<12} {c.progress:3d}%  "
+                  f"tentativas {c.attempts}  {c.last_error or ''}")
+    elif store.requeue(args.task_id) is None:
+        parser.error(f"checkpoint não encontrado: {args.task_id}")
+    else:
+        print(f"{args.task_id} fora do dead letter; roda no próximo envio ao agendador")
+
+
+if __name__ == '__main__':
+    main()
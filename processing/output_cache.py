@@ -0,0 +1,460 @@
+"""
+Cache de saídas endereçado por conteúdo
+
+Uma saída é identificada por (hash do conteúdo da entrada, TaskType,
+parâmetros normalizados). Se o mesmo arquivo for reenviado ou a mesma
+tarefa repetida, o artefato já produzido é ligado (hard link, ou cópia
+entre sistemas de arquivos) ao `Task.output_file` e a tarefa termina sem
+reprocessar. `cached_runner` aplica o cache a um runner do `Scheduler`.
+
+O índice fica em SQLite dentro do diretório do cache, com contagem de
+referências por artefato (quantas saídas de tarefas apontam para ele) e
+remoção por tamanho dos artefatos sem referências, do menos usado ao
+mais usado. Hashes de entrada são memorizados por (caminho, tamanho,
+mtime) para não reler arquivos grandes.
+
+Uso:
+    python -m processing.output_cache .cache/outputs stats
+    python -m processing.output_cache .cache/outputs evict --max-gb 200
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from dashboard.data.schemas import Task, TaskType
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    params TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    refcount INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    output_path TEXT PRIMARY KEY,
+    key TEXT NOT NULL REFERENCES entries(key)
+);
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (refcount, last_used);
+"""
+
+
+@dataclass
+class CacheEntry:
+    """Artefato armazenado no cache"""
+    key: str
+    input_hash: str
+    task_type: TaskType
+    params: str
+    path: str
+    size: int
+    refcount: int
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def normalize_params(params: Optional[dict]) -> str:
+    """
+    Forma canônica dos parâmetros de uma tarefa
+
+    Chaves ordenadas, valores None descartados e floats inteiros
+    reduzidos a int, para que parâmetros equivalentes gerem a mesma chave.
+
+    Args:
+        params: Parâmetros da tarefa
+
+    Returns:
+        JSON canônico
+    """
+    def normalize(value):
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in value.items() if v is not None}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, TaskType):
+            return value.name
+        return value
+
+    return json.dumps(normalize(params or {}), sort_keys=True, separators=(',', ':'))
+
+
+def cache_key(input_hash: str, task_type: TaskType, params: Optional[dict]) -> str:
+    """Chave do artefato para (entrada, tipo de tarefa, parâmetros)"""
+    material = f"{input_hash}|{task_type.name}|{normalize_params(params)}"
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def _link_or_copy(source: str, destination: str):
+    directory = os.path.dirname(destination)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{destination}.{os.getpid()}.tmp"
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+
+class OutputCache:
+    """
+    Cache de artefatos de tarefas em um diretório
+
+    Args:
+        root: Diretório do cache (índice e objetos)
+        max_bytes: Tamanho máximo dos objetos; `evict()` é chamado após
+                   cada inserção quando definido
+    """
+
+    def __init__(self, root: str, max_bytes: Optional[int] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(root, 'objects')
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    # ------------------------------------------------------------------
+    # Hash de entradas
+    # ------------------------------------------------------------------
+
+    def input_hash(self, path: str) -> str:
+        """
+        Hash do conteúdo de uma entrada, memorizado por (caminho, tamanho, mtime)
+
+        Args:
+            path: Arquivo de entrada
+
+        Returns:
+            SHA-256 em hexadecimal
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest FROM file_hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, stat.st_size, stat.st_mtime_ns)
+            ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hash_file(path)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, digest)
+            )
+        return digest
+
+    # ------------------------------------------------------------------
+    # Consulta, inserção e ligação
+    # ------------------------------------------------------------------
+
+    def _entry(self, key: str) -> Optional[CacheEntry]:
+        row = self._db.execute(
+            "SELECT key, input_hash, task_type, params, path, size, refcount FROM entries WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        entry.task_type = TaskType[entry.task_type]
+        return entry
+
+    def lookup(self, input_hash: str, task_type: TaskType, params: Optional[dict] = None) -> Optional[CacheEntry]:
+        """
+        Procura um artefato já produzido
+
+        Entradas cujo objeto sumiu do disco são descartadas.
+
+        Args:
+            input_hash: Hash do conteúdo da entrada
+            task_type: Tipo da tarefa
+            params: Parâmetros da tarefa
+
+        Returns:
+            CacheEntry ou None
+        """
+        key = cache_key(input_hash, task_type, params)
+        with self._lock, self._db:
+            entry = self._entry(key)
+            if entry is None:
+                return None
+            if not os.path.exists(entry.path):
+                self._db.execute("DELETE FROM links WHERE key = ?", (key,))
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            return entry
+
+    def store(self, input_hash: str, task_type: TaskType, params: Optional[dict], produced_path: str) -> CacheEntry:
+        """
+        Adiciona ao cache um artefato recém-produzido
+
+        O arquivo é ligado (não movido) para dentro do cache; o original
+        continua sendo a saída da tarefa e já conta como referência.
+
+        Args:
+            input_hash: Hash do conteúdo da entrada
+            task_type: Tipo da tarefa
+            params: Parâmetros da tarefa
+            produced_path: Arquivo gerado pela tarefa
+
+        Returns:
+            CacheEntry armazenada
+        """
+        key = cache_key(input_hash, task_type, params)
+        extension = os.path.splitext(produced_path)[1]
+        object_path = os.path.join(self.objects_dir, key[:2], f"{key}{extension}")
+        _link_or_copy(produced_path, object_path)
+
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO entries "
+                "(key, input_hash, task_type, params, path, size, refcount, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET path = excluded.path, size = excluded.size, "
+                "last_used = excluded.last_used",
+                (key, input_hash, task_type.name, normalize_params(params),
+                 object_path, os.path.getsize(object_path), now, now)
+            )
+            self._add_link(key, produced_path)
+            entry = self._entry(key)
+
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+        return entry
+
+    def link(self, entry: CacheEntry, output_path: str) -> str:
+        """
+        Liga um artefato do cache ao caminho de saída de uma tarefa
+
+        Args:
+            entry: Artefato obtido por lookup()
+            output_path: Caminho esperado em Task.output_file
+
+        Returns:
+            output_path
+        """
+        _link_or_copy(entry.path, output_path)
+        with self._lock, self._db:
+            self._add_link(entry.key, output_path)
+        return output_path
+
+    def _add_link(self, key: str, output_path: str):
+        output_path = os.path.abspath(output_path)
+        previous = self._db.execute("SELECT key FROM links WHERE output_path = ?", (output_path,)).fetchone()
+        if previous is not None:
+            if previous[0] == key:
+                return
+            self._db.execute("UPDATE entries SET refcount = refcount - 1 WHERE key = ?", previous)
+        self._db.execute(
+            "INSERT OR REPLACE INTO links (output_path, key) VALUES (?, ?)", (output_path, key)
+        )
+        self._db.execute("UPDATE entries SET refcount = refcount + 1 WHERE key = ?", (key,))
+
+    def release(self, output_path: str, delete: bool = True):
+        """
+        Remove a referência de uma saída de tarefa ao artefato
+
+        Args:
+            output_path: Caminho registrado por link()/store()
+            delete: Apaga também o arquivo de saída
+        """
+        output_path = os.path.abspath(output_path)
+        with self._lock, self._db:
+            row = self._db.execute("SELECT key FROM links WHERE output_path = ?", (output_path,)).fetchone()
+            if row is None:
+                return
+            self._db.execute("DELETE FROM links WHERE output_path = ?", (output_path,))
+            self._db.execute("UPDATE entries SET refcount = MAX(refcount - 1, 0) WHERE key = ?", row)
+        if delete and os.path.exists(output_path):
+            os.remove(output_path)
+
+    def get_or_run(
+        self,
+        source_path: str,
+        task_type: TaskType,
+        params: Optional[dict],
+        output_path: str,
+        produce: Callable[[str], None]
+    ) -> Tuple[str, bool]:
+        """
+        Reaproveita o artefato em cache ou executa a tarefa e o armazena
+
+        Args:
+            source_path: Arquivo de entrada
+            task_type: Tipo da tarefa
+            params: Parâmetros da tarefa
+            output_path: Saída da tarefa (Task.output_file)
+            produce: Função que gera o artefato no caminho recebido (um
+                     temporário movido depois para output_path)
+
+        Returns:
+            Tupla (output_path, veio_do_cache)
+        """
+        input_hash = self.input_hash(source_path)
+        entry = self.lookup(input_hash, task_type, params)
+        if entry is not None:
+            return self.link(entry, output_path), True
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # output_path pode ser um hard link de um artefato em cache: gerar
+        # nele sobrescreveria o objeto. Gera em um arquivo novo (mesma
+        # extensão, para o ffmpeg) e o coloca no lugar.
+        stem, extension = os.path.splitext(output_path)
+        tmp_path = f"{stem}.{os.getpid()}.{threading.get_ident()}.tmp{extension}"
+        try:
+            produce(tmp_path)
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.store(input_hash, task_type, params, output_path)
+        return output_path, False
+
+    # ------------------------------------------------------------------
+    # Tamanho e remoção
+    # ------------------------------------------------------------------
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self, max_bytes: int) -> int:
+        """
+        Remove artefatos sem referências, do menos recentemente usado,
+        até o cache caber em max_bytes
+
+        Artefatos ainda referenciados nunca são removidos, então o total
+        pode continuar acima do limite.
+
+        Args:
+            max_bytes: Tamanho alvo
+
+        Returns:
+            Bytes liberados
+        """
+        freed = 0
+        with self._lock, self._db:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            candidates = self._db.execute(
+                "SELECT key, path, size FROM entries WHERE refcount = 0 ORDER BY last_used"
+            ).fetchall()
+            for key, path, size in candidates:
+                if total <= max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                freed += size
+        return freed
+
+    def stats(self) -> dict:
+        """Totais do cache: artefatos, bytes, bytes referenciados e ligações"""
+        with self._lock:
+            entries, total, referenced = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), "
+                "COALESCE(SUM(CASE WHEN refcount > 0 THEN size ELSE 0 END), 0) FROM entries"
+            ).fetchone()
+            links = self._db.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+        return {'entries': entries, 'bytes': total, 'referenced_bytes': referenced, 'links': links}
+
+
+def cached_runner(
+    cache: OutputCache,
+    produce: Callable[[Task, str], None],
+    source_path: Callable[[Task], str],
+    output_path: Callable[[Task], str],
+    params: Optional[Callable[[Task], Optional[dict]]] = None
+) -> Callable[[Task], str]:
+    """
+    Runner do `Scheduler` que só executa tarefas sem artefato em cache
+
+    A chave é (conteúdo da entrada, TaskType, parâmetros): uma tarefa
+    repetida, ou a mesma tarefa de um arquivo reenviado, termina com o
+    artefato ligado à saída, sem chamar `produce`.
+
+    Args:
+        cache: Cache de saídas
+        produce: Gera o artefato da tarefa no caminho recebido
+        source_path: Arquivo de entrada da tarefa
+        output_path: Saída da tarefa (Task.output_file)
+        params: Parâmetros da tarefa que afetam a saída
+
+    Returns:
+        Runner que devolve o caminho da saída
+    """
+    def run(task: Task) -> str:
+        path, _ = cache.get_or_run(
+            source_path(task),
+            task.task_type,
+            params(task) if params else None,
+            output_path(task),
+            lambda tmp_path: produce(task, tmp_path)
+        )
+        return path
+    return run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache de saídas de tarefas")
+    parser.add_argument('root', help='Diretório do cache')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help='Mostra os totais do cache')
+    evict = sub.add_parser('evict', help='Remove artefatos sem referências até o limite')
+    evict.add_argument('--max-gb', type=float, required=True)
+    args = parser.parse_args(argv)
+
+    cache = OutputCache(args.root)
+    try:
+        if args.command == 'stats':
+            print(json.dumps(cache.stats(), indent=2))
+        else:
+            freed = cache.evict(int(args.max_gb * 1024 ** 3))
+            print(f"{freed / 1024 ** 2:.1f} MB liberados")
+    finally:
+        cache.close()
+
+
+if __name__ == '__main__':
+    main()
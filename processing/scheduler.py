@@ -0,0 +1,408 @@
+"""
+Agendador de tarefas por vídeo com dependências (DAG)
+
+Cada vídeo vira um pequeno grafo de tarefas: SUBTITLE espera a
+TRANSCRIPTION e COMPRESS espera o TRANSCODE do mesmo vídeo; as demais
+(THUMBNAIL, CUT) podem começar de imediato. Uma tarefa entra na fila de
+prontas assim que suas entradas terminam.
+
+Entre as prontas, de todos os vídeos, sai primeiro a que inicia o maior
+caminho crítico (sua duração estimada mais a da cadeia mais longa de
+dependentes), o que reduz o tempo total de um lote de uploads. O estado
+da fila é publicado em JSON para o dashboard (`dashboard.data.queue`).
+Com um `ConcurrencyController`, cada TaskType também respeita seu limite
+adaptativo de jobs simultâneos. Com uma `RetryPolicy`, falhas transitórias
+voltam à fila após o backoff (sem ocupar um worker) e, esgotadas as
+tentativas, a tarefa vai para o dead letter (`processing.jobs`). Com um
+`SketchRecorder`, as durações das tarefas encerradas alimentam os sketches
+de latência do dashboard (`dashboard.data.sketches`). Um runner embrulhado
+por `output_cache.cached_runner` termina tarefas repetidas sem executá-las.
+
+Uso (simulação com dados mockados):
+    python -m processing.scheduler --videos 20 --workers 4 --speedup 500
+"""
+import argparse
+import heapq
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from dashboard.data.queue import QueueEntry, QueueState, save_queue_state
+from dashboard.data.schemas import Task, TaskType, Video, VideoStatus
+from dashboard.data.sketches import SketchRecorder
+
+from .concurrency import ConcurrencyController
+from .jobs import DEAD_LETTER, CheckpointStore, RetryPolicy
+
+# Tipos de tarefa que precisam terminar antes de cada tipo (no mesmo vídeo)
+DEPENDENCIES: Dict[TaskType, Tuple[TaskType, ...]] = {
+    TaskType.SUBTITLE: (TaskType.TRANSCRIPTION,),
+    TaskType.COMPRESS: (TaskType.TRANSCODE,),
+}
+
+# Segundos de processamento por segundo de vídeo, usados quando a tarefa
+# ainda não tem duração conhecida
+COST_FACTORS: Dict[TaskType, float] = {
+    TaskType.TRANSCODE: 0.6,
+    TaskType.COMPRESS: 0.4,
+    TaskType.TRANSCRIPTION: 0.3,
+    TaskType.CUT: 0.1,
+    TaskType.SUBTITLE: 0.01,
+    TaskType.THUMBNAIL: 0.005,
+}
+MIN_ESTIMATE_SECONDS = 1.0
+
+# Intervalo mínimo entre gravações do estado da fila
+STATE_WRITE_INTERVAL = 1.0
+
+Runner = Callable[[Task], Optional[str]]
+
+
+def estimate_seconds(task: Task, video_duration: float) -> float:
+    """
+    Estima o tempo de processamento de uma tarefa
+
+    Args:
+        task: Tarefa
+        video_duration: Duração do vídeo em segundos
+
+    Returns:
+        Estimativa em segundos
+    """
+    if task.duration_seconds:
+        return task.duration_seconds
+    return max(MIN_ESTIMATE_SECONDS, COST_FACTORS.get(task.task_type, 0.1) * video_duration)
+
+
+@dataclass
+class _Node:
+    task: Task
+    estimate: float
+    media_seconds: float
+    pending: set = field(default_factory=set)
+    dependents: List[str] = field(default_factory=list)
+    critical_path: float = 0.0
+    attempts: int = 0
+
+
+class Scheduler:
+    """
+    Executa tarefas de vários vídeos respeitando dependências e
+    priorizando o caminho crítico
+
+    O `runner` recebe a tarefa e devolve o arquivo de saída (ou None);
+    exceções marcam a tarefa e seus dependentes como falhos. Vídeos podem
+    ser adicionados enquanto `run()` está em andamento.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        workers: Optional[int] = None,
+        estimator: Callable[[Task, float], float] = estimate_seconds,
+        state_file: Optional[str] = None,
+        publish_state: bool = True,
+        controller: Optional[ConcurrencyController] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        sketches: Optional[SketchRecorder] = None
+    ):
+        self.runner = runner
+        self.workers = workers or os.cpu_count() or 1
+        self.estimator = estimator
+        self.state_file = state_file
+        self.publish_state = publish_state
+        self.controller = controller
+        self.retry_policy = retry_policy
+        self.checkpoints = checkpoints
+        self.sketches = sketches
+
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, _Node] = {}
+        self._ready: List[Tuple[float, int, str]] = []
+        self._running: Dict[str, _Node] = {}
+        self._delayed: List[Tuple[float, str]] = []
+        self._dead_letter: Set[str] = set()
+        self._sequence = 0
+        self._completed = 0
+        self._last_write = 0.0
+
+    # ------------------------------------------------------------------
+    # Montagem do grafo
+    # ------------------------------------------------------------------
+
+    def add_video(self, video: Video, tasks: Iterable[Task]):
+        """
+        Adiciona as tarefas de um vídeo ao grafo
+
+        Tarefas já concluídas satisfazem dependências; tarefas já falhas
+        ou em dead letter propagam a falha aos dependentes.
+
+        Args:
+            video: Vídeo de origem (a duração alimenta as estimativas)
+            tasks: Tarefas do vídeo
+        """
+        nodes = [
+            _Node(task=t, estimate=self.estimator(t, video.duration), media_seconds=video.duration)
+            for t in tasks
+        ]
+        by_type: Dict[TaskType, List[_Node]] = {}
+        for node in nodes:
+            by_type.setdefault(node.task.task_type, []).append(node)
+
+        for node in nodes:
+            for dep_type in DEPENDENCIES.get(node.task.task_type, ()):
+                for dep in by_type.get(dep_type, []):
+                    dep.dependents.append(node.task.id)
+                    if dep.task.status != VideoStatus.COMPLETED:
+                        node.pending.add(dep.task.id)
+
+        with self._lock:
+            for node in nodes:
+                self._nodes[node.task.id] = node
+            for node in nodes:
+                self._compute_critical_path(node)
+
+            for node in nodes:
+                checkpoint = self.checkpoints.load(node.task.id) if self.checkpoints else None
+                if checkpoint is not None:
+                    node.attempts = checkpoint.attempts
+                    if checkpoint.state == DEAD_LETTER:
+                        node.task.status = VideoStatus.FAILED
+                        node.task.error_message = checkpoint.last_error
+                        self._dead_letter.add(node.task.id)
+
+                status = node.task.status
+                if status == VideoStatus.COMPLETED:
+                    self._completed += 1
+                elif status == VideoStatus.FAILED:
+                    self._fail_dependents(node)
+                elif not node.pending:
+                    self._push_ready(node)
+                else:
+                    node.task.status = VideoStatus.PENDING
+
+    def _compute_critical_path(self, node: _Node) -> float:
+        if not node.critical_path:
+            longest = max(
+                (self._compute_critical_path(self._nodes[d]) for d in node.dependents),
+                default=0.0
+            )
+            node.critical_path = node.estimate + longest
+        return node.critical_path
+
+    def _push_ready(self, node: _Node):
+        node.task.status = VideoStatus.QUEUED
+        self._sequence += 1
+        heapq.heappush(self._ready, (-node.critical_path, self._sequence, node.task.id))
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def run(self) -> QueueState:
+        """
+        Executa até não haver tarefas prontas nem em execução
+
+        Returns:
+            Estado final da fila
+        """
+        futures: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    while self._delayed and self._delayed[0][0] <= now:
+                        _, task_id = heapq.heappop(self._delayed)
+                        self._push_ready(self._nodes[task_id])
+
+                    deferred = []
+                    while self._ready and len(futures) < self.workers:
+                        item = heapq.heappop(self._ready)
+                        node = self._nodes[item[2]]
+                        if self.controller and not self.controller.try_acquire(node.task.task_type):
+                            deferred.append(item)
+                            continue
+                        task_id = node.task.id
+                        node.task.status = VideoStatus.PROCESSING
+                        node.task.started_at = datetime.now()
+                        self._running[task_id] = node
+                        futures[pool.submit(self.runner, node.task)] = task_id
+                    for item in deferred:
+                        heapq.heappush(self._ready, item)
+                    next_retry = self._delayed[0][0] - now if self._delayed else None
+                self._write_state()
+
+                if not futures:
+                    if next_retry is None:
+                        break
+                    time.sleep(next_retry)
+                    continue
+
+                done, _ = wait(futures, timeout=next_retry, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_id = futures.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as exc:
+                        self._finish(task_id, error=exc)
+                    else:
+                        self._finish(task_id, output=output)
+
+        self._write_state(force=True)
+        if self.sketches:
+            self.sketches.flush()
+        return self.snapshot()
+
+    def _finish(self, task_id: str, output: Optional[str] = None, error: Optional[Exception] = None):
+        with self._lock:
+            node = self._running.pop(task_id)
+            if self.controller:
+                self.controller.release(node.task.task_type, node.media_seconds if error is None else 0.0)
+            task = node.task
+            task.completed_at = datetime.now()
+            task.duration_seconds = (task.completed_at - task.started_at).total_seconds()
+
+            if error is not None:
+                self._handle_failure(node, error)
+            else:
+                if self.checkpoints:
+                    self.checkpoints.clear(task_id)
+                task.status = VideoStatus.COMPLETED
+                task.error_message = None
+                task.progress = 100
+                task.output_file = output
+                self._completed += 1
+                for dependent_id in node.dependents:
+                    dependent = self._nodes[dependent_id]
+                    dependent.pending.discard(task_id)
+                    if not dependent.pending and dependent.task.status == VideoStatus.PENDING:
+                        self._push_ready(dependent)
+
+        # Tentativas que voltam à fila não entram nos sketches
+        if self.sketches and task.status in (VideoStatus.COMPLETED, VideoStatus.FAILED):
+            self.sketches.record(task)
+
+    def _handle_failure(self, node: _Node, error: Exception):
+        task = node.task
+        message = str(error) or type(error).__name__
+
+        if self.retry_policy and self.retry_policy.retryable(error):
+            if self.checkpoints:
+                node.attempts = self.checkpoints.record_failure(task.id, message).attempts
+            else:
+                node.attempts += 1
+
+            if node.attempts < self.retry_policy.max_attempts:
+                delay = self.retry_policy.delay(node.attempts)
+                task.status = VideoStatus.QUEUED
+                task.error_message = f"Tentativa {node.attempts} falhou: {message}"
+                heapq.heappush(self._delayed, (time.monotonic() + delay, task.id))
+                return
+
+            message = f"Dead letter após {node.attempts} tentativas: {message}"
+            self._dead_letter.add(task.id)
+            if self.checkpoints:
+                self.checkpoints.mark_dead_letter(task.id, message)
+
+        task.status = VideoStatus.FAILED
+        task.error_message = message
+        self._fail_dependents(node)
+
+    def _fail_dependents(self, node: _Node):
+        for dependent_id in node.dependents:
+            dependent = self._nodes[dependent_id]
+            if dependent.task.status == VideoStatus.FAILED:
+                continue
+            dependent.task.status = VideoStatus.FAILED
+            dependent.task.error_message = f"Dependência falhou: {node.task.id}"
+            self._fail_dependents(dependent)
+
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> QueueState:
+        """Estado atual da fila, com as prontas em ordem de despacho"""
+        with self._lock:
+            def entry(node: _Node) -> QueueEntry:
+                return QueueEntry(task=node.task, critical_path_seconds=round(node.critical_path, 1))
+
+            failed = [n for n in self._nodes.values() if n.task.status == VideoStatus.FAILED]
+            return QueueState(
+                updated_at=datetime.now(),
+                workers=self.workers,
+                running=[entry(n) for n in self._running.values()],
+                ready=[entry(self._nodes[i]) for _, _, i in sorted(self._ready)],
+                waiting=(
+                    [entry(n) for n in self._nodes.values() if n.task.status == VideoStatus.PENDING]
+                    + [entry(self._nodes[i]) for _, i in sorted(self._delayed)]
+                ),
+                failed=[entry(n) for n in failed if n.task.id not in self._dead_letter],
+                dead_letter=[entry(n) for n in failed if n.task.id in self._dead_letter],
+                completed=self._completed,
+            )
+
+    def _write_state(self, force: bool = False):
+        if not self.publish_state:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_write < STATE_WRITE_INTERVAL:
+            return
+        self._last_write = now
+        save_queue_state(self.snapshot(), self.state_file)
+
+
+def simulated_runner(video_durations: Dict[str, float], speedup: float = 100.0) -> Runner:
+    """Runner de demonstração que apenas espera a duração estimada / speedup"""
+    def run(task: Task) -> Optional[str]:
+        time.sleep(estimate_seconds(task, video_durations[task.video_id]) / speedup)
+        return f"/output/{task.video_id}_{task.task_type.name.lower()}"
+    return run
+
+
+def main(argv=None):
+    from dashboard.data.mock_data import MockDataGenerator
+
+    parser = argparse.ArgumentParser(description="Simula o agendador com dados mockados")
+    parser.add_argument('--videos', type=int, default=20)
+    parser.add_argument('--tasks-per-video', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--speedup', type=float, default=500.0,
+                        help='Fator de aceleração da duração simulada')
+    parser.add_argument('--state-file', default=None)
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Ajusta a concorrência por tipo de tarefa pela vazão')
+    parser.add_argument('--sketches', action='store_true',
+                        help='Grava sketches de latência ($MAIKETEIRO_SKETCH_DIR ou .sketches)')
+    args = parser.parse_args(argv)
+
+    videos = MockDataGenerator.generate_videos(args.videos)
+    for video in videos:
+        video.status = VideoStatus.PENDING
+    tasks = MockDataGenerator.generate_tasks(videos, args.tasks_per_video)
+
+    runner = simulated_runner({v.id: v.duration for v in videos}, args.speedup)
+    controller = None
+    if args.adaptive:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        controller = ConcurrencyController(interval=1.0, max_limit=args.workers)
+    sketches = SketchRecorder() if args.sketches else None
+    scheduler = Scheduler(runner, args.workers, state_file=args.state_file, controller=controller,
+                          sketches=sketches)
+    for video in videos:
+        scheduler.add_video(video, [t for t in tasks if t.video_id == video.id])
+
+    started = time.monotonic()
+    state = scheduler.run()
+    print(f"{state.completed} tarefas concluídas, {len(state.failed)} falhas "
+          f"em {time.monotonic() - started:.1f}s com {scheduler.workers} workers")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,428 @@
+"""
+Rastreador incremental de uso de armazenamento
+
+Percorrer os diretórios de uploads e saídas a cada carregamento do
+dashboard levaria minutos. O rastreador mantém em cache, por diretório,
+o tamanho dos arquivos agrupado por categoria ('uploads', TaskType de
+cada saída ou 'other') e só relista os diretórios que mudaram:
+
+- com `inotify_simple` instalado (Linux), os eventos marcam os
+  diretórios alterados e apenas eles são relidos;
+- sem inotify, cada diretório é verificado com um único stat e relido
+  com scandir só se o mtime mudou (criação, remoção ou renomeação de
+  entradas; saídas gravadas com substituição atômica também contam).
+
+Um arquivo que cresce no lugar (upload em andamento, saída escrita aos
+poucos) não altera o mtime do diretório. Com inotify, eventos MODIFY
+marcam o diretório; sem ele, os arquivos modificados há menos de
+`RECENT_WRITE_SECONDS` são lembrados por diretório e têm o tamanho
+conferido com um stat a cada atualização, até ficarem parados. Um arquivo
+antigo reescrito no lugar (ex.: `ffmpeg -y`) escapa dessa verificação, então
+sem inotify todos os diretórios são relidos a cada `full_rescan_interval`.
+
+Arquivos com vários hard links (ex.: cache de saídas) são contados uma
+vez. O cache é persistido em JSON para o próximo processo e um registro
+diário vai para o histórico usado por `Metric.storage_used_gb`.
+
+Uso:
+    python -m processing.storage --uploads /data/uploads --outputs /data/outputs --snapshot
+    python -m processing.storage --uploads /data/uploads --outputs /data/outputs --watch 60
+"""
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dashboard.data.schemas import TaskType
+from dashboard.data.storage_history import (
+    GB,
+    StorageSnapshot,
+    append_storage_snapshot,
+    load_storage_history,
+)
+
+DEFAULT_STATE_FILE = os.path.join(".storage", "tree.json")
+
+UPLOADS = 'uploads'
+OTHER = 'other'
+
+# Arquivos modificados há menos que isto têm o tamanho reconferido a cada
+# atualização, mesmo sem mudança no diretório
+RECENT_WRITE_SECONDS = 600
+
+# Sem inotify, intervalo máximo entre releituras completas
+DEFAULT_FULL_RESCAN_INTERVAL = 6 * 3600.0
+
+_OUTPUT_SUFFIXES: Dict[str, TaskType] = {}
+for _task_type in TaskType:
+    _OUTPUT_SUFFIXES[_task_type.name.lower()] = _task_type
+    _OUTPUT_SUFFIXES[_task_type.value.lower()] = _task_type
+
+_OUTPUT_EXTENSIONS = {
+    '.srt': TaskType.SUBTITLE,
+    '.vtt': TaskType.SUBTITLE,
+    '.jpg': TaskType.THUMBNAIL,
+    '.jpeg': TaskType.THUMBNAIL,
+    '.png': TaskType.THUMBNAIL,
+    '.webp': TaskType.THUMBNAIL,
+    '.txt': TaskType.TRANSCRIPTION,
+    '.json': TaskType.TRANSCRIPTION,
+}
+
+# Eventos inotify que alteram o conteúdo de um diretório
+_INOTIFY_MASK_NAMES = ('CREATE', 'DELETE', 'MOVED_FROM', 'MOVED_TO', 'MODIFY', 'CLOSE_WRITE', 'DELETE_SELF')
+
+
+def classify_output(filename: str) -> str:
+    """
+    Categoria de um arquivo de saída
+
+    Usa o sufixo do nome ('vid_001_transcode.mp4', 'vid_001_legenda.srt')
+    e, na falta dele, a extensão.
+
+    Args:
+        filename: Nome do arquivo
+
+    Returns:
+        Nome do TaskType ou 'other'
+    """
+    stem, extension = os.path.splitext(filename)
+    suffix = stem.rsplit('_', 1)[-1].lower()
+    task_type = _OUTPUT_SUFFIXES.get(suffix) or _OUTPUT_EXTENSIONS.get(extension.lower())
+    return task_type.name if task_type else OTHER
+
+
+@dataclass
+class _DirEntry:
+    mtime_ns: int
+    sizes: Dict[str, int] = field(default_factory=dict)
+    # Arquivos com mais de um hard link: (dispositivo, inode, tamanho, categoria)
+    links: List[Tuple[int, int, int, str]] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+    # Arquivos escritos recentemente: nome -> (mtime_ns, tamanho, categoria)
+    recent: Dict[str, Tuple[int, int, str]] = field(default_factory=dict)
+
+
+class _InotifyWatcher:
+    """Marca diretórios alterados a partir de eventos inotify"""
+
+    def __init__(self):
+        import inotify_simple
+
+        self._flags = inotify_simple.flags
+        self._inotify = inotify_simple.INotify()
+        self._mask = 0
+        for name in _INOTIFY_MASK_NAMES:
+            self._mask |= getattr(self._flags, name)
+        self._paths: Dict[int, str] = {}
+        self._watched: Set[str] = set()
+        # Só confiável depois que todos os diretórios estão observados
+        self.reliable = False
+
+    def watch(self, paths: Iterable[str]):
+        for path in paths:
+            if path in self._watched:
+                continue
+            try:
+                wd = self._inotify.add_watch(path, self._mask)
+            except OSError:
+                continue
+            self._paths[wd] = path
+            self._watched.add(path)
+
+    def changed(self) -> Set[str]:
+        dirty = set()
+        for event in self._inotify.read(timeout=0):
+            if event.mask & self._flags.Q_OVERFLOW:
+                self.reliable = False
+                continue
+            path = self._paths.get(event.wd)
+            if path is None:
+                continue
+            dirty.add(path)
+            if event.mask & (self._flags.DELETE_SELF | self._flags.IGNORED):
+                self._paths.pop(event.wd, None)
+                self._watched.discard(path)
+        return dirty
+
+
+class StorageTracker:
+    """
+    Tamanhos por categoria dos diretórios de uploads e saídas, atualizados
+    de forma incremental
+
+    Args:
+        upload_dirs: Diretórios de uploads (categoria 'uploads')
+        output_dirs: Diretórios de saídas (categoria pelo TaskType)
+        state_file: JSON onde o cache por diretório é persistido
+        use_inotify: Usa inotify quando disponível
+        full_rescan_interval: Sem inotify, segundos entre releituras de
+                              todos os diretórios (None desativa)
+    """
+
+    def __init__(
+        self,
+        upload_dirs: Iterable[str] = (),
+        output_dirs: Iterable[str] = (),
+        state_file: Optional[str] = DEFAULT_STATE_FILE,
+        use_inotify: bool = True,
+        full_rescan_interval: Optional[float] = DEFAULT_FULL_RESCAN_INTERVAL
+    ):
+        self.roots: Dict[str, bool] = {os.path.abspath(d): False for d in upload_dirs}
+        self.roots.update({os.path.abspath(d): True for d in output_dirs})
+        self.state_file = state_file
+        self.full_rescan_interval = full_rescan_interval
+        self._dirs: Dict[str, _DirEntry] = {}
+        # Momento (time.time) da última releitura completa
+        self._full_scan_at = 0.0
+        self._load_state()
+
+        self._watcher: Optional[_InotifyWatcher] = None
+        if use_inotify:
+            try:
+                self._watcher = _InotifyWatcher()
+            except (ImportError, OSError):
+                self._watcher = None
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def _load_state(self):
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self._full_scan_at = data.get('full_scan_at', 0.0)
+        for path, entry in data.get('dirs', {}).items():
+            self._dirs[path] = _DirEntry(
+                mtime_ns=entry['mtime_ns'],
+                sizes=entry['sizes'],
+                links=[tuple(link) for link in entry['links']],
+                subdirs=entry['subdirs'],
+                recent={name: tuple(item) for name, item in entry.get('recent', {}).items()},
+            )
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            'full_scan_at': self._full_scan_at,
+            'dirs': {path: entry.__dict__ for path, entry in self._dirs.items()},
+        }
+        tmp_path = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_file)
+
+    # ------------------------------------------------------------------
+    # Atualização
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _scan(path: str, mtime_ns: int, is_output: bool) -> _DirEntry:
+        entry = _DirEntry(mtime_ns=mtime_ns)
+        recent_ns = time.time_ns() - RECENT_WRITE_SECONDS * 1_000_000_000
+        with os.scandir(path) as it:
+            for item in it:
+                try:
+                    if item.is_dir(follow_symlinks=False):
+                        entry.subdirs.append(item.name)
+                        continue
+                    if not item.is_file(follow_symlinks=False):
+                        continue
+                    stat = item.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                category = classify_output(item.name) if is_output else UPLOADS
+                if stat.st_nlink > 1:
+                    entry.links.append((stat.st_dev, stat.st_ino, stat.st_size, category))
+                else:
+                    entry.sizes[category] = entry.sizes.get(category, 0) + stat.st_size
+                    if stat.st_mtime_ns >= recent_ns:
+                        entry.recent[item.name] = (stat.st_mtime_ns, stat.st_size, category)
+        return entry
+
+    @staticmethod
+    def _restat_recent(path: str, entry: _DirEntry) -> bool:
+        # Confere o tamanho dos arquivos escritos recentemente; devolve se
+        # a entrada mudou
+        recent_ns = time.time_ns() - RECENT_WRITE_SECONDS * 1_000_000_000
+        changed = False
+        for name, (_, size, category) in list(entry.recent.items()):
+            try:
+                stat = os.stat(os.path.join(path, name), follow_symlinks=False)
+                new_mtime_ns, new_size = stat.st_mtime_ns, stat.st_size
+            except FileNotFoundError:
+                new_mtime_ns, new_size = 0, 0
+            if new_size != size:
+                entry.sizes[category] = entry.sizes.get(category, 0) + new_size - size
+                changed = True
+            if new_mtime_ns < recent_ns:
+                del entry.recent[name]
+                changed = True
+            else:
+                entry.recent[name] = (new_mtime_ns, new_size, category)
+        return changed
+
+    def refresh(self) -> int:
+        """
+        Atualiza o cache relendo apenas os diretórios alterados
+
+        Returns:
+            Número de diretórios relidos
+        """
+        dirty: Optional[Set[str]] = None
+        if self._watcher is not None:
+            changed = self._watcher.changed()
+            if self._watcher.reliable:
+                dirty = changed
+
+        full_scan = (
+            dirty is None
+            and self.full_rescan_interval is not None
+            and time.time() - self._full_scan_at >= self.full_rescan_interval
+        )
+        if full_scan:
+            self._full_scan_at = time.time()
+
+        rescanned = 0
+        grown = False
+        seen: Set[str] = set()
+        for root, is_output in self.roots.items():
+            stack = [root]
+            while stack:
+                path = stack.pop()
+                if path in seen:
+                    continue
+                cached = self._dirs.get(path)
+
+                if cached is not None and dirty is not None and path not in dirty:
+                    entry = cached
+                else:
+                    try:
+                        mtime_ns = os.stat(path).st_mtime_ns
+                    except FileNotFoundError:
+                        continue
+                    if cached is not None and cached.mtime_ns == mtime_ns and dirty is None and not full_scan:
+                        entry = cached
+                    else:
+                        try:
+                            entry = self._scan(path, mtime_ns, is_output)
+                        except (FileNotFoundError, NotADirectoryError):
+                            continue
+                        self._dirs[path] = entry
+                        rescanned += 1
+
+                if entry is cached and entry.recent:
+                    grown = self._restat_recent(path, entry) or grown
+
+                seen.add(path)
+                stack.extend(os.path.join(path, name) for name in entry.subdirs)
+
+        removed = set(self._dirs) - seen
+        for path in removed:
+            del self._dirs[path]
+
+        if self._watcher is not None:
+            self._watcher.watch(seen)
+            self._watcher.reliable = True
+        if rescanned or removed or grown:
+            self._save_state()
+        return rescanned
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def breakdown(self) -> Dict[str, int]:
+        """Bytes por categoria ('uploads', nome do TaskType, 'other')"""
+        totals: Dict[str, int] = {}
+        linked: Dict[Tuple[int, int], Tuple[int, str]] = {}
+        for entry in self._dirs.values():
+            for category, size in entry.sizes.items():
+                totals[category] = totals.get(category, 0) + size
+            for dev, ino, size, category in entry.links:
+                linked.setdefault((dev, ino), (size, category))
+        for size, category in linked.values():
+            totals[category] = totals.get(category, 0) + size
+        return totals
+
+    def total_bytes(self) -> int:
+        return sum(self.breakdown().values())
+
+    def total_gb(self) -> float:
+        return round(self.total_bytes() / GB, 2)
+
+    def snapshot(self, day: Optional[date] = None, history_path: Optional[str] = None) -> StorageSnapshot:
+        """
+        Grava no histórico o uso atual como registro do dia
+
+        Args:
+            day: Data do registro (padrão: hoje)
+            history_path: Arquivo do histórico
+
+        Returns:
+            Registro gravado
+        """
+        breakdown = self.breakdown()
+        snapshot = StorageSnapshot(
+            day=day or date.today(),
+            total_bytes=sum(breakdown.values()),
+            by_category=breakdown
+        )
+        append_storage_snapshot(snapshot, history_path)
+        return snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uso de armazenamento por categoria")
+    parser.add_argument('--uploads', action='append', default=[], help='Diretório de uploads')
+    parser.add_argument('--outputs', action='append', default=[], help='Diretório de saídas')
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE)
+    parser.add_argument('--history', default=None, help='Arquivo do histórico diário')
+    parser.add_argument('--snapshot', action='store_true', help='Grava o registro de hoje')
+    parser.add_argument('--watch', type=float, default=None, metavar='SEGUNDOS',
+                        help='Atualiza continuamente e grava um registro por dia')
+    args = parser.parse_args(argv)
+
+    tracker = StorageTracker(args.uploads, args.outputs, state_file=args.state_file)
+
+    def report(rescanned: int, elapsed: float):
+        print(f"{tracker.total_gb():.2f} GB ({rescanned} diretórios relidos em {elapsed * 1000:.0f} ms)")
+        for category, size in sorted(tracker.breakdown().items(), key=lambda kv: -kv[1]):
+            print(f"  {category:<14} {size / GB:10.2f} GB")
+
+    started = time.perf_counter()
+    rescanned = tracker.refresh()
+    report(rescanned, time.perf_counter() - started)
+
+    if args.snapshot:
+        tracker.snapshot(history_path=args.history)
+
+    if args.watch is None:
+        return
+
+    history = load_storage_history(args.history)
+    last_day = history[-1].day if history else None
+    while True:
+        if last_day != date.today():
+            last_day = tracker.snapshot(history_path=args.history).day
+        time.sleep(args.watch)
+        started = time.perf_counter()
+        rescanned = tracker.refresh()
+        if rescanned:
+            report(rescanned, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
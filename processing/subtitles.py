@@ -0,0 +1,434 @@
+"""
+Legendas SRT/WebVTT (TaskType.SUBTITLE)
+
+- Geração em streaming a partir de segmentos de transcrição, respeitando
+  caracteres por linha, linhas por legenda e velocidade de leitura.
+- Leitura em uma única passada, linha a linha, sem carregar o arquivo.
+- Índice de intervalos para "legenda no tempo t" em O(log n + k) e
+  deslocamento em bloco quando um CUT altera a linha do tempo.
+
+Uso:
+    python -m processing.subtitles build transcript.json saida.srt
+    python -m processing.subtitles cut entrada.srt saida.vtt --start 120 --end 185.5
+"""
+import argparse
+import json
+import re
+from dataclasses import dataclass, field
+from typing import IO, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from dashboard.data.schemas import TranscriptSegment
+
+SRT = 'srt'
+VTT = 'vtt'
+
+_TIME_RE = r'(?:(\d+):)?(\d{1,2}):(\d{2})[,.](\d{1,3})'
+_CUE_TIMING_RE = re.compile(rf'^\s*{_TIME_RE}\s*-->\s*{_TIME_RE}')
+
+
+@dataclass
+class Cue:
+    """Uma legenda: intervalo em segundos e linhas de texto"""
+    start: float
+    end: float
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+
+@dataclass
+class SubtitleRules:
+    """Regras de legibilidade usadas na geração"""
+    max_chars_per_line: int = 42
+    max_lines: int = 2
+    max_chars_per_second: float = 17.0
+    min_duration: float = 1.0
+    max_duration: float = 7.0
+
+
+# ---------------------------------------------------------------------------
+# Formatação de tempo
+# ---------------------------------------------------------------------------
+
+def format_time(seconds: float, fmt: str = SRT) -> str:
+    """
+    Formata segundos no padrão do formato
+
+    Args:
+        seconds: Tempo em segundos
+        fmt: 'srt' (HH:MM:SS,mmm) ou 'vtt' (HH:MM:SS.mmm)
+
+    Returns:
+        Timestamp formatado
+    """
+    millis = int(round(max(0.0, seconds) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    separator = ',' if fmt == SRT else '.'
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _parse_time(hours: Optional[str], minutes: str, seconds: str, fraction: str) -> float:
+    return (
+        int(hours or 0) * 3600
+        + int(minutes) * 60
+        + int(seconds)
+        + int(fraction.ljust(3, '0')) / 1000
+    )
+
+
+# ---------------------------------------------------------------------------
+# Geração
+# ---------------------------------------------------------------------------
+
+def wrap_words(text: str, max_chars: int) -> List[str]:
+    """Quebra o texto em linhas de até max_chars (palavras longas ficam sozinhas)"""
+    lines: List[str] = []
+    current = ''
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if len(candidate) <= max_chars or not current:
+            current = candidate
+        else:
+            lines.append(current)
+            current = word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def build_cues(
+    segments: Iterable[TranscriptSegment],
+    rules: Optional[SubtitleRules] = None
+) -> Iterator[Cue]:
+    """
+    Converte segmentos de transcrição em legendas, de forma preguiçosa
+
+    Cada segmento é quebrado em linhas e agrupado em legendas de até
+    `max_lines` linhas. O tempo do segmento é dividido entre as legendas
+    proporcionalmente aos caracteres; legendas acima da velocidade de
+    leitura são estendidas até o início do próximo segmento, quando
+    possível.
+
+    Args:
+        segments: Segmentos ordenados por início
+        rules: Regras de legibilidade
+
+    Yields:
+        Legendas em ordem
+    """
+    rules = rules or SubtitleRules()
+    iterator = iter(segments)
+    current = next(iterator, None)
+
+    while current is not None:
+        following = next(iterator, None)
+        next_start = following.start if following is not None else None
+
+        lines = wrap_words(current.text, rules.max_chars_per_line)
+        groups = [lines[i:i + rules.max_lines] for i in range(0, len(lines), rules.max_lines)]
+        total_chars = sum(len(' '.join(g)) for g in groups) or 1
+        span = max(current.end - current.start, 0.0)
+
+        t = current.start
+        for position, group in enumerate(groups):
+            chars = len(' '.join(group))
+            duration = span * chars / total_chars
+            reading = chars / rules.max_chars_per_second
+            is_last = position == len(groups) - 1
+
+            if is_last and duration < reading:
+                limit = next_start if next_start is not None else t + reading
+                duration = max(duration, min(reading, limit - t))
+
+            duration = min(max(duration, rules.min_duration), rules.max_duration)
+            end = t + duration
+            if is_last and next_start is not None:
+                end = min(end, next_start)
+
+            yield Cue(start=t, end=max(end, t + 0.001), lines=group)
+            t = end
+
+        current = following
+
+
+def write_cues(cues: Iterable[Cue], fp: IO[str], fmt: str = SRT) -> int:
+    """
+    Escreve legendas em SRT ou WebVTT à medida que são produzidas
+
+    Args:
+        cues: Legendas (pode ser um gerador)
+        fp: Arquivo texto aberto para escrita
+        fmt: 'srt' ou 'vtt'
+
+    Returns:
+        Número de legendas escritas
+    """
+    if fmt not in (SRT, VTT):
+        raise ValueError(f"Formato de legenda desconhecido: {fmt}")
+
+    if fmt == VTT:
+        fp.write("WEBVTT\n\n")
+
+    count = 0
+    for count, cue in enumerate(cues, start=1):
+        if fmt == SRT:
+            fp.write(f"{count}\n")
+        fp.write(f"{format_time(cue.start, fmt)} --> {format_time(cue.end, fmt)}\n")
+        fp.write(cue.text)
+        fp.write("\n\n")
+    return count
+
+
+def write_subtitles(
+    segments: Iterable[TranscriptSegment],
+    path: str,
+    fmt: Optional[str] = None,
+    rules: Optional[SubtitleRules] = None
+) -> int:
+    """
+    Gera um arquivo de legendas a partir de segmentos de transcrição
+
+    Args:
+        segments: Segmentos ordenados por início
+        path: Arquivo de saída (.srt ou .vtt)
+        fmt: Formato; padrão pela extensão do arquivo
+        rules: Regras de legibilidade
+
+    Returns:
+        Número de legendas escritas
+    """
+    fmt = fmt or (VTT if path.lower().endswith('.vtt') else SRT)
+    with open(path, 'w', encoding='utf-8') as fp:
+        return write_cues(build_cues(segments, rules), fp, fmt)
+
+
+# ---------------------------------------------------------------------------
+# Leitura
+# ---------------------------------------------------------------------------
+
+def iter_cues(fp: IO[str]) -> Iterator[Cue]:
+    """
+    Lê legendas SRT ou WebVTT em uma passada, linha a linha
+
+    Números de sequência, cabeçalho WEBVTT, blocos NOTE/STYLE/REGION e
+    configurações após o timestamp são ignorados.
+
+    Args:
+        fp: Arquivo texto aberto para leitura
+
+    Yields:
+        Legendas na ordem do arquivo
+    """
+    cue: Optional[Cue] = None
+    skipping_block = False
+
+    for raw in fp:
+        line = raw.rstrip('\r\n').lstrip('﻿')
+
+        if not line.strip():
+            if cue is not None:
+                yield cue
+                cue = None
+            skipping_block = False
+            continue
+
+        if skipping_block:
+            continue
+
+        if cue is None:
+            match = _CUE_TIMING_RE.match(line)
+            if match:
+                groups = match.groups()
+                cue = Cue(start=_parse_time(*groups[:4]), end=_parse_time(*groups[4:]))
+            elif line.startswith(('NOTE', 'STYLE', 'REGION')):
+                skipping_block = True
+            # Demais linhas fora de uma legenda: cabeçalho, índice ou identificador
+            continue
+
+        cue.lines.append(line)
+
+    if cue is not None:
+        yield cue
+
+
+def read_subtitles(path: str) -> Iterator[Cue]:
+    """Itera sobre as legendas de um arquivo .srt/.vtt"""
+    with open(path, encoding='utf-8-sig') as fp:
+        yield from iter_cues(fp)
+
+
+# ---------------------------------------------------------------------------
+# Índice de intervalos
+# ---------------------------------------------------------------------------
+
+class CueIndex:
+    """
+    Índice estático de legendas ordenadas por início
+
+    Uma árvore de segmentos com o maior fim de cada faixa permite
+    encontrar todas as legendas ativas em t (inclusive sobrepostas) em
+    O(log n + k). Deslocamentos de tempo são aplicados em bloco sobre os
+    arrays numpy e a árvore é reconstruída de forma vetorizada.
+    """
+
+    def __init__(self, cues: Iterable[Cue]):
+        ordered = sorted(cues, key=lambda c: (c.start, c.end))
+        self._lines = [c.lines for c in ordered]
+        self.starts = np.fromiter((c.start for c in ordered), dtype=np.float64, count=len(ordered))
+        self.ends = np.fromiter((c.end for c in ordered), dtype=np.float64, count=len(ordered))
+        self._build_tree()
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def _build_tree(self):
+        n = len(self._lines)
+        size = 1
+        while size < max(n, 1):
+            size *= 2
+        tree = np.full(2 * size, -np.inf)
+        tree[size:size + n] = self.ends
+        level_start = size
+        while level_start > 1:
+            parents = np.arange(level_start // 2, level_start)
+            tree[parents] = np.maximum(tree[2 * parents], tree[2 * parents + 1])
+            level_start //= 2
+        self._size = size
+        self._tree = tree
+
+    def cue(self, i: int) -> Cue:
+        return Cue(start=float(self.starts[i]), end=float(self.ends[i]), lines=list(self._lines[i]))
+
+    def __iter__(self) -> Iterator[Cue]:
+        return (self.cue(i) for i in range(len(self)))
+
+    def at(self, t: float) -> List[Cue]:
+        """
+        Legendas ativas no instante t (start <= t < end)
+
+        Args:
+            t: Tempo em segundos
+
+        Returns:
+            Legendas ativas, ordenadas por início
+        """
+        limit = int(np.searchsorted(self.starts, t, side='right'))
+        if limit == 0:
+            return []
+
+        found = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or self._tree[node] <= t:
+                continue
+            if high - low == 1:
+                found.append(low)
+                continue
+            mid = (low + high) // 2
+            stack.append((2 * node + 1, mid, high))
+            stack.append((2 * node, low, mid))
+
+        return [self.cue(i) for i in sorted(found)]
+
+    def shift(self, delta: float, after: float = 0.0):
+        """
+        Desloca em bloco todas as legendas que começam em ou após `after`
+
+        Args:
+            delta: Deslocamento em segundos (negativo adianta)
+            after: Tempo a partir do qual deslocar
+        """
+        first = int(np.searchsorted(self.starts, after, side='left'))
+        self.starts[first:] += delta
+        self.ends[first:] += delta
+        np.maximum(self.starts, 0.0, out=self.starts)
+        np.maximum(self.ends, self.starts, out=self.ends)
+        if delta < 0 and first > 0:
+            # Legendas adiantadas podem passar à frente das não deslocadas
+            self._sort()
+        self._build_tree()
+
+    def _sort(self):
+        order = np.lexsort((self.ends, self.starts))
+        if np.any(order[1:] < order[:-1]):
+            self.starts = self.starts[order]
+            self.ends = self.ends[order]
+            self._lines = [self._lines[i] for i in order]
+
+    def apply_cut(self, cut_start: float, cut_end: float):
+        """
+        Ajusta as legendas após a remoção do trecho [cut_start, cut_end)
+
+        Legendas inteiramente no trecho são removidas, as que o cruzam são
+        aparadas e as posteriores são adiantadas pela duração do corte.
+
+        Args:
+            cut_start: Início do trecho removido (s)
+            cut_end: Fim do trecho removido (s)
+        """
+        if cut_end <= cut_start:
+            return
+        removed = cut_end - cut_start
+
+        starts, ends = self.starts, self.ends
+        keep = ~((starts >= cut_start) & (ends <= cut_end))
+
+        new_starts = np.where(starts >= cut_end, starts - removed,
+                              np.where(starts > cut_start, cut_start, starts))
+        new_ends = np.where(ends >= cut_end, ends - removed,
+                            np.where(ends > cut_start, cut_start, ends))
+        keep &= new_ends > new_starts
+
+        self.starts = new_starts[keep]
+        self.ends = new_ends[keep]
+        self._lines = [lines for lines, kept in zip(self._lines, keep) if kept]
+        self._build_tree()
+
+    @classmethod
+    def from_file(cls, path: str) -> 'CueIndex':
+        return cls(read_subtitles(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Legendas SRT/WebVTT")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='Gera legendas a partir de uma transcrição JSON')
+    build.add_argument('transcript', help='JSON de processing.transcription --json')
+    build.add_argument('output', help='Arquivo .srt ou .vtt')
+    build.add_argument('--max-chars', type=int, default=42)
+    build.add_argument('--max-cps', type=float, default=17.0)
+
+    cut = sub.add_parser('cut', help='Ajusta legendas após remover um trecho do vídeo')
+    cut.add_argument('input')
+    cut.add_argument('output')
+    cut.add_argument('--start', type=float, required=True)
+    cut.add_argument('--end', type=float, required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        with open(args.transcript, encoding='utf-8') as f:
+            data = json.load(f)
+        segments = (TranscriptSegment(**s) for s in data['segments'])
+        rules = SubtitleRules(max_chars_per_line=args.max_chars, max_chars_per_second=args.max_cps)
+        count = write_subtitles(segments, args.output, rules=rules)
+    else:
+        index = CueIndex.from_file(args.input)
+        index.apply_cut(args.start, args.end)
+        fmt = VTT if args.output.lower().endswith('.vtt') else SRT
+        with open(args.output, 'w', encoding='utf-8') as fp:
+            count = write_cues(index, fp, fmt)
+
+    print(f"{count} legendas escritas em {args.output}")
+
+
+if __name__ == '__main__':
+    main()
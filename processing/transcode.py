@@ -0,0 +1,275 @@
+"""
+Transcodificação em segmentos paralelos (TaskType.TRANSCODE / COMPRESS)
+
+Um único ffmpeg não ocupa todos os núcleos de uma máquina grande em um
+arquivo 4K de 2 horas. Aqui o vídeo é dividido em keyframes da origem
+(o seek de entrada é exato nesses pontos), cada segmento é codificado por
+um processo ffmpeg próprio e os segmentos são unidos sem recodificação
+pelo demuxer concat. O áudio é codificado uma vez, inteiro, em paralelo
+com os segmentos, para evitar lacunas de priming do codec nas junções.
+
+Com as mesmas opções, a saída equivale à de uma passada única: mesmos
+quadros e qualidade (CRF), com um keyframe extra em cada junção.
+
+Com uma tarefa e um `CheckpointStore`, os segmentos concluídos ficam no
+checkpoint e uma nova tentativa só codifica os que faltam.
+
+Com `--cache`, a saída é reaproveitada do `OutputCache` quando a mesma
+entrada já foi codificada com as mesmas opções.
+
+Uso:
+    python -m processing.transcode entrada.mp4 saida.mp4 --segments 8
+    python -m processing.transcode entrada.mp4 saida.mp4 --task-type COMPRESS
+    python -m processing.transcode entrada.mp4 saida.mp4 --cache .cache/outputs
+"""
+import argparse
+import os
+import shutil
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from dashboard.data.schemas import Task, TaskType
+
+from . import ffmpeg
+from .jobs import CheckpointStore, run_segments
+
+# Segmentos mais curtos que isso não compensam o custo de iniciar o ffmpeg
+MIN_SEGMENT_SECONDS = 10.0
+
+
+@dataclass
+class TranscodeOptions:
+    """Parâmetros de codificação"""
+    video_codec: str = 'libx264'
+    crf: int = 23
+    preset: str = 'medium'
+    pixel_format: str = 'yuv420p'
+    audio_codec: str = 'aac'
+    audio_bitrate: str = '128k'
+    extra_video_args: List[str] = field(default_factory=list)
+
+    def video_args(self) -> List[str]:
+        return [
+            '-c:v', self.video_codec, '-crf', str(self.crf), '-preset', self.preset,
+            '-pix_fmt', self.pixel_format, *self.extra_video_args
+        ]
+
+    def audio_args(self) -> List[str]:
+        return ['-c:a', self.audio_codec, '-b:a', self.audio_bitrate]
+
+
+PRESETS: Dict[TaskType, TranscodeOptions] = {
+    TaskType.TRANSCODE: TranscodeOptions(),
+    TaskType.COMPRESS: TranscodeOptions(crf=28, preset='slow', audio_bitrate='96k'),
+}
+
+
+def keyframe_times(source_path: str) -> List[float]:
+    """
+    Instantes dos keyframes do primeiro stream de vídeo
+
+    Lê apenas os pacotes (sem decodificar), pela flag K.
+
+    Args:
+        source_path: Arquivo de vídeo
+
+    Returns:
+        Tempos em segundos, em ordem
+    """
+    result = ffmpeg.run(
+        ['-v', 'error', '-select_streams', 'v:0', '-show_entries', 'packet=pts_time,flags',
+         '-of', 'csv=p=0', source_path],
+        binary=ffmpeg.FFPROBE_BIN
+    )
+    times = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(',')
+        if 'K' in flags and pts not in ('', 'N/A'):
+            times.append(float(pts))
+    return sorted(set(times))
+
+
+def plan_segments(
+    keyframes: List[float],
+    duration: float,
+    count: int,
+    min_seconds: float = MIN_SEGMENT_SECONDS
+) -> List[Tuple[float, float]]:
+    """
+    Divide o vídeo em até `count` segmentos iniciando em keyframes
+
+    Cada corte é o keyframe mais próximo de uma divisão em partes iguais.
+
+    Args:
+        keyframes: Tempos dos keyframes
+        duration: Duração total em segundos
+        count: Número desejado de segmentos
+        min_seconds: Duração mínima de um segmento
+
+    Returns:
+        Intervalos (início, fim) contíguos cobrindo [0, duration]
+    """
+    cuts = []
+    for k in range(1, count):
+        target = duration * k / count
+        i = bisect_left(keyframes, target)
+        nearby = [keyframes[j] for j in (i - 1, i) if 0 <= j < len(keyframes)]
+        if not nearby:
+            continue
+        cut = min(nearby, key=lambda t: abs(t - target))
+        previous = cuts[-1] if cuts else 0.0
+        if cut - previous >= min_seconds and duration - cut >= min_seconds:
+            cuts.append(cut)
+
+    bounds = [0.0, *cuts, duration]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _encode_segment(source_path: str, start: float, end: float, output_path: str,
+                    options: TranscodeOptions, threads: int):
+    args = ['-y', '-v', 'error']
+    if start > 0:
+        args += ['-ss', f'{start:.6f}']
+    args += ['-i', source_path, '-t', f'{end - start:.6f}',
+             '-map', '0:v:0', '-an', '-sn', '-dn',
+             *options.video_args(), '-threads', str(threads), output_path]
+    ffmpeg.run(args)
+
+
+def _encode_audio(source_path: str, output_path: str, options: TranscodeOptions):
+    ffmpeg.run(['-y', '-v', 'error', '-i', source_path, '-map', '0:a:0', '-vn',
+                *options.audio_args(), output_path])
+
+
+def _concat(segment_paths: List[str], audio_path: Optional[str], output_path: str, workdir: str):
+    list_path = os.path.join(workdir, 'segments.txt')
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", r"'\''")
+            f.write(f"file '{escaped}'\n")
+
+    args = ['-y', '-v', 'error', '-f', 'concat', '-safe', '0', '-i', list_path]
+    if audio_path:
+        args += ['-i', audio_path, '-map', '0:v:0', '-map', '1:a:0']
+    args += ['-c', 'copy']
+    if output_path.lower().endswith(('.mp4', '.mov', '.m4v')):
+        args += ['-movflags', '+faststart']
+    ffmpeg.run(args + [output_path])
+
+
+def transcode(
+    source_path: str,
+    output_path: str,
+    options: Optional[TranscodeOptions] = None,
+    segments: Optional[int] = None,
+    workers: Optional[int] = None,
+    workdir: Optional[str] = None,
+    task: Optional[Task] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+    keep_workdir: bool = False
+) -> str:
+    """
+    Transcodifica um vídeo em segmentos paralelos
+
+    Args:
+        source_path: Arquivo de origem
+        output_path: Arquivo de saída
+        options: Parâmetros de codificação (padrão: PRESETS[TRANSCODE])
+        segments: Número de segmentos (padrão: número de CPUs; 1 = passada única)
+        workers: Processos ffmpeg simultâneos (padrão: número de segmentos)
+        workdir: Diretório dos segmentos (padrão: '<saída>.parts')
+        task: Tarefa cujo progresso é atualizado e checkpointado
+        checkpoints: Onde gravar os segmentos concluídos
+        keep_workdir: Mantém os segmentos após a junção
+
+    Returns:
+        output_path
+    """
+    options = options or PRESETS[TaskType.TRANSCODE]
+    cpus = os.cpu_count() or 1
+    info = ffmpeg.probe(source_path)
+    duration = float(info['format']['duration'])
+    has_audio = ffmpeg.first_stream(info, 'audio') is not None
+
+    count = segments or cpus
+    plan = plan_segments(keyframe_times(source_path), duration, count) if count > 1 else [(0.0, duration)]
+
+    if len(plan) == 1:
+        args = ['-y', '-v', 'error', '-i', source_path, '-map', '0:v:0']
+        if has_audio:
+            args += ['-map', '0:a:0', *options.audio_args()]
+        ffmpeg.run(args + [*options.video_args(), output_path])
+        if task is not None:
+            task.progress = 100
+        return output_path
+
+    workdir = workdir or f"{output_path}.parts"
+    os.makedirs(workdir, exist_ok=True)
+    workers = workers or len(plan)
+    threads = max(1, cpus // min(workers, len(plan)))
+
+    def encode(index: int) -> str:
+        path = os.path.join(workdir, f"segment_{index:04d}.mkv")
+        start, end = plan[index]
+        _encode_segment(source_path, start, end, path, options, threads)
+        return path
+
+    audio_path = os.path.join(workdir, 'audio.mka') if has_audio else None
+    with ThreadPoolExecutor(max_workers=1) as audio_pool:
+        audio_future = audio_pool.submit(_encode_audio, source_path, audio_path, options) if has_audio else None
+        segment_paths = run_segments(task, len(plan), encode, checkpoints, workers)
+        if audio_future is not None:
+            audio_future.result()
+
+    _concat(segment_paths, audio_path, output_path, workdir)
+    if not keep_workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if task is not None:
+        task.progress = 100
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcodificação em segmentos paralelos")
+    parser.add_argument('source')
+    parser.add_argument('output')
+    parser.add_argument('--segments', type=int, default=None,
+                        help='Número de segmentos (padrão: CPUs; 1 = passada única)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--task-type', choices=[t.name for t in PRESETS], default='TRANSCODE')
+    parser.add_argument('--codec', default=None, help='Codec de vídeo (ex.: libx265)')
+    parser.add_argument('--crf', type=int, default=None)
+    parser.add_argument('--preset', default=None)
+    parser.add_argument('--cache', default=None, metavar='DIR', help='Diretório do cache de saídas')
+    args = parser.parse_args(argv)
+
+    options = PRESETS[TaskType[args.task_type]]
+    overrides = {
+        name: value for name, value in
+        (('video_codec', args.codec), ('crf', args.crf), ('preset', args.preset))
+        if value is not None
+    }
+    options = replace(options, **overrides)
+
+    if args.cache is None:
+        transcode(args.source, args.output, options, args.segments, args.workers)
+        print(f"Saída gravada em {args.output}")
+        return
+
+    from .output_cache import OutputCache
+
+    cache = OutputCache(args.cache)
+    try:
+        _, cached = cache.get_or_run(
+            args.source, TaskType[args.task_type], asdict(options), args.output,
+            lambda path: transcode(args.source, path, options, args.segments, args.workers)
+        )
+    finally:
+        cache.close()
+    print(f"Saída {'reaproveitada do cache' if cached else 'gravada'} em {args.output}")
+
+
+if __name__ == '__main__':
+    main()
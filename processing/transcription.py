@@ -0,0 +1,481 @@
+"""
+Transcrição em paralelo por trechos (TaskType.TRANSCRIPTION)
+
+O áudio é dividido em trechos nos silêncios detectados pelo ffmpeg, cada
+trecho é transcrito em um pool de processos por um motor de fala
+plugável e os resultados são costurados, em ordem, em uma transcrição com
+timestamps. Um trecho que falha é reenviado sozinho, sem refazer o
+arquivo inteiro.
+
+Com `--cache` (e `--json`), a transcrição é reaproveitada do `OutputCache`
+quando o mesmo arquivo já foi transcrito com o mesmo motor e trechos.
+
+Uso:
+    python -m processing.transcription episodio.mp4 --engine faster-whisper --workers 8
+    python -m processing.transcription episodio.mp4 --json episodio.json --cache .cache/outputs
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import random
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from dashboard.data.schemas import TaskType, TranscriptSegment
+from dashboard.data.transcripts import format_timestamp
+
+from . import ffmpeg
+
+_SILENCE_RE = re.compile(r'silence_(start|end): (-?[\d.]+)')
+
+
+@dataclass
+class AudioChunk:
+    """Trecho do áudio a transcrever"""
+    index: int
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class Transcript:
+    """Transcrição completa de um arquivo"""
+    source: str
+    segments: List[TranscriptSegment]
+    engine: str = ''
+
+    @property
+    def text(self) -> str:
+        return ' '.join(s.text for s in self.segments)
+
+    def to_text(self) -> str:
+        """Texto com um timestamp [HH:MM:SS] por segmento"""
+        return '\n'.join(f"[{format_timestamp(s.start)}] {s.text}" for s in self.segments)
+
+    def to_dict(self) -> dict:
+        return {
+            'source': self.source,
+            'engine': self.engine,
+            'segments': [asdict(s) for s in self.segments]
+        }
+
+
+class TranscriptionError(RuntimeError):
+    """Trechos que falharam mesmo após as novas tentativas"""
+
+    def __init__(self, failed: Dict[int, str], partial: Transcript):
+        self.failed = failed
+        self.partial = partial
+        super().__init__(f"{len(failed)} trecho(s) falharam: {sorted(failed)}")
+
+
+# ---------------------------------------------------------------------------
+# Divisão em trechos
+# ---------------------------------------------------------------------------
+
+def detect_silences(
+    path: str,
+    noise_db: float = -35.0,
+    min_silence: float = 0.5
+) -> List[Tuple[float, float]]:
+    """
+    Detecta intervalos de silêncio com o filtro silencedetect do ffmpeg
+
+    Args:
+        path: Arquivo de áudio/vídeo
+        noise_db: Nível abaixo do qual o áudio é considerado silêncio
+        min_silence: Duração mínima do silêncio em segundos
+
+    Returns:
+        Lista de (início, fim) em segundos
+    """
+    result = ffmpeg.run([
+        '-nostats', '-i', path, '-vn',
+        '-af', f'silencedetect=noise={noise_db}dB:d={min_silence}',
+        '-f', 'null', '-'
+    ])
+
+    silences = []
+    start = None
+    for kind, value in _SILENCE_RE.findall(result.stderr):
+        if kind == 'start':
+            start = max(0.0, float(value))
+        elif start is not None:
+            silences.append((start, float(value)))
+            start = None
+    return silences
+
+
+def plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    target_seconds: float = 300.0,
+    max_seconds: float = 480.0,
+    min_seconds: float = 30.0
+) -> List[AudioChunk]:
+    """
+    Define os trechos cortando no meio dos silêncios
+
+    Cada corte é o ponto médio de silêncio mais próximo de `target_seconds`
+    após o corte anterior, dentro de [min_seconds, max_seconds]. Sem
+    silêncio na janela, corta em `target_seconds`.
+
+    Args:
+        duration: Duração total em segundos
+        silences: Intervalos de silêncio (início, fim)
+        target_seconds: Duração desejada de cada trecho
+        max_seconds: Duração máxima de um trecho
+        min_seconds: Duração mínima de um trecho
+
+    Returns:
+        Trechos contíguos cobrindo [0, duration]
+    """
+    cut_points = sorted((s + e) / 2 for s, e in silences)
+    chunks = []
+    cursor = 0.0
+
+    while duration - cursor > max_seconds:
+        low, high = cursor + min_seconds, cursor + max_seconds
+        target = cursor + target_seconds
+        candidates = [p for p in cut_points if low <= p <= high]
+        cut = min(candidates, key=lambda p: abs(p - target)) if candidates else target
+        chunks.append(AudioChunk(index=len(chunks), start=cursor, end=cut))
+        cursor = cut
+
+    if duration > cursor:
+        chunks.append(AudioChunk(index=len(chunks), start=cursor, end=duration))
+    return chunks
+
+
+def extract_audio(source_path: str, output_path: str, start: float, end: float,
+                  sample_rate: int = 16000):
+    """Extrai um trecho como WAV mono PCM 16 bits"""
+    ffmpeg.run([
+        '-y', '-ss', f'{start:.3f}', '-t', f'{end - start:.3f}', '-i', source_path,
+        '-vn', '-ac', '1', '-ar', str(sample_rate), '-c:a', 'pcm_s16le', output_path
+    ])
+
+
+# ---------------------------------------------------------------------------
+# Motores de fala
+# ---------------------------------------------------------------------------
+
+class SpeechEngine(ABC):
+    """Interface de um motor de reconhecimento de fala"""
+
+    name = ''
+
+    @abstractmethod
+    def transcribe(self, source_path: str, start: float, end: float) -> List[TranscriptSegment]:
+        """
+        Transcreve um trecho do arquivo
+
+        Args:
+            source_path: Arquivo de origem
+            start: Início do trecho em segundos
+            end: Fim do trecho em segundos
+
+        Returns:
+            Segmentos com tempos absolutos (desde o início do arquivo)
+        """
+
+
+class StubEngine(SpeechEngine):
+    """
+    Motor determinístico para testes e benchmarks: não lê o áudio e gera o
+    mesmo texto para o mesmo trecho
+    """
+
+    name = 'stub'
+
+    WORDS = [
+        'marketing', 'conteúdo', 'vídeo', 'podcast', 'audiência', 'campanha',
+        'engajamento', 'roteiro', 'corte', 'legenda', 'estratégia', 'público',
+        'dados', 'criativo', 'canal', 'episódio', 'convidado', 'ideia'
+    ]
+
+    def __init__(self, segment_seconds: float = 5.0, words_per_segment: int = 12):
+        self.segment_seconds = segment_seconds
+        self.words_per_segment = words_per_segment
+
+    def transcribe(self, source_path: str, start: float, end: float) -> List[TranscriptSegment]:
+        seed = hashlib.sha1(f"{os.path.basename(source_path)}:{start:.3f}:{end:.3f}".encode()).hexdigest()
+        rng = random.Random(seed)
+
+        segments = []
+        t = start
+        while t < end:
+            seg_end = min(end, t + self.segment_seconds)
+            words = rng.choices(self.WORDS, k=self.words_per_segment)
+            segments.append(TranscriptSegment(start=t, end=seg_end, text=' '.join(words).capitalize() + '.'))
+            t = seg_end
+        return segments
+
+
+class FasterWhisperEngine(SpeechEngine):
+    """Motor local baseado em faster-whisper (dependência opcional)"""
+
+    name = 'faster-whisper'
+
+    def __init__(self, model: str = 'small', device: str = 'cpu',
+                 compute_type: str = 'int8', language: Optional[str] = 'pt'):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as exc:
+            raise ImportError("Instale faster-whisper para usar este motor: pip install faster-whisper") from exc
+
+        self.language = language
+        self.model = WhisperModel(model, device=device, compute_type=compute_type, cpu_threads=1)
+
+    def transcribe(self, source_path: str, start: float, end: float) -> List[TranscriptSegment]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            wav_path = os.path.join(tmp_dir, 'chunk.wav')
+            extract_audio(source_path, wav_path, start, end)
+            segments, _ = self.model.transcribe(wav_path, language=self.language)
+            return [
+                TranscriptSegment(start=start + s.start, end=min(end, start + s.end), text=s.text.strip())
+                for s in segments
+            ]
+
+
+ENGINES: Dict[str, Type[SpeechEngine]] = {
+    StubEngine.name: StubEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+}
+
+
+def register_engine(engine_cls: Type[SpeechEngine]):
+    """Registra um motor de fala pelo atributo `name`"""
+    ENGINES[engine_cls.name] = engine_cls
+    return engine_cls
+
+
+def create_engine(name: str, options: Optional[dict] = None) -> SpeechEngine:
+    """
+    Instancia um motor registrado
+
+    Além dos nomes em ENGINES aceita 'pacote.modulo:Classe', que funciona
+    também em workers iniciados por spawn (onde registros feitos em tempo
+    de execução no processo principal não existem).
+    """
+    if name not in ENGINES and ':' in name:
+        module_name, class_name = name.split(':', 1)
+        engine_cls = getattr(importlib.import_module(module_name), class_name)
+        return engine_cls(**(options or {}))
+    if name not in ENGINES:
+        raise ValueError(f"Motor desconhecido: {name}. Disponíveis: {', '.join(sorted(ENGINES))}")
+    return ENGINES[name](**(options or {}))
+
+
+# ---------------------------------------------------------------------------
+# Execução em pool de processos
+# ---------------------------------------------------------------------------
+
+# Motor do processo worker, criado uma única vez no initializer
+_worker_engine: Optional[SpeechEngine] = None
+
+
+def _init_worker(engine_name: str, engine_options: Optional[dict]):
+    global _worker_engine
+    _worker_engine = create_engine(engine_name, engine_options)
+
+
+def _transcribe_chunk(source_path: str, chunk: AudioChunk) -> List[TranscriptSegment]:
+    segments = _worker_engine.transcribe(source_path, chunk.start, chunk.end)
+    return sorted(
+        (s for s in segments if s.start < chunk.end),
+        key=lambda s: s.start
+    )
+
+
+@dataclass
+class _ChunkState:
+    chunk: AudioChunk
+    attempts: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def transcribe(
+    source_path: str,
+    engine: str = StubEngine.name,
+    engine_options: Optional[dict] = None,
+    workers: Optional[int] = None,
+    target_chunk_seconds: float = 300.0,
+    max_retries: int = 2,
+    duration: Optional[float] = None,
+    silences: Optional[List[Tuple[float, float]]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> Transcript:
+    """
+    Transcreve um arquivo dividindo-o em trechos processados em paralelo
+
+    Args:
+        source_path: Arquivo de áudio/vídeo
+        engine: Nome do motor registrado em ENGINES
+        engine_options: Argumentos do construtor do motor
+        workers: Processos do pool (padrão: os.cpu_count()). 0 executa no
+                 processo atual, útil para depuração
+        target_chunk_seconds: Duração desejada dos trechos
+        max_retries: Novas tentativas por trecho antes de desistir
+        duration: Duração em segundos (padrão: lida com ffprobe)
+        silences: Silêncios já detectados (padrão: detect_silences)
+        on_progress: Callback (trechos concluídos, total)
+
+    Returns:
+        Transcript com os segmentos em ordem
+
+    Raises:
+        TranscriptionError: se algum trecho falhar após max_retries
+    """
+    if duration is None:
+        duration = ffmpeg.probe_duration(source_path)
+    if silences is None:
+        silences = detect_silences(source_path)
+
+    chunks = plan_chunks(
+        duration,
+        silences,
+        target_seconds=target_chunk_seconds,
+        max_seconds=target_chunk_seconds * 1.6,
+        min_seconds=min(30.0, target_chunk_seconds / 2)
+    )
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def create_executor() -> Executor:
+        if workers == 0:
+            return ThreadPoolExecutor(max_workers=1, initializer=_init_worker,
+                                      initargs=(engine, engine_options))
+        return ProcessPoolExecutor(max_workers=min(workers, len(chunks)) or 1,
+                                   initializer=_init_worker,
+                                   initargs=(engine, engine_options))
+
+    results: Dict[int, List[TranscriptSegment]] = {}
+    failed: Dict[int, str] = {}
+    executor = create_executor()
+
+    try:
+        pending: Dict[Future, _ChunkState] = {}
+
+        def submit(state: _ChunkState):
+            nonlocal executor
+            state.attempts += 1
+            try:
+                future = executor.submit(_transcribe_chunk, source_path, state.chunk)
+            except BrokenExecutor:
+                # Um worker morreu (segfault, OOM): o pool inteiro fica
+                # inutilizável, então os trechos seguem em um pool novo
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = create_executor()
+                future = executor.submit(_transcribe_chunk, source_path, state.chunk)
+            pending[future] = state
+
+        for chunk in chunks:
+            submit(_ChunkState(chunk))
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                state = pending.pop(future)
+                try:
+                    results[state.chunk.index] = future.result()
+                except Exception as exc:  # noqa: BLE001 - qualquer falha do motor é reenviada
+                    if isinstance(exc, BrokenExecutor):
+                        # Todos os trechos em andamento recebem o erro; não
+                        # há como saber qual deles derrubou o worker
+                        chunk = state.chunk
+                        state.errors.append(
+                            f"{type(exc).__name__}: worker encerrado durante o trecho "
+                            f"{chunk.index} ({chunk.start:.1f}s-{chunk.end:.1f}s)"
+                        )
+                    else:
+                        state.errors.append(repr(exc))
+                    if state.attempts <= max_retries:
+                        submit(state)
+                    else:
+                        failed[state.chunk.index] = state.errors[-1]
+                    continue
+
+                if on_progress:
+                    on_progress(len(results), len(chunks))
+    finally:
+        executor.shutdown()
+
+    segments = [s for index in sorted(results) for s in results[index]]
+    transcript = Transcript(source=source_path, segments=segments, engine=engine)
+
+    if failed:
+        raise TranscriptionError(failed, transcript)
+    return transcript
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcrição paralela por trechos")
+    parser.add_argument('source', help='Arquivo de áudio ou vídeo')
+    parser.add_argument('--engine', default=StubEngine.name,
+                        help=f"Motor: {', '.join(sorted(ENGINES))} ou 'modulo:Classe'")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-seconds', type=float, default=300.0)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--json', dest='json_path', help='Salva os segmentos em JSON')
+    parser.add_argument('--cache', default=None, metavar='DIR',
+                        help='Diretório do cache de saídas (requer --json)')
+    args = parser.parse_args(argv)
+    if args.cache and not args.json_path:
+        parser.error('--cache requer --json')
+
+    def run() -> Transcript:
+        return transcribe(
+            args.source,
+            engine=args.engine,
+            workers=args.workers,
+            target_chunk_seconds=args.chunk_seconds,
+            max_retries=args.retries,
+            on_progress=lambda done, total: print(f"{done}/{total} trechos", flush=True)
+        )
+
+    def save(transcript: Transcript, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(transcript.to_dict(), f, ensure_ascii=False, indent=2)
+
+    if args.cache:
+        from .output_cache import OutputCache
+
+        cache = OutputCache(args.cache)
+        try:
+            _, cached = cache.get_or_run(
+                args.source, TaskType.TRANSCRIPTION,
+                {'engine': args.engine, 'chunk_seconds': args.chunk_seconds}, args.json_path,
+                lambda path: save(run(), path)
+            )
+        finally:
+            cache.close()
+        if cached:
+            print(f"Transcrição reaproveitada do cache em {args.json_path}")
+    elif args.json_path:
+        save(run(), args.json_path)
+    else:
+        print(run().to_text())
+
+
+if __name__ == '__main__':
+    main()
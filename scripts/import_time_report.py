@@ -0,0 +1,150 @@
+"""
+Relatório de tempo de importação por módulo
+
+Executa `python -X importtime` em um processo limpo para cada alvo e
+mostra o tempo próprio e acumulado (em ms) dos módulos mais caros.
+
+Uso:
+    python scripts/import_time_report.py
+    python scripts/import_time_report.py -m dashboard.components.charts --top 30
+    python scripts/import_time_report.py --json import_report.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGETS = [
+    'dashboard.components',
+    'dashboard.data',
+    'dashboard.components.metrics_cards',
+    'dashboard.components.tables',
+    'dashboard.components.charts',
+    'dashboard.components.video_player',
+    'dashboard.data.mock_data',
+]
+
+
+@dataclass
+class ModuleImport:
+    """Tempo de importação de um módulo"""
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    """Resultado da importação de um alvo em processo limpo"""
+    target: str
+    wall_ms: float
+    modules: List[ModuleImport]
+    error: str = ''
+
+
+def parse_importtime(stderr: str) -> List[ModuleImport]:
+    """
+    Interpreta a saída de `-X importtime`
+
+    Args:
+        stderr: Saída de erro do interpretador
+
+    Returns:
+        Lista de módulos com tempos em milissegundos
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        modules.append(ModuleImport(
+            module=name.strip(),
+            self_ms=int(self_us) / 1000,
+            cumulative_ms=int(cumulative_us) / 1000,
+            depth=depth
+        ))
+    return modules
+
+
+def measure(target: str, python: str = sys.executable) -> ImportReport:
+    """
+    Mede a importação de um módulo em um interpretador novo
+
+    Args:
+        target: Nome do módulo a importar
+        python: Interpretador a utilizar
+
+    Returns:
+        Relatório da importação
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    error = ''
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'erro desconhecido'
+
+    return ImportReport(
+        target=target,
+        wall_ms=round(wall_ms, 2),
+        modules=parse_importtime(result.stderr),
+        error=error
+    )
+
+
+def format_report(report: ImportReport, top: int) -> str:
+    """Formata o relatório de um alvo como tabela de texto"""
+    lines = [f"== {report.target} (processo: {report.wall_ms:.1f} ms)"]
+    if report.error:
+        lines.append(f"   ERRO: {report.error}")
+
+    own = next((m for m in reversed(report.modules) if m.module == report.target), None)
+    if own:
+        lines.append(f"   import acumulado: {own.cumulative_ms:.1f} ms")
+
+    lines.append(f"   {'próprio (ms)':>12}  {'acumulado (ms)':>14}  módulo")
+    ranked = sorted(report.modules, key=lambda m: m.cumulative_ms, reverse=True)[:top]
+    for m in ranked:
+        lines.append(f"   {m.self_ms:>12.1f}  {m.cumulative_ms:>14.1f}  {m.module}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-m', '--module', action='append', dest='modules',
+                        help='Módulo a medir (pode repetir). Padrão: componentes do dashboard')
+    parser.add_argument('--top', type=int, default=15, help='Número de módulos por alvo')
+    parser.add_argument('--json', dest='json_path', help='Salva o relatório completo em JSON')
+    args = parser.parse_args(argv)
+
+    reports = [measure(target) for target in (args.modules or DEFAULT_TARGETS)]
+
+    for report in reports:
+        print(format_report(report, args.top))
+        print()
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump([asdict(r) for r in reports], f, ensure_ascii=False, indent=2)
+        print(f"Relatório salvo em {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
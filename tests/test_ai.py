@@ -0,0 +1,106 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from dashboard.data.schemas import Video, VideoStatus
+from processing.ai import (
+    AIClient,
+    Prompt,
+    ResponseCache,
+    StubServer,
+    create_provider,
+    generate_post_ideas,
+)
+from processing.jobs import RetryPolicy
+
+
+@pytest.fixture
+def stub():
+    with StubServer(latency=0.05) as server:
+        yield server
+
+
+def _client(server, **options):
+    provider = create_provider('openai', base_url=server.url, api_key='stub')
+    options.setdefault('retry_policy', RetryPolicy(max_attempts=3, base_delay=0.0))
+    return AIClient(provider, **options)
+
+
+def _video(video_id):
+    return Video(
+        id=video_id, title=f'Episódio {video_id}', filename=f'{video_id}.mp4', duration=600,
+        size_mb=50.0, format='mp4', resolution='1920x1080', codec='h264', fps=30,
+        status=VideoStatus.COMPLETED, created_at=datetime(2025, 1, 1), processed_at=None,
+        thumbnail_url=None, tags=['marketing'], transcription=None, subtitle_url=None
+    )
+
+
+def test_identical_prompts_share_one_request(stub):
+    client = _client(stub)
+    prompt = Prompt(user='Resuma o episódio')
+
+    first, second = asyncio.run(client.complete_many([prompt, prompt]))
+
+    assert first.text == second.text
+    assert stub.requests == 1
+    assert client.stats.coalesced == 1
+
+
+def test_retries_transient_503(stub):
+    stub.fail_every = 2
+    client = _client(stub)
+
+    asyncio.run(client.complete(Prompt(user='primeiro')))
+    completion = asyncio.run(client.complete(Prompt(user='segundo')))
+
+    assert completion.text == '[stub] segundo'
+    assert stub.requests == 3
+    assert client.stats.retries == 1
+
+
+def test_same_client_across_event_loops(stub):
+    client = _client(stub, max_concurrency=1)
+
+    for run in range(2):
+        prompts = [Prompt(user=f'rodada {run} pedido {i}') for i in range(3)]
+        results = asyncio.run(client.complete_many(prompts))
+        assert [r.text for r in results] == [f'[stub] {p.user}' for p in prompts]
+
+
+def test_cache_hit_until_ttl_expires(stub, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    client = _client(stub, cache=cache)
+    prompt = Prompt(user='Legenda para o corte')
+
+    asyncio.run(client.complete(prompt))
+    cached = asyncio.run(client.complete(prompt))
+    assert cached.cached
+    assert stub.requests == 1
+    assert client.stats.cache_hits == 1
+
+    path = cache._path(prompt.key(client.provider.name))
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    data['stored_at'] -= 61
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    fresh = asyncio.run(client.complete(prompt))
+    assert not fresh.cached
+    assert stub.requests == 2
+
+
+def test_failed_batch_falls_back_to_single_videos(stub):
+    # Terceira requisição falha: um dos três lotes; os dois pedidos
+    # individuais seguintes (4 e 5) passam
+    stub.fail_every = 3
+    client = _client(stub, retry_policy=RetryPolicy(max_attempts=1))
+    videos = [_video(f'video_{i:03d}') for i in range(6)]
+
+    ideas = asyncio.run(generate_post_ideas(client, videos, ideas_per_video=2, batch_size=2))
+
+    assert all(len(ideas[v.id]) == 2 for v in videos)
+    assert stub.requests == 5
+    assert client.stats.errors == 1
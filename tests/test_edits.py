@@ -0,0 +1,15 @@
+import pytest
+
+from dashboard.data.changes import TASK
+from dashboard.data.edits import record_changes
+
+
+@pytest.mark.parametrize('value', [-5, 101, 500])
+def test_progress_outside_range_is_rejected(value):
+    with pytest.raises(ValueError, match='Progresso'):
+        record_changes(TASK, {'Progresso': value})
+
+
+def test_progress_within_range_is_converted():
+    assert record_changes(TASK, {'Progresso': 100.0}) == {'progress': 100}
+    assert record_changes(TASK, {'Progresso': '0'}) == {'progress': 0}
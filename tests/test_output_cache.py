@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from dashboard.data.schemas import Task, TaskType, Video, VideoStatus
+from processing.output_cache import OutputCache, cached_runner
+from processing.scheduler import Scheduler
+
+
+def _producer(content):
+    def produce(path):
+        with open(path, 'w') as f:
+            f.write(content)
+    return produce
+
+
+def test_reproducing_to_same_path_keeps_cached_object(tmp_path):
+    cache = OutputCache(str(tmp_path / 'cache'))
+    input_a, input_b = tmp_path / 'a.mp4', tmp_path / 'b.mp4'
+    input_a.write_text('A')
+    input_b.write_text('B')
+    output = str(tmp_path / 'out' / 'vid.mp4')
+
+    cache.get_or_run(str(input_a), TaskType.TRANSCODE, None, output, _producer('OUT-A'))
+    cache.get_or_run(str(input_b), TaskType.TRANSCODE, None, output, _producer('OUT-B'))
+
+    other = str(tmp_path / 'out' / 'other.mp4')
+    path, cached = cache.get_or_run(str(input_a), TaskType.TRANSCODE, None, other, _producer('never'))
+    assert cached
+    with open(path) as f:
+        assert f.read() == 'OUT-A'
+    with open(output) as f:
+        assert f.read() == 'OUT-B'
+    cache.close()
+
+
+def test_cached_runner_skips_repeated_task(tmp_path):
+    sources = {'video_001': tmp_path / 'a.mp4', 'video_002': tmp_path / 'a_reenviado.mp4'}
+    for path in sources.values():
+        path.write_text('mesmo conteúdo')
+
+    produced = []
+
+    def produce(task, path):
+        produced.append(task.id)
+        with open(path, 'w') as f:
+            f.write(f'thumbnail de {task.video_id}')
+
+    cache = OutputCache(str(tmp_path / 'cache'))
+    runner = cached_runner(
+        cache, produce,
+        source_path=lambda t: str(sources[t.video_id]),
+        output_path=lambda t: str(tmp_path / 'out' / f'{t.video_id}_thumbnail.jpg'),
+        params=lambda t: {'width': 1280}
+    )
+    scheduler = Scheduler(runner, workers=1, publish_state=False)
+    tasks = []
+    for video_id in sources:
+        video = Video(
+            id=video_id, title=video_id, filename=f'{video_id}.mp4', duration=60, size_mb=1.0,
+            format='mp4', resolution='1280x720', codec='h264', fps=30, status=VideoStatus.PENDING,
+            created_at=datetime(2025, 1, 1), processed_at=None, thumbnail_url=None, tags=[],
+            transcription=None, subtitle_url=None
+        )
+        task = Task(
+            id=f'task_{video_id}', video_id=video_id, video_title=video_id, task_type=TaskType.THUMBNAIL,
+            status=VideoStatus.PENDING, progress=0, created_at=datetime(2025, 1, 1), started_at=None,
+            completed_at=None, error_message=None, duration_seconds=None, output_file=None
+        )
+        tasks.append(task)
+        scheduler.add_video(video, [task])
+    scheduler.run()
+
+    assert len(produced) == 1
+    assert all(t.status == VideoStatus.COMPLETED for t in tasks)
+    with open(tasks[1].output_file) as f:
+        assert f.read() == 'thumbnail de video_001'
+    cache.close()
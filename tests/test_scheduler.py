@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from dashboard.data.schemas import Task, TaskType, Video, VideoStatus
+from processing.jobs import RetryPolicy, TransientError
+from processing.scheduler import Scheduler
+
+
+def _video(video_id='video_001'):
+    return Video(
+        id=video_id, title='Episódio', filename=f'{video_id}.mp4', duration=60, size_mb=10.0,
+        format='mp4', resolution='1920x1080', codec='h264', fps=30, status=VideoStatus.PENDING,
+        created_at=datetime(2025, 1, 1), processed_at=None, thumbnail_url=None, tags=[],
+        transcription=None, subtitle_url=None
+    )
+
+
+def _task(task_id='task_001', video_id='video_001', task_type=TaskType.THUMBNAIL):
+    return Task(
+        id=task_id, video_id=video_id, video_title='Episódio', task_type=task_type,
+        status=VideoStatus.PENDING, progress=0, created_at=datetime(2025, 1, 1), started_at=None,
+        completed_at=None, error_message=None, duration_seconds=None, output_file=None
+    )
+
+
+def test_success_after_retry_clears_error_message():
+    calls = []
+
+    def runner(task):
+        calls.append(task.id)
+        if len(calls) == 1:
+            raise TransientError("x")
+        return '/output/thumb.jpg'
+
+    task = _task()
+    scheduler = Scheduler(runner, workers=1, publish_state=False,
+                          retry_policy=RetryPolicy(max_attempts=3, base_delay=0.0))
+    scheduler.add_video(_video(), [task])
+    scheduler.run()
+
+    assert len(calls) == 2
+    assert task.status == VideoStatus.COMPLETED
+    assert task.error_message is None
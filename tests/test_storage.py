@@ -0,0 +1,44 @@
+import os
+
+from processing.storage import StorageTracker
+
+
+def test_fallback_scan_sees_file_growing_in_place(tmp_path):
+    uploads = tmp_path / 'uploads'
+    uploads.mkdir()
+    upload = uploads / 'episodio.mp4'
+    upload.write_bytes(b'x' * 100)
+    tracker = StorageTracker([str(uploads)], [], state_file=str(tmp_path / 'tree.json'), use_inotify=False)
+    tracker.refresh()
+
+    # Acrescentar não altera o mtime do diretório
+    dir_mtime = os.stat(uploads).st_mtime_ns
+    with open(upload, 'ab') as f:
+        f.write(b'y' * 50)
+    assert os.stat(uploads).st_mtime_ns == dir_mtime
+
+    assert tracker.refresh() == 0
+    assert tracker.breakdown() == {'uploads': 150}
+
+    reloaded = StorageTracker([str(uploads)], [], state_file=str(tmp_path / 'tree.json'), use_inotify=False)
+    with open(upload, 'ab') as f:
+        f.write(b'z' * 50)
+    reloaded.refresh()
+    assert reloaded.breakdown() == {'uploads': 200}
+
+
+def test_fallback_full_rescan_sees_old_file_rewritten_in_place(tmp_path):
+    outputs = tmp_path / 'outputs'
+    outputs.mkdir()
+    output = outputs / 'video_001_transcode.mp4'
+    output.write_bytes(b'x' * 100)
+    os.utime(output, (0, 0))
+    tracker = StorageTracker([], [str(outputs)], state_file=str(tmp_path / 'tree.json'),
+                             use_inotify=False, full_rescan_interval=0)
+    tracker.refresh()
+
+    # Sobrescrita no lugar de um arquivo antigo (fora dos recentes)
+    with open(output, 'r+b') as f:
+        f.write(b'y' * 300)
+    assert tracker.refresh() == 1
+    assert tracker.breakdown() == {'TRANSCODE': 300}
@@ -0,0 +1,15 @@
+from processing.subtitles import Cue, CueIndex
+
+
+def test_negative_shift_keeps_index_sorted():
+    index = CueIndex([
+        Cue(start=0.0, end=1.0, lines=['a']),
+        Cue(start=1.0, end=8.0, lines=['b']),
+        Cue(start=3.0, end=4.0, lines=['c']),
+        Cue(start=4.5, end=5.0, lines=['d']),
+    ])
+    index.shift(-2.0, after=2.0)
+
+    assert list(index.starts) == sorted(index.starts)
+    assert [c.lines for c in index.at(1.5)] == [['c'], ['b']]
+    assert [c.lines for c in index.at(2.6)] == [['b'], ['d']]
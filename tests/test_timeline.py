@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+from dashboard.data.changes import TASK, VIDEO
+from dashboard.data.edits import EditSet
+from dashboard.data.schemas import Task, TaskType, Video, VideoStatus
+from dashboard.data.store import DataStore
+from dashboard.data.timeline import QueueTimeline
+
+BASE = datetime(2025, 1, 1, 12, 0)
+
+
+def _video(video_id):
+    return Video(
+        id=video_id, title=video_id, filename=f'{video_id}.mp4', duration=60, size_mb=10.0,
+        format='mp4', resolution='1920x1080', codec='h264', fps=30, status=VideoStatus.PROCESSING,
+        created_at=BASE, processed_at=None, thumbnail_url=None, tags=[],
+        transcription=None, subtitle_url=None
+    )
+
+
+def _task(task_id, video_id, status, started=None, completed=None):
+    return Task(
+        id=task_id, video_id=video_id, video_title=video_id, task_type=TaskType.TRANSCODE,
+        status=status, progress=0, created_at=BASE, started_at=started, completed_at=completed,
+        error_message=None, duration_seconds=None, output_file=None
+    )
+
+
+def test_deleting_a_video_closes_its_open_tasks():
+    store = DataStore()
+    store.upsert_videos([_video('video_a'), _video('video_b')])
+    store.upsert_tasks([
+        _task('task_1', 'video_a', VideoStatus.PROCESSING, started=BASE + timedelta(minutes=1)),
+        _task('task_2', 'video_a', VideoStatus.QUEUED),
+        _task('task_3', 'video_b', VideoStatus.PROCESSING, started=BASE + timedelta(minutes=2)),
+        _task('task_4', 'video_b', VideoStatus.COMPLETED, started=BASE + timedelta(minutes=1),
+              completed=BASE + timedelta(minutes=3)),
+    ])
+    tasks, version = store.records(TASK)
+    timeline = QueueTimeline.from_tasks(tasks, version)
+
+    store.apply_edits(VIDEO, EditSet(deleted=['video_a']))
+    timeline.refresh(store.feed, lambda: store.records(TASK))
+
+    now = [datetime.now() + timedelta(seconds=1)]
+    rebuilt = QueueTimeline.from_tasks(store.records(TASK)[0])
+    assert timeline.at(now).iloc[0].to_dict() == rebuilt.at(now).iloc[0].to_dict()
+    assert timeline.at(now).iloc[0].to_dict() == {'Na fila': 0, 'Em execução': 1}